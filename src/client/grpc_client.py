@@ -1,17 +1,73 @@
 import atexit
 import logging
 import time
+from collections.abc import AsyncIterator, Iterable, Iterator
 from concurrent.futures import ThreadPoolExecutor
 from threading import Lock
 from types import TracebackType
 
 import grpc
+import numpy as np
 
 from src.proto import inference_pb2, inference_pb2_grpc
+from src.proto.packed import pack_pairs, pack_token_ids, unpack_scores
 
 logger = logging.getLogger(__name__)
 
 
+def _priority_value(priority: str | None) -> int:
+    if priority is None:
+        return inference_pb2.PRIORITY_UNSPECIFIED
+    return inference_pb2.Priority.Value(f"PRIORITY_{priority.upper()}")
+
+
+def _infer_request(
+    pairs: list[tuple[str, str]], priority: str | None, packed: bool
+) -> inference_pb2.InferRequest:
+    if packed:
+        return inference_pb2.InferRequest(
+            packed=pack_pairs(pairs), packed_scores=True, priority=_priority_value(priority)
+        )
+    proto_pairs = [inference_pb2.QueryDocPair(query=p[0], document=p[1]) for p in pairs]
+    return inference_pb2.InferRequest(pairs=proto_pairs, priority=_priority_value(priority))
+
+
+def _token_request(
+    input_ids: list[list[int]], token_type_ids: list[list[int]] | None, priority: str | None
+) -> inference_pb2.InferRequest:
+    return inference_pb2.InferRequest(
+        tokens=pack_token_ids(input_ids, token_type_ids),
+        packed_scores=True,
+        priority=_priority_value(priority),
+    )
+
+
+def _response_scores(response: inference_pb2.InferResponse) -> list[float] | np.ndarray:
+    if response.scores_f32:
+        return unpack_scores(response.scores_f32)
+    return list(response.scores)
+
+
+def _score_chunks(
+    chunks: Iterable[list[tuple[str, str]]], priority: str | None
+) -> Iterator[inference_pb2.ScoreChunk]:
+    priority_value = _priority_value(priority)
+    for chunk_id, pairs in enumerate(chunks):
+        yield inference_pb2.ScoreChunk(
+            chunk_id=chunk_id,
+            pairs=[inference_pb2.QueryDocPair(query=q, document=d) for q, d in pairs],
+            priority=priority_value,
+        )
+
+
+def _chunk_scores(response: inference_pb2.ScoreChunkResult) -> tuple[int, list[float]]:
+    if response.status_code != 200:
+        raise RuntimeError(
+            f"Chunk {response.chunk_id} failed ({response.status_code}): {response.error}"
+        )
+    return response.chunk_id, list(response.scores)
+
+
 class InferenceClient:
     def __init__(
         self,
@@ -51,17 +107,61 @@ class InferenceClient:
         self.close()
 
     def infer(
-        self, pairs: list[tuple[str, str]], timeout: float = 60.0
-    ) -> tuple[list[float], float]:
+        self,
+        pairs: list[tuple[str, str]],
+        timeout: float = 60.0,
+        priority: str | None = None,
+        packed: bool = False,
+    ) -> tuple[list[float] | np.ndarray, float]:
         start = time.perf_counter()
-        proto_pairs = [inference_pb2.QueryDocPair(query=p[0], document=p[1]) for p in pairs]
-        request = inference_pb2.InferRequest(pairs=proto_pairs)
+        request = _infer_request(pairs, priority, packed)
         response = self._stub.Infer(request, timeout=timeout)
         latency = (time.perf_counter() - start) * 1000
         status_code = getattr(response, "status_code", 200)
         if status_code == 204:
             return [], latency
-        return list(response.scores), latency
+        return _response_scores(response), latency
+
+    def infer_tokens(
+        self,
+        input_ids: list[list[int]],
+        token_type_ids: list[list[int]] | None = None,
+        timeout: float = 60.0,
+        priority: str | None = None,
+    ) -> tuple[np.ndarray, float]:
+        start = time.perf_counter()
+        request = _token_request(input_ids, token_type_ids, priority)
+        response = self._stub.Infer(request, timeout=timeout)
+        latency = (time.perf_counter() - start) * 1000
+        return unpack_scores(response.scores_f32), latency
+
+    def rerank(
+        self,
+        query: str,
+        documents: list[str],
+        top_k: int = 0,
+        timeout: float = 60.0,
+        priority: str | None = None,
+    ) -> tuple[list[float], list[int], float]:
+        start = time.perf_counter()
+        request = inference_pb2.RerankRequest(
+            query=query, documents=documents, top_k=top_k, priority=_priority_value(priority)
+        )
+        response = self._stub.Rerank(request, timeout=timeout)
+        latency = (time.perf_counter() - start) * 1000
+        if response.status_code == 204:
+            return [], [], latency
+        return list(response.scores), list(response.indices), latency
+
+    def score_stream(
+        self,
+        chunks: Iterable[list[tuple[str, str]]],
+        priority: str | None = None,
+        timeout: float | None = None,
+    ) -> Iterator[tuple[int, list[float]]]:
+        responses = self._stub.ScoreStream(_score_chunks(chunks, priority), timeout=timeout)
+        for response in responses:
+            yield _chunk_scores(response)
 
     def benchmark(
         self,
@@ -151,14 +251,56 @@ class AsyncInferenceClient:
         self._stub = inference_pb2_grpc.InferenceServiceStub(self._channel)
 
     async def infer(
-        self, pairs: list[tuple[str, str]], timeout: float = 60.0
-    ) -> tuple[list[float], float]:
+        self,
+        pairs: list[tuple[str, str]],
+        timeout: float = 60.0,
+        priority: str | None = None,
+        packed: bool = False,
+    ) -> tuple[list[float] | np.ndarray, float]:
         start = time.perf_counter()
-        proto_pairs = [inference_pb2.QueryDocPair(query=p[0], document=p[1]) for p in pairs]
-        request = inference_pb2.InferRequest(pairs=proto_pairs)
+        request = _infer_request(pairs, priority, packed)
         response = await self._stub.Infer(request, timeout=timeout)
         latency = (time.perf_counter() - start) * 1000
-        return list(response.scores), latency
+        return _response_scores(response), latency
+
+    async def infer_tokens(
+        self,
+        input_ids: list[list[int]],
+        token_type_ids: list[list[int]] | None = None,
+        timeout: float = 60.0,
+        priority: str | None = None,
+    ) -> tuple[np.ndarray, float]:
+        start = time.perf_counter()
+        request = _token_request(input_ids, token_type_ids, priority)
+        response = await self._stub.Infer(request, timeout=timeout)
+        latency = (time.perf_counter() - start) * 1000
+        return unpack_scores(response.scores_f32), latency
+
+    async def rerank(
+        self,
+        query: str,
+        documents: list[str],
+        top_k: int = 0,
+        timeout: float = 60.0,
+        priority: str | None = None,
+    ) -> tuple[list[float], list[int], float]:
+        start = time.perf_counter()
+        request = inference_pb2.RerankRequest(
+            query=query, documents=documents, top_k=top_k, priority=_priority_value(priority)
+        )
+        response = await self._stub.Rerank(request, timeout=timeout)
+        latency = (time.perf_counter() - start) * 1000
+        return list(response.scores), list(response.indices), latency
+
+    async def score_stream(
+        self,
+        chunks: Iterable[list[tuple[str, str]]],
+        priority: str | None = None,
+        timeout: float | None = None,
+    ) -> AsyncIterator[tuple[int, list[float]]]:
+        call = self._stub.ScoreStream(_score_chunks(chunks, priority), timeout=timeout)
+        async for response in call:
+            yield _chunk_scores(response)
 
     async def close(self) -> None:
         if self._channel:
@@ -1,11 +1,12 @@
 #!/usr/bin/env python3
 
+import asyncio
 import logging
 
 import hydra
 from omegaconf import DictConfig
 
-from src.server.grpc import serve
+from src.server.grpc import serve, serve_aio
 from src.server.services.orchestrator_service import OrchestratorService
 from src.server.utils.config_loader import get_experiment_name, hydra_config_to_config
 
@@ -31,7 +32,9 @@ def main(cfg: DictConfig) -> None:
     experiment_config = cfg.get("experiment", {})
     concurrency_levels = experiment_config.get("concurrency_levels", [])
 
-    if concurrency_levels:
+    aio_mode = config.server.grpc_mode == "aio"
+
+    if concurrency_levels and not aio_mode:
         max_concurrency = max(concurrency_levels)
 
         recommended_workers = max(max_concurrency * 2, 16, config.server.grpc_workers)
@@ -49,19 +52,35 @@ def main(cfg: DictConfig) -> None:
             config.server.grpc_workers = recommended_workers
 
     logger.info(f"Loaded config: {experiment_name}")
-    logger.info(f"gRPC server configured with {config.server.grpc_workers} worker threads")
+    if aio_mode:
+        logger.info("gRPC server configured in aio mode")
+    else:
+        logger.info(f"gRPC server configured with {config.server.grpc_workers} worker threads")
 
     orchestrator = OrchestratorService(config, experiment_name)
     orchestrator.setup()
     orchestrator.start()
 
     logger.info(f"Starting gRPC server on port {config.server.grpc_port}...")
+    if aio_mode:
+        asyncio.run(
+            serve_aio(
+                orchestrator,
+                host=config.server.host,
+                port=config.server.grpc_port,
+                metrics=orchestrator.get_metrics(),
+                stream_window=config.server.stream_window,
+            )
+        )
+        return
+
     serve(
         orchestrator,
         host=config.server.host,
         port=config.server.grpc_port,
         max_workers=config.server.grpc_workers,
         metrics=orchestrator.get_metrics(),
+        stream_window=config.server.stream_window,
     )
 
 
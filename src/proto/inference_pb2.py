@@ -24,23 +24,37 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0finference.proto\x12\tinference\"\x07\n\x05\x45mpty\"/\n\x0cQueryDocPair\x12\r\n\x05query\x18\x01 \x01(\t\x12\x10\n\x08\x64ocument\x18\x02 \x01(\t\"6\n\x0cInferRequest\x12&\n\x05pairs\x18\x01 \x03(\x0b\x32\x17.inference.QueryDocPair\"[\n\rInferResponse\x12\x0e\n\x06scores\x18\x01 \x03(\x02\x12\x11\n\tnum_pairs\x18\x02 \x01(\x05\x12\x12\n\nlatency_ms\x18\x03 \x01(\x02\x12\x13\n\x0bstatus_code\x18\x04 \x01(\x05\"\x8d\x01\n\x0fMetricsResponse\x12\r\n\x05\x63ount\x18\x01 \x01(\x05\x12\x0e\n\x06\x61vg_ms\x18\x02 \x01(\x02\x12\x0e\n\x06p50_ms\x18\x03 \x01(\x02\x12\x0e\n\x06p95_ms\x18\x04 \x01(\x02\x12\x0e\n\x06p99_ms\x18\x05 \x01(\x02\x12\x16\n\x0ethroughput_qps\x18\x06 \x01(\x02\x12\x13\n\x0bquery_count\x18\x07 \x01(\x05\x32\x8a\x01\n\x10InferenceService\x12:\n\x05Infer\x12\x17.inference.InferRequest\x1a\x18.inference.InferResponse\x12:\n\nGetMetrics\x12\x10.inference.Empty\x1a\x1a.inference.MetricsResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0finference.proto\x12\tinference\"\x07\n\x05\x45mpty\"/\n\x0cQueryDocPair\x12\r\n\x05query\x18\x01 \x01(\t\x12\x10\n\x08\x64ocument\x18\x02 \x01(\t\"?\n\x0bPackedPairs\x12\x11\n\tnum_pairs\x18\x01 \x01(\r\x12\x0f\n\x07offsets\x18\x02 \x01(\x0c\x12\x0c\n\x04text\x18\x03 \x01(\x0c\"F\n\x08TokenIds\x12\x11\n\tinput_ids\x18\x01 \x01(\x0c\x12\x0f\n\x07lengths\x18\x02 \x01(\x0c\x12\x16\n\x0etoken_type_ids\x18\x03 \x01(\x0c\"\xc1\x01\n\x0cInferRequest\x12&\n\x05pairs\x18\x01 \x03(\x0b\x32\x17.inference.QueryDocPair\x12%\n\x08priority\x18\x02 \x01(\x0e\x32\x13.inference.Priority\x12&\n\x06packed\x18\x03 \x01(\x0b\x32\x16.inference.PackedPairs\x12\x15\n\rpacked_scores\x18\x04 \x01(\x08\x12#\n\x06tokens\x18\x05 \x01(\x0b\x32\x13.inference.TokenIds\"o\n\rInferResponse\x12\x0e\n\x06scores\x18\x01 \x03(\x02\x12\x11\n\tnum_pairs\x18\x02 \x01(\x05\x12\x12\n\nlatency_ms\x18\x03 \x01(\x02\x12\x13\n\x0bstatus_code\x18\x04 \x01(\x05\x12\x12\n\nscores_f32\x18\x05 \x01(\x0c\"g\n\rRerankRequest\x12\r\n\x05query\x18\x01 \x01(\t\x12\x11\n\tdocuments\x18\x02 \x03(\t\x12\r\n\x05top_k\x18\x03 \x01(\x05\x12%\n\x08priority\x18\x04 \x01(\x0e\x32\x13.inference.Priority\"m\n\x0eRerankResponse\x12\x0e\n\x06scores\x18\x01 \x03(\x02\x12\x0f\n\x07indices\x18\x02 \x03(\x05\x12\x11\n\tnum_pairs\x18\x03 \x01(\x05\x12\x12\n\nlatency_ms\x18\x04 \x01(\x02\x12\x13\n\x0bstatus_code\x18\x05 \x01(\x05\"m\n\nScoreChunk\x12\x10\n\x08\x63hunk_id\x18\x01 \x01(\x04\x12&\n\x05pairs\x18\x02 \x03(\x0b\x32\x17.inference.QueryDocPair\x12%\n\x08priority\x18\x03 \x01(\x0e\x32\x13.inference.Priority\"l\n\x10ScoreChunkResult\x12\x10\n\x08\x63hunk_id\x18\x01 \x01(\x04\x12\x0e\n\x06scores\x18\x02 \x03(\x02\x12\x12\n\nlatency_ms\x18\x03 \x01(\x02\x12\x13\n\x0bstatus_code\x18\x04 \x01(\x05\x12\r\n\x05\x65rror\x18\x05 \x01(\t\"\x8d\x01\n\x0fMetricsResponse\x12\r\n\x05\x63ount\x18\x01 \x01(\x05\x12\x0e\n\x06\x61vg_ms\x18\x02 \x01(\x02\x12\x0e\n\x06p50_ms\x18\x03 \x01(\x02\x12\x0e\n\x06p95_ms\x18\x04 \x01(\x02\x12\x0e\n\x06p99_ms\x18\x05 \x01(\x02\x12\x16\n\x0ethroughput_qps\x18\x06 \x01(\x02\x12\x13\n\x0bquery_count\x18\x07 \x01(\x05*l\n\x08Priority\x12\x18\n\x14PRIORITY_UNSPECIFIED\x10\x00\x12\x18\n\x14PRIORITY_INTERACTIVE\x10\x01\x12\x12\n\x0ePRIORITY_BATCH\x10\x02\x12\x18\n\x14PRIORITY_BEST_EFFORT\x10\x03\x32\x90\x02\n\x10InferenceService\x12:\n\x05Infer\x12\x17.inference.InferRequest\x1a\x18.inference.InferResponse\x12=\n\x06Rerank\x12\x18.inference.RerankRequest\x1a\x19.inference.RerankResponse\x12:\n\nGetMetrics\x12\x10.inference.Empty\x1a\x1a.inference.MetricsResponse\x12\x45\n\x0bScoreStream\x12\x15.inference.ScoreChunk\x1a\x1b.inference.ScoreChunkResult(\x01\x30\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'inference_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
+  _globals['_PRIORITY']._serialized_start=1115
+  _globals['_PRIORITY']._serialized_end=1223
   _globals['_EMPTY']._serialized_start=30
   _globals['_EMPTY']._serialized_end=37
   _globals['_QUERYDOCPAIR']._serialized_start=39
   _globals['_QUERYDOCPAIR']._serialized_end=86
-  _globals['_INFERREQUEST']._serialized_start=88
-  _globals['_INFERREQUEST']._serialized_end=142
-  _globals['_INFERRESPONSE']._serialized_start=144
-  _globals['_INFERRESPONSE']._serialized_end=235
-  _globals['_METRICSRESPONSE']._serialized_start=238
-  _globals['_METRICSRESPONSE']._serialized_end=379
-  _globals['_INFERENCESERVICE']._serialized_start=382
-  _globals['_INFERENCESERVICE']._serialized_end=520
+  _globals['_PACKEDPAIRS']._serialized_start=88
+  _globals['_PACKEDPAIRS']._serialized_end=151
+  _globals['_TOKENIDS']._serialized_start=153
+  _globals['_TOKENIDS']._serialized_end=223
+  _globals['_INFERREQUEST']._serialized_start=226
+  _globals['_INFERREQUEST']._serialized_end=419
+  _globals['_INFERRESPONSE']._serialized_start=421
+  _globals['_INFERRESPONSE']._serialized_end=532
+  _globals['_RERANKREQUEST']._serialized_start=534
+  _globals['_RERANKREQUEST']._serialized_end=637
+  _globals['_RERANKRESPONSE']._serialized_start=639
+  _globals['_RERANKRESPONSE']._serialized_end=748
+  _globals['_SCORECHUNK']._serialized_start=750
+  _globals['_SCORECHUNK']._serialized_end=859
+  _globals['_SCORECHUNKRESULT']._serialized_start=861
+  _globals['_SCORECHUNKRESULT']._serialized_end=969
+  _globals['_METRICSRESPONSE']._serialized_start=972
+  _globals['_METRICSRESPONSE']._serialized_end=1113
+  _globals['_INFERENCESERVICE']._serialized_start=1226
+  _globals['_INFERENCESERVICE']._serialized_end=1498
 # @@protoc_insertion_point(module_scope)
@@ -39,11 +39,21 @@ class InferenceServiceStub(object):
                 request_serializer=inference__pb2.InferRequest.SerializeToString,
                 response_deserializer=inference__pb2.InferResponse.FromString,
                 _registered_method=True)
+        self.Rerank = channel.unary_unary(
+                '/inference.InferenceService/Rerank',
+                request_serializer=inference__pb2.RerankRequest.SerializeToString,
+                response_deserializer=inference__pb2.RerankResponse.FromString,
+                _registered_method=True)
         self.GetMetrics = channel.unary_unary(
                 '/inference.InferenceService/GetMetrics',
                 request_serializer=inference__pb2.Empty.SerializeToString,
                 response_deserializer=inference__pb2.MetricsResponse.FromString,
                 _registered_method=True)
+        self.ScoreStream = channel.stream_stream(
+                '/inference.InferenceService/ScoreStream',
+                request_serializer=inference__pb2.ScoreChunk.SerializeToString,
+                response_deserializer=inference__pb2.ScoreChunkResult.FromString,
+                _registered_method=True)
 
 
 class InferenceServiceServicer(object):
@@ -55,12 +65,24 @@ class InferenceServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def Rerank(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def GetMetrics(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def ScoreStream(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_InferenceServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -69,11 +91,21 @@ def add_InferenceServiceServicer_to_server(servicer, server):
                     request_deserializer=inference__pb2.InferRequest.FromString,
                     response_serializer=inference__pb2.InferResponse.SerializeToString,
             ),
+            'Rerank': grpc.unary_unary_rpc_method_handler(
+                    servicer.Rerank,
+                    request_deserializer=inference__pb2.RerankRequest.FromString,
+                    response_serializer=inference__pb2.RerankResponse.SerializeToString,
+            ),
             'GetMetrics': grpc.unary_unary_rpc_method_handler(
                     servicer.GetMetrics,
                     request_deserializer=inference__pb2.Empty.FromString,
                     response_serializer=inference__pb2.MetricsResponse.SerializeToString,
             ),
+            'ScoreStream': grpc.stream_stream_rpc_method_handler(
+                    servicer.ScoreStream,
+                    request_deserializer=inference__pb2.ScoreChunk.FromString,
+                    response_serializer=inference__pb2.ScoreChunkResult.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'inference.InferenceService', rpc_method_handlers)
@@ -112,6 +144,33 @@ class InferenceService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def Rerank(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/inference.InferenceService/Rerank',
+            inference__pb2.RerankRequest.SerializeToString,
+            inference__pb2.RerankResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def GetMetrics(request,
             target,
@@ -138,3 +197,30 @@ class InferenceService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def ScoreStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/inference.InferenceService/ScoreStream',
+            inference__pb2.ScoreChunk.SerializeToString,
+            inference__pb2.ScoreChunkResult.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
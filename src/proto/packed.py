@@ -0,0 +1,107 @@
+import numpy as np
+
+from src.proto import inference_pb2
+
+_OFFSET_DTYPE = np.dtype("<u4")
+_SCORE_DTYPE = np.dtype("<f4")
+_TOKEN_DTYPE = np.dtype("<i4")
+_TYPE_DTYPE = np.dtype("u1")
+
+
+def pack_pairs(pairs: list[tuple[str, str]]) -> inference_pb2.PackedPairs:
+    texts = [query for query, _ in pairs] + [document for _, document in pairs]
+    joined = "".join(texts)
+    text = joined.encode("utf-8")
+    if len(text) == len(joined):
+        lengths = [len(t) for t in texts]
+    else:
+        lengths = [len(t.encode("utf-8")) for t in texts]
+
+    offsets = np.zeros(len(texts) + 1, dtype=_OFFSET_DTYPE)
+    np.cumsum(lengths, out=offsets[1:])
+    return inference_pb2.PackedPairs(num_pairs=len(pairs), offsets=offsets.tobytes(), text=text)
+
+
+def unpack_pairs(packed: inference_pb2.PackedPairs) -> list[tuple[str, str]]:
+    num_pairs = packed.num_pairs
+    offsets = np.frombuffer(packed.offsets, dtype=_OFFSET_DTYPE)
+    text = packed.text
+    if (
+        len(offsets) != 2 * num_pairs + 1
+        or offsets[0] != 0
+        or offsets[-1] != len(text)
+        or np.any(offsets[1:] < offsets[:-1])
+    ):
+        raise ValueError(
+            f"Packed pairs need {2 * num_pairs + 1} ascending offsets ending at {len(text)}"
+        )
+
+    bounds = offsets.tolist()
+    starts, ends = bounds[:-1], bounds[1:]
+    spans = zip(
+        starts[:num_pairs], ends[:num_pairs], starts[num_pairs:], ends[num_pairs:], strict=True
+    )
+    decoded = text.decode("utf-8")
+    if len(decoded) == len(text):
+        return [(decoded[q0:q1], decoded[d0:d1]) for q0, q1, d0, d1 in spans]
+    view = memoryview(text)
+    return [(str(view[q0:q1], "utf-8"), str(view[d0:d1], "utf-8")) for q0, q1, d0, d1 in spans]
+
+
+def pack_token_ids(
+    input_ids: list[list[int]], token_type_ids: list[list[int]] | None = None
+) -> inference_pb2.TokenIds:
+    lengths = np.fromiter(
+        (len(row) for row in input_ids), dtype=_OFFSET_DTYPE, count=len(input_ids)
+    )
+    tokens = inference_pb2.TokenIds(
+        input_ids=np.fromiter(
+            (t for row in input_ids for t in row), dtype=_TOKEN_DTYPE, count=int(lengths.sum())
+        ).tobytes(),
+        lengths=lengths.tobytes(),
+    )
+    if token_type_ids is not None:
+        tokens.token_type_ids = np.fromiter(
+            (t for row in token_type_ids for t in row), dtype=_TYPE_DTYPE
+        ).tobytes()
+    return tokens
+
+
+def unpack_token_ids(
+    tokens: inference_pb2.TokenIds,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray | None]:
+    if (
+        len(tokens.input_ids) % _TOKEN_DTYPE.itemsize
+        or len(tokens.lengths) % _OFFSET_DTYPE.itemsize
+    ):
+        raise ValueError("Token ids and lengths must be packed 4-byte integers")
+    input_ids = np.frombuffer(tokens.input_ids, dtype=_TOKEN_DTYPE)
+    lengths = np.frombuffer(tokens.lengths, dtype=_OFFSET_DTYPE)
+    if int(lengths.sum(dtype=np.int64)) != len(input_ids):
+        raise ValueError(f"Token lengths sum to {lengths.sum()} but {len(input_ids)} ids were sent")
+    token_type_ids = None
+    if tokens.token_type_ids:
+        token_type_ids = np.frombuffer(tokens.token_type_ids, dtype=_TYPE_DTYPE)
+        if len(token_type_ids) != len(input_ids):
+            raise ValueError(
+                f"Got {len(token_type_ids)} token type ids for {len(input_ids)} token ids"
+            )
+    return input_ids, lengths, token_type_ids
+
+
+def pack_scores(scores) -> bytes:
+    return np.asarray(scores, dtype=_SCORE_DTYPE).tobytes()
+
+
+def unpack_scores(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype=_SCORE_DTYPE)
+
+
+__all__ = [
+    "pack_pairs",
+    "unpack_pairs",
+    "pack_token_ids",
+    "unpack_token_ids",
+    "pack_scores",
+    "unpack_scores",
+]
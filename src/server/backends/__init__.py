@@ -5,6 +5,7 @@ from .compiled import CompiledBackend
 from .cuda import CUDABackend
 from .mlx_backend import MLXBackend
 from .mps import MPSBackend
+from .onnx_backend import OnnxBackend
 from .pytorch import PyTorchBackend
 from .tensorrt import TensorRTBackend
 
@@ -17,6 +18,7 @@ BACKENDS = {
     "mlx": MLXBackend,
     "compiled": CompiledBackend,
     "tensorrt": TensorRTBackend,
+    "onnx": OnnxBackend,
 }
 
 
@@ -38,6 +40,7 @@ __all__ = [
     "MLXBackend",
     "CompiledBackend",
     "TensorRTBackend",
+    "OnnxBackend",
     "create_backend",
     "BACKENDS",
 ]
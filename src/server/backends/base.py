@@ -6,7 +6,12 @@ from typing import TYPE_CHECKING, Literal, Optional
 
 import numpy as np
 
-from src.server.backends.device import clear_memory, resolve_device, sync_device
+from src.server.backends.device import (
+    clear_memory,
+    features_to_torch,
+    resolve_device,
+    sync_device,
+)
 from src.server.dto import InferenceResult
 
 if TYPE_CHECKING:
@@ -62,12 +67,7 @@ class BaseBackend(ABC):
             tokenizer = self._get_tokenizer()
             tokenize_start = time.perf_counter()
 
-            if self._tokenizer_pool is not None:
-                tokenized_batch = tokenizer.tokenize(pairs)
-                features = tokenized_batch.features
-            else:
-                tokenized_batch = tokenizer.tokenize(pairs, device=self.device)
-                features = tokenized_batch.features
+            tokenized_batch = tokenizer.tokenize(pairs)
 
             t_tokenize_ms = (time.perf_counter() - tokenize_start) * 1000
             batch_size = tokenized_batch.batch_size
@@ -78,9 +78,6 @@ class BaseBackend(ABC):
             padding_ratio = tokenized_batch.padding_ratio
             avg_seq_length = tokenized_batch.avg_seq_length
 
-            if self._tokenizer_pool is not None:
-                features = {k: v.to(self.device) for k, v in features.items()}
-
             start = time.perf_counter()
             sync_device(self.device)
             scores = self.model.predict(pairs, convert_to_numpy=True, show_progress_bar=False)
@@ -108,7 +105,7 @@ class BaseBackend(ABC):
     def infer_with_tokenized(self, tokenized_batch) -> InferenceResult:
         self._acquire()
         try:
-            features = {k: v.to(self.device) for k, v in tokenized_batch.features.items()}
+            features = features_to_torch(tokenized_batch.features, self.device)
 
             start = time.perf_counter()
             sync_device(self.device)
@@ -148,6 +145,17 @@ class BaseBackend(ABC):
         finally:
             self._release()
 
+    def enable_packed(self) -> bool:
+        logger.warning(f"{type(self).__name__} does not support packed inference")
+        return False
+
+    def enable_early_exit(self, heads_path: str, confidence: float | None = None) -> bool:
+        logger.warning(f"{type(self).__name__} does not support early exit")
+        return False
+
+    def share_memory(self) -> bool:
+        return False
+
     def warmup(self, iterations: int = 5) -> None:
         dummy = [("warmup query", "warmup document")]
         for _ in range(iterations):
@@ -4,7 +4,7 @@ import time
 import torch
 from sentence_transformers import CrossEncoder
 
-from src.server.backends.device import apply_fp16, sync_device
+from src.server.backends.device import apply_fp16, features_to_torch, sync_device
 from src.server.backends.torch_base import TorchBackend
 from src.server.dto import InferenceResult
 
@@ -60,12 +60,8 @@ class CompiledBackend(TorchBackend):
             total_start = time.perf_counter()
 
             tokenizer = self._get_tokenizer()
-            if self._tokenizer_pool:
-                tokenized_batch = tokenizer.tokenize(pairs)
-                features = {k: v.to(self.device) for k, v in tokenized_batch.features.items()}
-            else:
-                tokenized_batch = tokenizer.tokenize(pairs, device=self.device)
-                features = tokenized_batch.features
+            tokenized_batch = tokenizer.tokenize(pairs)
+            features = features_to_torch(tokenized_batch.features, self.device)
 
             inf_start = time.perf_counter()
             sync_device(self.device)
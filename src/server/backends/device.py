@@ -1,5 +1,6 @@
 import logging
 
+import numpy as np
 import torch
 
 logger = logging.getLogger(__name__)
@@ -21,6 +22,12 @@ def resolve_device(device: str) -> str:
     return "cpu"
 
 
+def features_to_torch(features: dict[str, np.ndarray], device: str) -> dict[str, torch.Tensor]:
+    return {
+        k: torch.from_numpy(v.astype(np.int64, copy=False)).to(device) for k, v in features.items()
+    }
+
+
 def sync_device(device: str) -> None:
     if device == "mps":
         torch.mps.synchronize()
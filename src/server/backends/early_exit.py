@@ -0,0 +1,150 @@
+import logging
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+import torch
+
+from src.server.backends.packed import PackedBertEncoder
+
+logger = logging.getLogger(__name__)
+
+_NEVER_EXIT = float("inf")
+
+
+def load_exit_heads(path: str | Path) -> dict:
+    heads = torch.load(path, map_location="cpu", weights_only=True)
+    missing = {"layers", "weight", "bias", "thresholds"} - heads.keys()
+    if missing:
+        raise ValueError(f"Early-exit heads file {path} is missing {sorted(missing)}")
+    return heads
+
+
+def save_exit_heads(heads: dict, path: str | Path) -> None:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    torch.save(heads, path)
+
+
+def _fit_head(cls: torch.Tensor, target: torch.Tensor, ridge: float) -> torch.Tensor:
+    x = torch.cat([cls, torch.ones(cls.shape[0], 1, dtype=cls.dtype)], dim=1)
+    gram = x.T @ x + ridge * torch.eye(x.shape[1], dtype=x.dtype)
+    return torch.linalg.solve(gram, x.T @ target)
+
+
+def _calibrate_threshold(confidence: np.ndarray, error: np.ndarray, max_error: float) -> float:
+    order = np.argsort(-confidence)
+    running_error = np.cumsum(error[order]) / np.arange(1, len(order) + 1)
+    within = np.flatnonzero(running_error <= max_error)
+    if len(within) == 0:
+        return _NEVER_EXIT
+    return float(confidence[order][within[-1]])
+
+
+def calibrate_exit_heads(
+    model: torch.nn.Module,
+    batches: Iterable[dict[str, torch.Tensor]],
+    layers: list[int] | None = None,
+    max_error: float = 0.02,
+    ridge: float = 1e-3,
+) -> dict:
+    num_layers = model.config.num_hidden_layers
+    layers = layers or list(range(1, num_layers))
+
+    cls_by_layer: dict[int, list[torch.Tensor]] = {layer: [] for layer in layers}
+    final_logits = []
+    with torch.inference_mode():
+        for features in batches:
+            outputs = model(**features, output_hidden_states=True, return_dict=True)
+            for layer in layers:
+                cls_by_layer[layer].append(outputs.hidden_states[layer][:, 0].double().cpu())
+            final_logits.append(outputs.logits[:, 0].double().cpu())
+
+    target = torch.cat(final_logits)
+    final_scores = torch.sigmoid(target).numpy()
+    weights, biases, thresholds = [], [], []
+    for layer in layers:
+        cls = torch.cat(cls_by_layer[layer])
+        solution = _fit_head(cls, target, ridge)
+        head_scores = torch.sigmoid(cls @ solution[:-1] + solution[-1]).numpy()
+        confidence = np.abs(2 * head_scores - 1)
+        thresholds.append(
+            _calibrate_threshold(confidence, np.abs(head_scores - final_scores), max_error)
+        )
+        weights.append(solution[:-1].float())
+        biases.append(solution[-1].float())
+        logger.info(f"Layer {layer}: exit when confidence >= {thresholds[-1]:.4f}")
+
+    return {
+        "layers": layers,
+        "weight": torch.stack(weights),
+        "bias": torch.stack(biases),
+        "thresholds": thresholds,
+        "num_samples": len(target),
+        "max_error": max_error,
+    }
+
+
+class EarlyExitBertEncoder(PackedBertEncoder):
+    def __init__(self, model: torch.nn.Module, heads: dict, confidence: float | None = None):
+        super().__init__(model)
+        num_layers = len(self.bert.encoder.layer)
+        param = next(model.parameters())
+        thresholds = heads["thresholds"]
+        if confidence is not None:
+            thresholds = [confidence] * len(heads["layers"])
+
+        self.num_layers = num_layers
+        self.exits: dict[int, tuple[torch.Tensor, torch.Tensor, float]] = {
+            layer: (weight.to(param.device, param.dtype), bias.to(param.device, param.dtype), t)
+            for layer, weight, bias, t in zip(
+                heads["layers"], heads["weight"], heads["bias"], thresholds, strict=True
+            )
+            if layer < num_layers
+        }
+
+    @staticmethod
+    def supports(model: torch.nn.Module) -> bool:
+        return PackedBertEncoder.supports(model) and model.config.num_labels == 1
+
+    def __call__(self, features: dict[str, torch.Tensor]) -> torch.Tensor:
+        return self.forward_with_exits(features)[0]
+
+    def forward_with_exits(
+        self, features: dict[str, torch.Tensor]
+    ) -> tuple[torch.Tensor, np.ndarray]:
+        hidden, lengths, order = self._pack(features)
+        num_rows = lengths.shape[0]
+        running = torch.arange(num_rows, device=hidden.device)
+        logits = torch.empty((num_rows, 1), dtype=hidden.dtype, device=hidden.device)
+        exit_layers = torch.full((num_rows,), self.num_layers, device=hidden.device)
+
+        for depth, layer in enumerate(self.bert.encoder.layer, start=1):
+            hidden = self._layer(layer, hidden, self._length_groups(lengths))
+            if depth not in self.exits:
+                continue
+
+            weight, bias, threshold = self.exits[depth]
+            head_logits = self._cls_states(hidden, lengths) @ weight + bias
+            done = (2 * torch.sigmoid(head_logits.float()) - 1).abs() >= threshold
+            if not done.any():
+                continue
+
+            logits[running[done], 0] = head_logits[done]
+            exit_layers[running[done]] = depth
+            keep = ~done
+            hidden = hidden[keep.repeat_interleave(lengths)]
+            lengths, running = lengths[keep], running[keep]
+            if running.numel() == 0:
+                break
+
+        if running.numel() > 0:
+            logits[running] = self._classify(hidden, lengths)
+        return self._unsort(logits, order), self._unsort(exit_layers, order).cpu().numpy()
+
+
+__all__ = [
+    "EarlyExitBertEncoder",
+    "calibrate_exit_heads",
+    "load_exit_heads",
+    "save_exit_heads",
+]
@@ -0,0 +1,193 @@
+import inspect
+import logging
+import os
+import re
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+
+from src.server.backends.base import BaseBackend
+from src.server.dto import InferenceResult
+
+logger = logging.getLogger(__name__)
+
+ONNX_CACHE_DIR = Path.home() / ".cache" / "cross-encoder-onnx"
+ONNX_INPUT_ORDER = ("input_ids", "attention_mask", "token_type_ids")
+
+_PROVIDERS_BY_DEVICE = {
+    "cuda": "CUDAExecutionProvider",
+    "mps": "CoreMLExecutionProvider",
+}
+
+
+class OnnxBackend(BaseBackend):
+    def __init__(
+        self,
+        model_name: str,
+        device: str = "cpu",
+        quantization: str = "fp32",
+        max_length: int = 512,
+        optimize: bool = True,
+        cache_dir: str | Path | None = None,
+    ):
+        super().__init__(model_name, device, quantization, max_length)
+        self._optimize = optimize
+        self._cache_dir = Path(cache_dir) if cache_dir else ONNX_CACHE_DIR
+        self._session = None
+        self._input_names: list[str] = []
+
+    def _model_path(self, quantization: str) -> Path:
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", self.model_name).strip("_")
+        return self._cache_dir / f"{safe_name}_len{self.max_length}_{quantization}.onnx"
+
+    def _export_fp32(self) -> Path:
+        path = self._model_path("fp32")
+        if path.exists():
+            return path
+
+        from sentence_transformers import CrossEncoder
+
+        logger.info(f"Exporting {self.model_name} to ONNX: {path}")
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        cross_encoder = CrossEncoder(self.model_name, device="cpu", max_length=self.max_length)
+        model = cross_encoder.model.eval()
+        dummy = cross_encoder.tokenizer(
+            [["warmup query", "warmup document"]] * 2,
+            padding=True,
+            truncation="longest_first",
+            max_length=self.max_length,
+            return_tensors="pt",
+        )
+        input_names = [name for name in ONNX_INPUT_ORDER if name in dummy]
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+        dynamic_axes["logits"] = {0: "batch"}
+
+        export_kwargs = {}
+        if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+            export_kwargs["dynamo"] = False
+
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with torch.inference_mode():
+            torch.onnx.export(
+                model,
+                ({name: dummy[name] for name in input_names},),
+                str(tmp_path),
+                input_names=input_names,
+                output_names=["logits"],
+                dynamic_axes=dynamic_axes,
+                opset_version=17,
+                **export_kwargs,
+            )
+        os.replace(tmp_path, path)
+        return path
+
+    def _ensure_exported(self) -> Path:
+        fp32_path = self._export_fp32()
+        if self.quantization != "int8":
+            if self.quantization != "fp32":
+                logger.warning(f"ONNX backend does not support {self.quantization}, using FP32")
+            return fp32_path
+
+        int8_path = self._model_path("int8")
+        if not int8_path.exists():
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+
+            logger.info(f"Quantizing ONNX model to INT8: {int8_path}")
+            tmp_path = int8_path.with_suffix(f".{os.getpid()}.tmp")
+            quantize_dynamic(str(fp32_path), str(tmp_path), weight_type=QuantType.QInt8)
+            os.replace(tmp_path, int8_path)
+        return int8_path
+
+    def load_model(self) -> None:
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise RuntimeError("ONNX backend requires onnxruntime: pip install onnxruntime") from e
+
+        model_path = self._ensure_exported()
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = (
+            ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            if self._optimize
+            else ort.GraphOptimizationLevel.ORT_ENABLE_BASIC
+        )
+
+        providers = ["CPUExecutionProvider"]
+        preferred = _PROVIDERS_BY_DEVICE.get(self.device.split(":")[0])
+        if preferred and preferred in ort.get_available_providers():
+            providers.insert(0, preferred)
+
+        self._session = ort.InferenceSession(str(model_path), options, providers=providers)
+        self._input_names = [i.name for i in self._session.get_inputs()]
+        self.model = self._session
+
+        logger.info(
+            f"Loaded ONNX model {model_path.name} ({self.quantization}, "
+            f"optimize={self._optimize}, providers={self._session.get_providers()})"
+        )
+        self._is_loaded = True
+
+    def _run(self, features: dict) -> np.ndarray:
+        inputs = {
+            name: np.asarray(features[name], dtype=np.int64)
+            for name in self._input_names
+            if name in features
+        }
+        logits = self._session.run(["logits"], inputs)[0]
+
+        if logits.shape[1] == 1:
+            return 1.0 / (1.0 + np.exp(-logits[:, 0]))
+        exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+        return exp[:, 1] / exp.sum(axis=1)
+
+    def infer(self, pairs: list[tuple[str, str]]) -> np.ndarray:
+        self._acquire()
+        try:
+            tokenized_batch = self._get_tokenizer().tokenize(pairs)
+            return self._run(tokenized_batch.features)
+        finally:
+            self._release()
+
+    def infer_with_timing(self, pairs: list[tuple[str, str]]) -> InferenceResult:
+        tokenized_batch = self._get_tokenizer().tokenize(pairs)
+        result = self.infer_with_tokenized(tokenized_batch)
+        result.t_tokenize_ms = tokenized_batch.tokenize_time_ms
+        result.total_ms = result.t_tokenize_ms + result.t_model_inference_ms
+        return result
+
+    def infer_with_tokenized(self, tokenized_batch) -> InferenceResult:
+        self._acquire()
+        try:
+            inf_start = time.perf_counter()
+            scores = self._run(tokenized_batch.features)
+            t_inf = (time.perf_counter() - inf_start) * 1000
+
+            return InferenceResult(
+                scores=scores.astype(np.float32),
+                t_tokenize_ms=0.0,
+                t_model_inference_ms=t_inf,
+                total_ms=t_inf,
+                total_tokens=tokenized_batch.total_tokens,
+                real_tokens=tokenized_batch.real_tokens,
+                padded_tokens=tokenized_batch.padded_tokens,
+                padding_ratio=tokenized_batch.padding_ratio,
+                max_seq_length=tokenized_batch.max_seq_length,
+                avg_seq_length=tokenized_batch.avg_seq_length,
+                batch_size=tokenized_batch.batch_size,
+            )
+        finally:
+            self._release()
+
+    @classmethod
+    def from_config(cls, config) -> "OnnxBackend":
+        return cls(
+            model_name=config.name if hasattr(config, "name") else config["name"],
+            device=getattr(config, "device", "cpu"),
+            quantization=getattr(config, "quantization", "fp32"),
+            max_length=getattr(config, "max_length", 512),
+            optimize=getattr(config, "onnx_optimize", True),
+        )
@@ -0,0 +1,103 @@
+import logging
+
+import torch
+import torch.nn.functional as functional
+
+logger = logging.getLogger(__name__)
+
+
+class PackedBertEncoder:
+    def __init__(self, model: torch.nn.Module):
+        self.bert = model.bert
+        self.classifier = model.classifier
+
+    @staticmethod
+    def supports(model: torch.nn.Module) -> bool:
+        bert = getattr(model, "bert", None)
+        return (
+            bert is not None
+            and getattr(model.config, "model_type", None) == "bert"
+            and getattr(model.config, "position_embedding_type", "absolute") == "absolute"
+            and hasattr(bert, "embeddings")
+            and hasattr(bert, "encoder")
+            and getattr(bert, "pooler", None) is not None
+            and hasattr(model, "classifier")
+        )
+
+    @staticmethod
+    def _length_groups(lengths: torch.Tensor) -> list[tuple[int, int]]:
+        seq_lengths, counts = torch.unique_consecutive(lengths, return_counts=True)
+        return list(zip(seq_lengths.tolist(), counts.tolist(), strict=True))
+
+    @staticmethod
+    def _cls_states(hidden: torch.Tensor, lengths: torch.Tensor) -> torch.Tensor:
+        return hidden[functional.pad(lengths.cumsum(0), (1, 0))[:-1]]
+
+    @staticmethod
+    def _unsort(values: torch.Tensor, order: torch.Tensor) -> torch.Tensor:
+        result = torch.empty_like(values)
+        result[order] = values
+        return result
+
+    def __call__(self, features: dict[str, torch.Tensor]) -> torch.Tensor:
+        hidden, lengths, order = self._pack(features)
+        groups = self._length_groups(lengths)
+        for layer in self.bert.encoder.layer:
+            hidden = self._layer(layer, hidden, groups)
+        return self._unsort(self._classify(hidden, lengths), order)
+
+    def _pack(
+        self, features: dict[str, torch.Tensor]
+    ) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        mask = features["attention_mask"].bool()
+        order = torch.argsort(mask.sum(dim=1), stable=True)
+        mask = mask[order]
+
+        input_ids = features["input_ids"][order][mask]
+        token_type_ids = features.get("token_type_ids")
+        if token_type_ids is None:
+            token_type_ids = torch.zeros_like(input_ids)
+        else:
+            token_type_ids = token_type_ids[order][mask]
+        positions = torch.arange(mask.shape[1], device=mask.device).expand_as(mask)[mask]
+
+        return self._embed(input_ids, token_type_ids, positions), mask.sum(dim=1), order
+
+    def _classify(self, hidden: torch.Tensor, lengths: torch.Tensor) -> torch.Tensor:
+        return self.classifier(self.bert.pooler(self._cls_states(hidden, lengths).unsqueeze(1)))
+
+    def _embed(
+        self, input_ids: torch.Tensor, token_type_ids: torch.Tensor, positions: torch.Tensor
+    ) -> torch.Tensor:
+        emb = self.bert.embeddings
+        hidden = (
+            emb.word_embeddings(input_ids)
+            + emb.token_type_embeddings(token_type_ids)
+            + emb.position_embeddings(positions)
+        )
+        return emb.LayerNorm(hidden)
+
+    def _attention(self, attn, hidden: torch.Tensor, groups: list[tuple[int, int]]) -> torch.Tensor:
+        heads, head_size = attn.num_attention_heads, attn.attention_head_size
+        query, key, value = attn.query(hidden), attn.key(hidden), attn.value(hidden)
+
+        outputs = []
+        start = 0
+        for seq_len, count in groups:
+            end = start + seq_len * count
+            shape = (count, seq_len, heads, head_size)
+            q, k, v = (x[start:end].view(shape).transpose(1, 2) for x in (query, key, value))
+            context = functional.scaled_dot_product_attention(q, k, v)
+            outputs.append(context.transpose(1, 2).reshape(end - start, heads * head_size))
+            start = end
+        return torch.cat(outputs)
+
+    def _layer(self, layer, hidden: torch.Tensor, groups: list[tuple[int, int]]) -> torch.Tensor:
+        context = self._attention(layer.attention.self, hidden, groups)
+        attn_out = layer.attention.output
+        hidden = attn_out.LayerNorm(attn_out.dense(context) + hidden)
+        ffn_out = layer.output
+        return ffn_out.LayerNorm(ffn_out.dense(layer.intermediate(hidden)) + hidden)
+
+
+__all__ = ["PackedBertEncoder"]
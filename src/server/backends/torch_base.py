@@ -6,13 +6,49 @@ import numpy as np
 import torch
 
 from src.server.backends.base import BaseBackend
-from src.server.backends.device import sync_device
+from src.server.backends.device import features_to_torch, sync_device
+from src.server.backends.early_exit import EarlyExitBertEncoder, load_exit_heads
+from src.server.backends.packed import PackedBertEncoder
 from src.server.dto import InferenceResult
 
 logger = logging.getLogger(__name__)
 
 
 class TorchBackend(BaseBackend, ABC):
+    _packed_encoder: PackedBertEncoder | None = None
+
+    def enable_packed(self) -> bool:
+        model = self.model.model
+        if not PackedBertEncoder.supports(model):
+            logger.warning(f"Packed inference not supported for {self.model_name}, using padding")
+            return False
+        self._packed_encoder = PackedBertEncoder(model)
+        logger.info(f"Packed inference enabled for {self.model_name}")
+        return True
+
+    def enable_early_exit(self, heads_path: str, confidence: float | None = None) -> bool:
+        model = self.model.model
+        if not EarlyExitBertEncoder.supports(model):
+            logger.warning(f"Early exit not supported for {self.model_name}")
+            return False
+        heads = load_exit_heads(heads_path)
+        self._packed_encoder = EarlyExitBertEncoder(model, heads, confidence)
+        logger.info(f"Early exit enabled for {self.model_name} at layers {heads['layers']}")
+        return True
+
+    def share_memory(self) -> bool:
+        if self.device != "cpu":
+            return False
+        self.model.model.share_memory()
+        return True
+
+    def _forward(self, features: dict[str, torch.Tensor]) -> tuple[torch.Tensor, np.ndarray | None]:
+        if isinstance(self._packed_encoder, EarlyExitBertEncoder):
+            return self._packed_encoder.forward_with_exits(features)
+        if self._packed_encoder is not None:
+            return self._packed_encoder(features), None
+        return self.model.model(**features, return_dict=True).logits, None
+
     def _get_tokenizer(self):
         if self._tokenizer_pool is not None:
             return self._tokenizer_pool
@@ -36,19 +72,14 @@ class TorchBackend(BaseBackend, ABC):
             total_start = time.perf_counter()
 
             tokenizer = self._get_tokenizer()
-            if self._tokenizer_pool:
-                tokenized_batch = tokenizer.tokenize(pairs)
-                features = {k: v.to(self.device) for k, v in tokenized_batch.features.items()}
-            else:
-                tokenized_batch = tokenizer.tokenize(pairs, device=self.device)
-                features = tokenized_batch.features
+            tokenized_batch = tokenizer.tokenize(pairs)
+            features = features_to_torch(tokenized_batch.features, self.device)
 
             inf_start = time.perf_counter()
             sync_device(self.device)
 
             with torch.inference_mode():
-                out = self.model.model(**features, return_dict=True)
-                logits = out.logits
+                logits, exit_layers = self._forward(features)
                 if self.model.config.num_labels == 1:
                     scores = torch.sigmoid(logits).squeeze(-1)
                 else:
@@ -70,6 +101,7 @@ class TorchBackend(BaseBackend, ABC):
                 max_seq_length=tokenized_batch.max_seq_length,
                 avg_seq_length=tokenized_batch.avg_seq_length,
                 batch_size=tokenized_batch.batch_size,
+                exit_layers=exit_layers,
             )
         finally:
             self._release()
@@ -77,14 +109,13 @@ class TorchBackend(BaseBackend, ABC):
     def infer_with_tokenized(self, tokenized_batch) -> InferenceResult:
         self._acquire()
         try:
-            features = {k: v.to(self.device) for k, v in tokenized_batch.features.items()}
+            features = features_to_torch(tokenized_batch.features, self.device)
 
             inf_start = time.perf_counter()
             sync_device(self.device)
 
             with torch.inference_mode():
-                out = self.model.model(**features, return_dict=True)
-                logits = out.logits
+                logits, exit_layers = self._forward(features)
                 if self.model.config.num_labels == 1:
                     scores = torch.sigmoid(logits).squeeze(-1)
                 else:
@@ -106,6 +137,7 @@ class TorchBackend(BaseBackend, ABC):
                 max_seq_length=tokenized_batch.max_seq_length,
                 avg_seq_length=tokenized_batch.avg_seq_length,
                 batch_size=tokenized_batch.batch_size,
+                exit_layers=exit_layers,
             )
         finally:
             self._release()
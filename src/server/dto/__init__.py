@@ -1,33 +1,47 @@
 from src.server.dto.benchmark import BenchmarkState
 from src.server.dto.config import (
+    AdmissionConfig,
+    AutoscaleConfig,
     BatchConfig,
+    CacheConfig,
+    CascadeConfig,
     Config,
     ModelConfig,
     PoolConfig,
+    PriorityConfig,
     ServerConfig,
     TokenizerPoolConfig,
 )
 from src.server.dto.inference import (
     InferenceResult,
+    TokenIdBatch,
     TokenizedBatch,
     WorkItem,
     WorkResult,
 )
 from src.server.dto.metrics import MetricsCollector
 from src.server.dto.scheduler import PendingRequest
+from src.server.dto.shared_memory import SharedTensorRef
 
 __all__ = [
     "InferenceResult",
     "TokenizedBatch",
+    "TokenIdBatch",
     "WorkItem",
     "WorkResult",
     "ModelConfig",
     "PoolConfig",
     "TokenizerPoolConfig",
     "BatchConfig",
+    "CacheConfig",
+    "AdmissionConfig",
+    "CascadeConfig",
+    "AutoscaleConfig",
+    "PriorityConfig",
     "ServerConfig",
     "Config",
     "MetricsCollector",
     "PendingRequest",
+    "SharedTensorRef",
     "BenchmarkState",
 ]
@@ -14,10 +14,37 @@ class ModelConfig(BaseModel):
     )
     max_length: int = 512
     onnx_optimize: bool = True
+    packed: bool = Field(
+        default=False, description="Run BERT encoders on a packed token stream (no padding)"
+    )
+    early_exit_heads: str = Field(
+        default="", description="Calibrated exit heads file (empty = full depth)"
+    )
+    early_exit_confidence: float | None = Field(
+        default=None, description="Override the calibrated per-layer exit confidence"
+    )
 
 
 class PoolConfig(BaseModel):
     instances: list[ModelConfig] = Field(default_factory=list)
+    routing_strategy: Literal[
+        "round_robin", "least_requests", "least_tokens", "power_of_two", "smart_idle", "first_idle"
+    ] = "round_robin"
+    merge_max_tokens: int = Field(
+        default=0, description="Padded token budget for merging queued work per worker (0 = off)"
+    )
+    fork_server: bool = Field(
+        default=False, description="Load weights once and fork CPU workers sharing them"
+    )
+    pin_cpus: bool = Field(
+        default=False, description="Pin workers to disjoint core sets and size their thread pools"
+    )
+    supervise_interval_s: float = Field(
+        default=1.0, description="Dead worker check interval; dead workers are respawned (0 = off)"
+    )
+    max_request_retries: int = Field(
+        default=1, description="Times a request is retried after the worker serving it crashed"
+    )
 
 
 class TokenizerPoolConfig(BaseModel):
@@ -25,6 +52,21 @@ class TokenizerPoolConfig(BaseModel):
     num_workers: int = 3
     model_name: str = ""
     tokenizers_parallelism: bool = False
+    shared_memory: bool = False
+    shm_num_slots: int = 32
+    shm_slot_tokens: int = Field(
+        default=128 * 512, description="Token capacity per slot (max_batch x max_seq)"
+    )
+    doc_cache_size: int = Field(
+        default=0, description="Cached document token id lists per worker (0 = disabled)"
+    )
+    cores_per_worker: int = Field(default=1, description="Cores reserved per pinned worker")
+    supervise_interval_s: float = Field(
+        default=1.0, description="Dead worker check interval; dead workers are respawned (0 = off)"
+    )
+    max_request_retries: int = Field(
+        default=1, description="Times a request is retried after the worker serving it crashed"
+    )
 
 
 class BatchConfig(BaseModel):
@@ -32,6 +74,21 @@ class BatchConfig(BaseModel):
     max_batch_size: int = 8
     timeout_ms: float = 100
     length_aware: bool = False
+    max_tokens_per_batch: int = Field(
+        default=0, description="Padded token budget per batch (0 = count/timeout only)"
+    )
+    bucket_boundaries: list[int] = Field(
+        default_factory=list, description="Estimated token length bucket upper bounds"
+    )
+    bucket_timeouts_ms: list[float] = Field(
+        default_factory=list, description="Per-bucket timeouts (defaults to timeout_ms)"
+    )
+    adaptive_timeout: bool = Field(
+        default=False, description="Tune timeout_ms online against target_p99_ms"
+    )
+    target_p99_ms: float = Field(default=200.0, description="p99 request latency target")
+    min_timeout_ms: float = 1.0
+    max_timeout_ms: float = 200.0
 
 
 class PipelineConfig(BaseModel):
@@ -39,12 +96,86 @@ class PipelineConfig(BaseModel):
     mode: Literal["full", "tokenization_only", "inference_only"] = "full"
 
 
+class CacheConfig(BaseModel):
+    enabled: bool = False
+    max_entries: int = 100_000
+    ttl_seconds: float = 300.0
+
+
+class AdmissionConfig(BaseModel):
+    enabled: bool = False
+    max_queue_delay_ms: float = Field(
+        default=1000.0, description="Reject when estimated queueing delay exceeds this"
+    )
+    batch_queue_size: int = Field(default=0, description="Batch queue capacity (0 = unbounded)")
+    tokenizer_queue_size: int = Field(
+        default=0, description="Tokenizer input queue capacity (0 = unbounded)"
+    )
+    inference_queue_size: int = Field(
+        default=0, description="Tokenized batch queue capacity (0 = unbounded)"
+    )
+    worker_queue_size: int = Field(
+        default=0, description="Per model worker input queue capacity (0 = unbounded)"
+    )
+
+
+class CascadeConfig(BaseModel):
+    enabled: bool = False
+    instances: list[ModelConfig] = Field(
+        default_factory=list, description="Cheap first-stage model replicas"
+    )
+    top_k: int = Field(default=0, description="Pairs per query forwarded to stage 2 (0 = no cap)")
+    threshold: float | None = Field(
+        default=None, description="Minimum stage-1 score forwarded to stage 2"
+    )
+    tokenizer_workers: int = 1
+
+
+class AutoscaleConfig(BaseModel):
+    enabled: bool = False
+    interval_s: float = Field(default=2.0, description="Seconds between scaling decisions")
+    tokenizer_min_workers: int = 1
+    tokenizer_max_workers: int = 4
+    model_min_workers: int = 1
+    model_max_workers: int = 4
+    max_total_workers: int = Field(
+        default=0, description="Worker budget shared by both stages (0 = no shared cap)"
+    )
+    scale_up_queue_depth: float = Field(
+        default=4.0, description="Queued requests per worker that count as overloaded"
+    )
+    scale_down_queue_depth: float = Field(
+        default=0.5, description="Queued requests per worker that count as idle"
+    )
+    scale_up_wait_ms: float = Field(
+        default=50.0, description="Mean stage queue wait that counts as overloaded (0 = ignore)"
+    )
+    scale_down_wait_ms: float = Field(
+        default=5.0, description="Mean stage queue wait below which a stage counts as idle"
+    )
+    sustain_intervals: int = Field(
+        default=3, description="Consecutive overloaded/idle intervals before scaling"
+    )
+    cooldown_s: float = Field(default=10.0, description="Minimum seconds between scaling a stage")
+
+
+class PriorityConfig(BaseModel):
+    enabled: bool = False
+    default_class: Literal["interactive", "batch", "best_effort"] = "interactive"
+    aging_ms: dict[str, float] = Field(
+        default_factory=lambda: {"batch": 1000.0, "best_effort": 5000.0},
+        description="Queue wait after which a request of that class is served first",
+    )
+
+
 class ServerConfig(BaseModel):
     host: str = "0.0.0.0"
     grpc_port: int = 50051
     http_port: int = 8080
     prometheus_port: int = 8000
     grpc_workers: int = 10
+    grpc_mode: Literal["threaded", "aio"] = "threaded"
+    stream_window: int = Field(default=8, description="Max in-flight chunks per ScoreStream call")
 
 
 class Config(BaseModel):
@@ -52,6 +183,11 @@ class Config(BaseModel):
     tokenizer_pool: TokenizerPoolConfig = Field(default_factory=TokenizerPoolConfig)
     batching: BatchConfig = Field(default_factory=BatchConfig)
     pipeline: PipelineConfig = Field(default_factory=PipelineConfig)
+    cache: CacheConfig = Field(default_factory=CacheConfig)
+    admission: AdmissionConfig = Field(default_factory=AdmissionConfig)
+    cascade: CascadeConfig = Field(default_factory=CascadeConfig)
+    autoscale: AutoscaleConfig = Field(default_factory=AutoscaleConfig)
+    priority: PriorityConfig = Field(default_factory=PriorityConfig)
     server: ServerConfig = Field(default_factory=ServerConfig)
     name: str = ""
     description: str = ""
@@ -1,7 +1,8 @@
 from dataclasses import dataclass
 
 import numpy as np
-import torch
+
+from src.server.dto.shared_memory import SharedTensorRef
 
 
 @dataclass
@@ -29,11 +30,12 @@ class InferenceResult:
     worker_id: int = -1
     tokenizer_worker_id: int = -1
     status_code: int = 200
+    exit_layers: np.ndarray | None = None
 
 
 @dataclass
 class TokenizedBatch:
-    features: dict[str, torch.Tensor]
+    features: dict[str, np.ndarray]
     batch_size: int
     max_seq_length: int
     total_tokens: int
@@ -43,6 +45,17 @@ class TokenizedBatch:
     avg_seq_length: float
     tokenize_time_ms: float
     overhead_ms: float = 0.0
+    shm_ref: SharedTensorRef | None = None
+
+
+@dataclass
+class TokenIdBatch:
+    input_ids: np.ndarray
+    lengths: np.ndarray
+    token_type_ids: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        return len(self.lengths)
 
 
 @dataclass
@@ -67,3 +80,4 @@ class WorkResult:
     max_seq_length: int = 0
     avg_seq_length: float = 0.0
     batch_size: int = 0
+    exit_layers: np.ndarray | None = None
@@ -1,14 +1,17 @@
 import threading
 import time
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Optional
 
+from src.server.dto.request import RequestLifecycle
+
 if TYPE_CHECKING:
     from src.server.dto import InferenceResult, TokenizedBatch
 
 
 @dataclass
-class PipelineRequest:
+class PipelineRequest(RequestLifecycle):
     request_id: int
     pairs: list[tuple[str, str]]
     submit_time: float = field(default_factory=time.perf_counter)
@@ -26,6 +29,16 @@ class PipelineRequest:
     t_queue_tokenization_wait_ms: float = 0.0
     t_queue_inference_wait_ms: float = 0.0
 
+    deadline: float | None = None
+    cancel_event: threading.Event | None = None
+    crash_retries: int = 0
+    priority: int = 0
+
+    done_callbacks: list[Callable[[], None]] = field(default_factory=list)
+
+    def _done_event(self) -> threading.Event:
+        return self.result_event
+
 
 @dataclass
 class TokenizationQueueItem:
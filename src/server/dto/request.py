@@ -0,0 +1,24 @@
+import threading
+import time
+from collections.abc import Callable
+
+
+class RequestLifecycle:
+    deadline: float | None
+    cancel_event: threading.Event | None
+    done_callbacks: list[Callable[[], None]]
+
+    def _done_event(self) -> threading.Event:
+        raise NotImplementedError
+
+    def is_expired(self, now: float | None = None) -> bool:
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            return True
+        if self.deadline is None:
+            return False
+        return (time.perf_counter() if now is None else now) >= self.deadline
+
+    def complete(self) -> None:
+        self._done_event().set()
+        for callback in self.done_callbacks:
+            callback()
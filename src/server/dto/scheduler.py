@@ -1,15 +1,25 @@
 import threading
-from dataclasses import dataclass
+from collections.abc import Callable
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Optional
 
+from src.server.dto.request import RequestLifecycle
+
 if TYPE_CHECKING:
     from src.server.dto import InferenceResult
 
 
 @dataclass
-class PendingRequest:
+class PendingRequest(RequestLifecycle):
     pairs: list[tuple[str, str]]
     result_future: threading.Event
     result: Optional["InferenceResult"] = None
     submit_time: float = 0.0
     error: Exception | None = None
+    deadline: float | None = None
+    cancel_event: threading.Event | None = None
+    priority: int = 0
+    done_callbacks: list[Callable[[], None]] = field(default_factory=list)
+
+    def _done_event(self) -> threading.Event:
+        return self.result_future
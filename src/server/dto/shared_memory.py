@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class SharedTensorRef:
+    slab_name: str
+    slot_id: int
+    offset: int
+    shape: tuple[int, ...]
+    keys: tuple[str, ...]
+    dtypes: tuple[str, ...]
+
+
+__all__ = ["SharedTensorRef"]
@@ -1,12 +1,24 @@
+import asyncio
 import logging
+import queue
+import threading
 import time
 from concurrent import futures
+from itertools import repeat
 from typing import TYPE_CHECKING, Optional
 
 import grpc
 import numpy as np
 
 from src.proto import inference_pb2, inference_pb2_grpc
+from src.proto.packed import pack_scores, unpack_pairs, unpack_token_ids
+from src.server.dto import TokenIdBatch
+from src.server.utils.admission import (
+    InvalidRequestError,
+    OverloadedError,
+    RequestExpiredError,
+    WorkerCrashedError,
+)
 
 if TYPE_CHECKING:
     from src.server.services.metrics_service import MetricsService
@@ -14,29 +26,274 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+_STREAM_RETRY_S = 0.005
+_STREAM_MAX_RETRY_S = 0.1
+_PRIORITY_PREFIX = "PRIORITY_"
+
+
+def _deadline_ms(context) -> float | None:
+    remaining = context.time_remaining() if context is not None else None
+    return None if remaining is None else remaining * 1000
+
+
+def _priority(request) -> str | None:
+    if request.priority == inference_pb2.PRIORITY_UNSPECIFIED:
+        return None
+    if request.priority not in inference_pb2.Priority.values():
+        raise ValueError(f"Unknown priority {request.priority}")
+    return inference_pb2.Priority.Name(request.priority).removeprefix(_PRIORITY_PREFIX).lower()
+
+
+def _request_options(request, context) -> dict:
+    return {"deadline_ms": _deadline_ms(context), "priority": _priority(request)}
+
+
+def _error_status(error: Exception) -> int:
+    if isinstance(error, RequestExpiredError):
+        return 504
+    if isinstance(error, WorkerCrashedError):
+        return 503
+    return 500
+
+
+def _stream_stopped(context, cancel_event: threading.Event | None) -> Exception | None:
+    if cancel_event is not None and cancel_event.is_set():
+        return RequestExpiredError("Stream cancelled by client")
+    deadline_ms = _deadline_ms(context)
+    if deadline_ms is not None and deadline_ms <= 0:
+        return RequestExpiredError("Stream deadline exceeded")
+    return None
+
+
+def _cancel_event(context) -> threading.Event | None:
+    if context is None:
+        return None
+    cancel_event = threading.Event()
+    context.add_callback(cancel_event.set)
+    return cancel_event
+
 
 class InferenceServicer(inference_pb2_grpc.InferenceServiceServicer):
     def __init__(
-        self, inference_handler: "InferenceInterface", metrics: Optional["MetricsService"] = None
+        self,
+        inference_handler: "InferenceInterface",
+        metrics: Optional["MetricsService"] = None,
+        stream_window: int = 8,
     ):
         self._inference_handler = inference_handler
         self._metrics = metrics
+        self._stream_window = max(stream_window, 1)
 
     def Infer(self, request, context):
         total_start = time.perf_counter()
+        try:
+            inputs, options, t_grpc_deserialize_ms = self._infer_inputs(request, context)
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        try:
+            schedule = (
+                self._inference_handler.schedule_tokens
+                if isinstance(inputs, TokenIdBatch)
+                else self._inference_handler.schedule
+            )
+            result = schedule(inputs, cancel_event=_cancel_event(context), **options)
+        except InvalidRequestError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        except OverloadedError as e:
+            context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, str(e))
+        except RequestExpiredError as e:
+            context.abort(grpc.StatusCode.DEADLINE_EXCEEDED, str(e))
+        except WorkerCrashedError as e:
+            context.abort(grpc.StatusCode.UNAVAILABLE, str(e))
+        return self._infer_response(
+            result, len(inputs), total_start, t_grpc_deserialize_ms, request.packed_scores
+        )
+
+    def Rerank(self, request, context):
+        total_start = time.perf_counter()
+        try:
+            pairs, options, t_grpc_deserialize_ms = self._rerank_inputs(request, context)
+        except ValueError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        if not pairs:
+            return inference_pb2.RerankResponse(status_code=204)
 
-        grpc_deserialize_start = time.perf_counter()
-        pairs = [(p.query, p.document) for p in request.pairs]
-        t_grpc_deserialize_ms = (time.perf_counter() - grpc_deserialize_start) * 1000
+        try:
+            result = self._inference_handler.schedule(
+                pairs, cancel_event=_cancel_event(context), **options
+            )
+        except InvalidRequestError as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        except OverloadedError as e:
+            context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, str(e))
+        except RequestExpiredError as e:
+            context.abort(grpc.StatusCode.DEADLINE_EXCEEDED, str(e))
+        except WorkerCrashedError as e:
+            context.abort(grpc.StatusCode.UNAVAILABLE, str(e))
+        return self._rerank_response(
+            result, request.top_k, len(pairs), total_start, t_grpc_deserialize_ms
+        )
 
-        result = self._inference_handler.schedule(pairs)
+    def ScoreStream(self, request_iterator, context):
+        cancel_event = _cancel_event(context)
+        window = threading.Semaphore(self._stream_window)
+        stopped = threading.Event()
+        done: queue.Queue = queue.Queue()
+        with futures.ThreadPoolExecutor(max_workers=self._stream_window) as executor:
+            threading.Thread(
+                target=self._read_stream,
+                args=(request_iterator, executor, window, stopped, done, context, cancel_event),
+                daemon=True,
+            ).start()
 
+            try:
+                completed, submitted = 0, None
+                while submitted is None or completed < submitted:
+                    item = done.get()
+                    if isinstance(item, int):
+                        submitted = item
+                        continue
+                    completed += 1
+                    window.release()
+                    yield item.result()
+            finally:
+                stopped.set()
+                window.release()
+
+    def _read_stream(
+        self,
+        request_iterator,
+        executor: futures.ThreadPoolExecutor,
+        window: threading.Semaphore,
+        stopped: threading.Event,
+        done: queue.Queue,
+        context,
+        cancel_event: threading.Event | None,
+    ) -> None:
+        submitted = 0
+        try:
+            for chunk in request_iterator:
+                window.acquire()
+                if stopped.is_set():
+                    break
+                future = executor.submit(self._score_chunk, chunk, context, cancel_event)
+                future.add_done_callback(done.put)
+                submitted += 1
+        except Exception as e:
+            logger.debug(f"ScoreStream reader stopped: {e}")
+        finally:
+            done.put(submitted)
+
+    def _score_chunk(
+        self, chunk, context, cancel_event: threading.Event | None
+    ) -> inference_pb2.ScoreChunkResult:
+        start = time.perf_counter()
+        pairs, t_grpc_deserialize_ms = self._chunk_pairs(chunk)
+        if not pairs:
+            return inference_pb2.ScoreChunkResult(chunk_id=chunk.chunk_id, status_code=200)
+
+        backoff = _STREAM_RETRY_S
+        while True:
+            try:
+                result = self._inference_handler.schedule(
+                    pairs,
+                    deadline_ms=_deadline_ms(context),
+                    cancel_event=cancel_event,
+                    priority=_priority(chunk),
+                )
+            except OverloadedError:
+                stopped = _stream_stopped(context, cancel_event)
+                if stopped is not None:
+                    return self._chunk_failure(chunk.chunk_id, stopped)
+                time.sleep(backoff)
+                backoff = min(backoff * 2, _STREAM_MAX_RETRY_S)
+                continue
+            except Exception as e:
+                return self._chunk_failure(chunk.chunk_id, e)
+            return self._chunk_response(
+                chunk.chunk_id, result, len(pairs), start, t_grpc_deserialize_ms
+            )
+
+    def _chunk_response(
+        self,
+        chunk_id: int,
+        result,
+        num_pairs: int,
+        total_start: float,
+        t_grpc_deserialize_ms: float,
+    ) -> inference_pb2.ScoreChunkResult:
         grpc_serialize_start = time.perf_counter()
         scores = (
             result.scores.tolist() if isinstance(result.scores, np.ndarray) else list(result.scores)
         )
+        response = inference_pb2.ScoreChunkResult(
+            chunk_id=chunk_id, scores=scores, status_code=getattr(result, "status_code", 200)
+        )
+        t_grpc_serialize_ms = (time.perf_counter() - grpc_serialize_start) * 1000
+
+        total_latency = (time.perf_counter() - total_start) * 1000
+        response.latency_ms = total_latency
+
+        result.t_grpc_deserialize_ms = t_grpc_deserialize_ms
+        result.t_grpc_serialize_ms = t_grpc_serialize_ms
+        result.t_scheduler_ms = 0.0
+
+        self._record_metrics(result, num_pairs, total_latency)
+
+        return response
+
+    def _chunk_failure(self, chunk_id: int, error: Exception) -> inference_pb2.ScoreChunkResult:
+        if not isinstance(error, RequestExpiredError | WorkerCrashedError):
+            logger.error(f"ScoreStream chunk {chunk_id} failed: {error}")
+        return inference_pb2.ScoreChunkResult(
+            chunk_id=chunk_id, status_code=_error_status(error), error=str(error)
+        )
+
+    def _infer_inputs(
+        self, request, context
+    ) -> tuple[list[tuple[str, str]] | TokenIdBatch, dict, float]:
+        grpc_deserialize_start = time.perf_counter()
+        options = _request_options(request, context)
+        if request.HasField("tokens"):
+            inputs = TokenIdBatch(*unpack_token_ids(request.tokens))
+        elif request.HasField("packed"):
+            inputs = unpack_pairs(request.packed)
+        else:
+            inputs = [(p.query, p.document) for p in request.pairs]
+        return inputs, options, (time.perf_counter() - grpc_deserialize_start) * 1000
+
+    def _chunk_pairs(self, chunk) -> tuple[list[tuple[str, str]], float]:
+        grpc_deserialize_start = time.perf_counter()
+        pairs = [(p.query, p.document) for p in chunk.pairs]
+        return pairs, (time.perf_counter() - grpc_deserialize_start) * 1000
+
+    def _rerank_inputs(self, request, context) -> tuple[list[tuple[str, str]], dict, float]:
+        grpc_deserialize_start = time.perf_counter()
+        options = _request_options(request, context)
+        pairs = list(zip(repeat(request.query), request.documents))
+        return pairs, options, (time.perf_counter() - grpc_deserialize_start) * 1000
+
+    def _infer_response(
+        self,
+        result,
+        num_pairs: int,
+        total_start: float,
+        t_grpc_deserialize_ms: float,
+        packed_scores: bool = False,
+    ) -> inference_pb2.InferResponse:
+        grpc_serialize_start = time.perf_counter()
         status_code = getattr(result, "status_code", 200)
-        response = inference_pb2.InferResponse(scores=scores, status_code=status_code)
+        if packed_scores:
+            response = inference_pb2.InferResponse(
+                scores_f32=pack_scores(result.scores), status_code=status_code
+            )
+        else:
+            scores = (
+                result.scores.tolist()
+                if isinstance(result.scores, np.ndarray)
+                else list(result.scores)
+            )
+            response = inference_pb2.InferResponse(scores=scores, status_code=status_code)
         t_grpc_serialize_ms = (time.perf_counter() - grpc_serialize_start) * 1000
 
         total_latency = (time.perf_counter() - total_start) * 1000
@@ -46,8 +303,46 @@ class InferenceServicer(inference_pb2_grpc.InferenceServiceServicer):
 
         result.t_scheduler_ms = 0.0
 
+        self._record_metrics(result, num_pairs, total_latency)
+
+        return response
+
+    def _rerank_response(
+        self,
+        result,
+        top_k: int,
+        num_pairs: int,
+        total_start: float,
+        t_grpc_deserialize_ms: float,
+    ) -> inference_pb2.RerankResponse:
+        grpc_serialize_start = time.perf_counter()
+        scores = np.asarray(result.scores, dtype=np.float32)
+        indices = []
+        if top_k > 0:
+            indices = np.argsort(-scores, kind="stable")[:top_k].tolist()
+        status_code = getattr(result, "status_code", 200)
+        response = inference_pb2.RerankResponse(
+            scores=scores.tolist(),
+            indices=indices,
+            num_pairs=num_pairs,
+            status_code=status_code,
+        )
+        t_grpc_serialize_ms = (time.perf_counter() - grpc_serialize_start) * 1000
+
+        total_latency = (time.perf_counter() - total_start) * 1000
+        response.latency_ms = total_latency
+
+        result.t_grpc_deserialize_ms = t_grpc_deserialize_ms
+        result.t_grpc_serialize_ms = t_grpc_serialize_ms
+        result.t_scheduler_ms = 0.0
+
+        self._record_metrics(result, num_pairs, total_latency)
+
+        return response
+
+    def _record_metrics(self, result, num_pairs: int, total_latency: float) -> None:
         if self._metrics:
-            self._metrics.record(total_latency, len(pairs))
+            self._metrics.record(total_latency, num_pairs)
 
             self._metrics.record_stage_timings(
                 t_tokenize=getattr(result, "t_tokenize_ms", 0),
@@ -57,8 +352,8 @@ class InferenceServicer(inference_pb2_grpc.InferenceServiceServicer):
                 t_overhead=getattr(result, "t_overhead_ms", 0),
                 t_mp_queue_send=getattr(result, "t_mp_queue_send_ms", 0),
                 t_mp_queue_receive=getattr(result, "t_mp_queue_receive_ms", 0),
-                t_grpc_serialize=t_grpc_serialize_ms,
-                t_grpc_deserialize=t_grpc_deserialize_ms,
+                t_grpc_serialize=result.t_grpc_serialize_ms,
+                t_grpc_deserialize=result.t_grpc_deserialize_ms,
                 t_scheduler=getattr(result, "t_scheduler_ms", 0),
                 total_ms=total_latency,
             )
@@ -79,7 +374,7 @@ class InferenceServicer(inference_pb2_grpc.InferenceServiceServicer):
                 self._metrics.record_worker_stats(
                     worker_id=worker_id,
                     latency_ms=t_model_inference_ms if t_model_inference_ms > 0 else total_latency,
-                    num_queries=len(pairs),
+                    num_queries=num_pairs,
                 )
 
             tokenizer_worker_id = getattr(result, "tokenizer_worker_id", -1)
@@ -90,27 +385,145 @@ class InferenceServicer(inference_pb2_grpc.InferenceServiceServicer):
                     worker_id=tokenizer_worker_id,
                     latency_ms=t_tokenize_ms if t_tokenize_ms > 0 else 1.0,
                     total_tokens=total_tokens,
-                    num_queries=len(pairs),
+                    num_queries=num_pairs,
                 )
 
-        return response
 
+class AioInferenceServicer(InferenceServicer):
+    async def Infer(self, request, context):
+        total_start = time.perf_counter()
+        try:
+            inputs, options, t_grpc_deserialize_ms = self._infer_inputs(request, context)
+        except ValueError as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        try:
+            schedule = (
+                self._inference_handler.schedule_tokens_async
+                if isinstance(inputs, TokenIdBatch)
+                else self._inference_handler.schedule_async
+            )
+            result = await schedule(inputs, **options)
+        except InvalidRequestError as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        except OverloadedError as e:
+            await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, str(e))
+        except RequestExpiredError as e:
+            await context.abort(grpc.StatusCode.DEADLINE_EXCEEDED, str(e))
+        except WorkerCrashedError as e:
+            await context.abort(grpc.StatusCode.UNAVAILABLE, str(e))
+        return self._infer_response(
+            result, len(inputs), total_start, t_grpc_deserialize_ms, request.packed_scores
+        )
 
-def serve(
-    inference_handler: "InferenceInterface",
-    host: str = "127.0.0.1",
-    port: int = 50051,
-    max_workers: int = 10,
-    metrics: Optional["MetricsService"] = None,
-    use_ssl: bool = False,
-    ssl_cert_path: str | None = None,
-    ssl_key_path: str | None = None,
-) -> grpc.Server:
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
-    inference_pb2_grpc.add_InferenceServiceServicer_to_server(
-        InferenceServicer(inference_handler, metrics), server
-    )
+    async def Rerank(self, request, context):
+        total_start = time.perf_counter()
+        try:
+            pairs, options, t_grpc_deserialize_ms = self._rerank_inputs(request, context)
+        except ValueError as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        if not pairs:
+            return inference_pb2.RerankResponse(status_code=204)
+
+        try:
+            result = await self._inference_handler.schedule_async(pairs, **options)
+        except InvalidRequestError as e:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        except OverloadedError as e:
+            await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, str(e))
+        except RequestExpiredError as e:
+            await context.abort(grpc.StatusCode.DEADLINE_EXCEEDED, str(e))
+        except WorkerCrashedError as e:
+            await context.abort(grpc.StatusCode.UNAVAILABLE, str(e))
+        return self._rerank_response(
+            result, request.top_k, len(pairs), total_start, t_grpc_deserialize_ms
+        )
+
+    async def ScoreStream(self, request_iterator, context):
+        window = asyncio.Semaphore(self._stream_window)
+        done: asyncio.Queue = asyncio.Queue()
+        in_flight: set[asyncio.Task] = set()
+        reader = asyncio.create_task(
+            self._read_stream_async(request_iterator, window, done, in_flight, context)
+        )
+        try:
+            completed, submitted = 0, None
+            while submitted is None or completed < submitted:
+                item = await done.get()
+                if isinstance(item, int):
+                    submitted = item
+                    continue
+                completed += 1
+                window.release()
+                yield item
+        finally:
+            reader.cancel()
+            for task in in_flight:
+                task.cancel()
+
+    async def _read_stream_async(
+        self,
+        request_iterator,
+        window: asyncio.Semaphore,
+        done: asyncio.Queue,
+        in_flight: set[asyncio.Task],
+        context,
+    ) -> None:
+        async def score(chunk) -> None:
+            response = self._chunk_failure(
+                chunk.chunk_id, RequestExpiredError(f"Chunk {chunk.chunk_id} cancelled")
+            )
+            try:
+                response = await self._score_chunk_async(chunk, context)
+            finally:
+                done.put_nowait(response)
+
+        submitted = 0
+        try:
+            async for chunk in request_iterator:
+                await window.acquire()
+                task = asyncio.create_task(score(chunk))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+                submitted += 1
+        except Exception as e:
+            logger.debug(f"ScoreStream reader stopped: {e}")
+        finally:
+            done.put_nowait(submitted)
 
+    async def _score_chunk_async(self, chunk, context) -> inference_pb2.ScoreChunkResult:
+        start = time.perf_counter()
+        pairs, t_grpc_deserialize_ms = self._chunk_pairs(chunk)
+        if not pairs:
+            return inference_pb2.ScoreChunkResult(chunk_id=chunk.chunk_id, status_code=200)
+
+        backoff = _STREAM_RETRY_S
+        while True:
+            try:
+                result = await self._inference_handler.schedule_async(
+                    pairs, deadline_ms=_deadline_ms(context), priority=_priority(chunk)
+                )
+            except OverloadedError:
+                stopped = _stream_stopped(context, None)
+                if stopped is not None:
+                    return self._chunk_failure(chunk.chunk_id, stopped)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, _STREAM_MAX_RETRY_S)
+                continue
+            except Exception as e:
+                return self._chunk_failure(chunk.chunk_id, e)
+            return self._chunk_response(
+                chunk.chunk_id, result, len(pairs), start, t_grpc_deserialize_ms
+            )
+
+
+def _add_port(
+    server: grpc.Server | grpc.aio.Server,
+    host: str,
+    port: int,
+    use_ssl: bool,
+    ssl_cert_path: str | None,
+    ssl_key_path: str | None,
+) -> int:
     if use_ssl:
         if not ssl_cert_path or not ssl_key_path:
             raise ValueError("ssl_cert_path and ssl_key_path required when use_ssl=True")
@@ -126,11 +539,30 @@ def serve(
         credentials = grpc.ssl_server_credentials(
             [(private_key, certificate_chain)], require_client_auth=False
         )
-        server.add_secure_port(f"{host}:{port}", credentials)
-        logger.info(f"gRPC server listening on {host}:{port} (SSL/TLS enabled)")
+        bound_port = server.add_secure_port(f"{host}:{port}", credentials)
+        logger.info(f"gRPC server listening on {host}:{bound_port} (SSL/TLS enabled)")
     else:
-        server.add_insecure_port(f"{host}:{port}")
-        logger.info(f"gRPC server listening on {host}:{port} (development mode, no SSL/TLS)")
+        bound_port = server.add_insecure_port(f"{host}:{port}")
+        logger.info(f"gRPC server listening on {host}:{bound_port} (development mode, no SSL/TLS)")
+    return bound_port
+
+
+def serve(
+    inference_handler: "InferenceInterface",
+    host: str = "127.0.0.1",
+    port: int = 50051,
+    max_workers: int = 10,
+    metrics: Optional["MetricsService"] = None,
+    use_ssl: bool = False,
+    ssl_cert_path: str | None = None,
+    ssl_key_path: str | None = None,
+    stream_window: int = 8,
+) -> grpc.Server:
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
+    inference_pb2_grpc.add_InferenceServiceServicer_to_server(
+        InferenceServicer(inference_handler, metrics, stream_window), server
+    )
+    _add_port(server, host, port, use_ssl, ssl_cert_path, ssl_key_path)
 
     server.start()
     logger.info("gRPC server started")
@@ -138,4 +570,29 @@ def serve(
     return server
 
 
-__all__ = ["serve", "InferenceServicer"]
+async def serve_aio(
+    inference_handler: "InferenceInterface",
+    host: str = "127.0.0.1",
+    port: int = 50051,
+    metrics: Optional["MetricsService"] = None,
+    use_ssl: bool = False,
+    ssl_cert_path: str | None = None,
+    ssl_key_path: str | None = None,
+    stream_window: int = 8,
+) -> grpc.aio.Server:
+    server = grpc.aio.server()
+    inference_pb2_grpc.add_InferenceServiceServicer_to_server(
+        AioInferenceServicer(inference_handler, metrics, stream_window), server
+    )
+    _add_port(server, host, port, use_ssl, ssl_cert_path, ssl_key_path)
+
+    await server.start()
+    logger.info("gRPC aio server started")
+    try:
+        await server.wait_for_termination()
+    finally:
+        await server.stop(grace=None)
+    return server
+
+
+__all__ = ["serve", "serve_aio", "InferenceServicer", "AioInferenceServicer"]
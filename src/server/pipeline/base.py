@@ -9,7 +9,7 @@ from itertools import count
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from src.server.dto import Config, InferenceResult
+    from src.server.dto import Config, InferenceResult, TokenIdBatch
     from src.server.dto.pipeline import PipelineRequest
     from src.server.pool import ModelPool, TokenizerPool
     from src.server.services import MetricsService
@@ -87,7 +87,43 @@ class BasePipeline(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def schedule(self, pairs: list[tuple[str, str]]) -> "InferenceResult":
+    def schedule(
+        self,
+        pairs: list[tuple[str, str]],
+        deadline_ms: float | None = None,
+        cancel_event: threading.Event | None = None,
+        priority: str | None = None,
+    ) -> "InferenceResult":
+        raise NotImplementedError
+
+    @abstractmethod
+    async def schedule_async(
+        self,
+        pairs: list[tuple[str, str]],
+        deadline_ms: float | None = None,
+        cancel_event: threading.Event | None = None,
+        priority: str | None = None,
+    ) -> "InferenceResult":
+        raise NotImplementedError
+
+    @abstractmethod
+    def schedule_tokens(
+        self,
+        tokens: "TokenIdBatch",
+        deadline_ms: float | None = None,
+        cancel_event: threading.Event | None = None,
+        priority: str | None = None,
+    ) -> "InferenceResult":
+        raise NotImplementedError
+
+    @abstractmethod
+    async def schedule_tokens_async(
+        self,
+        tokens: "TokenIdBatch",
+        deadline_ms: float | None = None,
+        cancel_event: threading.Event | None = None,
+        priority: str | None = None,
+    ) -> "InferenceResult":
         raise NotImplementedError
 
     @property
@@ -1,22 +1,73 @@
+import asyncio
 import logging
 import queue
 import threading
 import time
+from collections.abc import Callable
 from typing import TYPE_CHECKING
 
-import torch
+import numpy as np
 
-from src.server.dto import Config, InferenceResult, PendingRequest
+from src.server.dto import Config, InferenceResult, PendingRequest, TokenIdBatch
 from src.server.dto.inference import TokenizedBatch
 from src.server.dto.pipeline import InferenceQueueItem, PipelineRequest, TokenizationQueueItem
 from src.server.pipeline.base import BasePipeline
 from src.server.services.metrics_service import MetricsService
+from src.server.utils.admission import AdmissionController, OverloadedError, RequestExpiredError
+from src.server.utils.batching import AdaptiveBatchTimeout, LengthBuckets, TokenBudget
+from src.server.utils.pretokenized import TokenIdSpec, build_tokenized_batch, load_token_id_spec
+from src.server.utils.priority import PRIORITY_CLASSES, PriorityClassQueue, priority_index
 
 if TYPE_CHECKING:
     from src.server.pool import ModelPool, TokenizerPool
 
 logger = logging.getLogger(__name__)
 
+_BATCH_TIMEOUT_S = 30.0
+_SHED_ERRORS = (OverloadedError, RequestExpiredError)
+
+
+def _resolve_future(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+def _completion_future() -> tuple[asyncio.Future, Callable[[], None]]:
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def resolve() -> None:
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(_resolve_future, future)
+
+    return future, resolve
+
+
+def _absolute_deadline(deadline_ms: float | None) -> float | None:
+    return None if deadline_ms is None else time.perf_counter() + deadline_ms / 1000
+
+
+def _attach(
+    request: PipelineRequest | PendingRequest,
+    done_callback: Callable[[], None] | None,
+    deadline: float | None,
+    cancel_event: threading.Event | None,
+    priority: int = 0,
+) -> None:
+    request.deadline = deadline
+    request.cancel_event = cancel_event
+    request.priority = priority
+    if done_callback is not None:
+        request.done_callbacks.append(done_callback)
+
+
+async def _wait_future(future: asyncio.Future, timeout: float) -> bool:
+    try:
+        await asyncio.wait_for(future, timeout=timeout)
+    except TimeoutError:
+        return False
+    return True
+
 
 class QueueBasedPipeline(BasePipeline):
     def __init__(
@@ -29,22 +80,54 @@ class QueueBasedPipeline(BasePipeline):
     ):
         super().__init__(config, tokenizer_pool, model_pool, metrics_service, experiment_name)
 
-        self._inference_queue: queue.Queue | None = None
+        self._inference_queue: queue.Queue | PriorityClassQueue | None = None
 
         self._batching_enabled = False
         self._max_batch_size = 8
         self._timeout_ms = 100
         self._length_aware = False
-        self._batch_queue: queue.Queue[PendingRequest] = queue.Queue()
+        self._max_tokens_per_batch = 0
+        self._length_buckets: LengthBuckets | None = None
+        self._adaptive_timeout: AdaptiveBatchTimeout | None = None
+        self._batch_queue: queue.Queue[PendingRequest] | PriorityClassQueue[PendingRequest] = (
+            queue.Queue()
+        )
         self._batch_condition = threading.Condition()
         self._batch_thread: threading.Thread | None = None
         self._batching_running = False
         self._batch_shutdown_event = threading.Event()
+        self._admission: AdmissionController | None = None
+        self._token_id_spec: TokenIdSpec | None = None
+        self._token_id_spec_lock = threading.Lock()
 
     def setup(self) -> None:
         logger.info(f"Setting up queue-based pipeline for experiment: {self.experiment_name}")
 
-        self._inference_queue = queue.Queue()
+        admission = self.config.admission
+        priority = self.config.priority
+        if priority.enabled:
+            self._inference_queue = PriorityClassQueue(
+                lambda item: item.request.priority,
+                priority.aging_ms,
+                maxsize=admission.inference_queue_size,
+            )
+            self._batch_queue = PriorityClassQueue(
+                lambda req: req.priority, priority.aging_ms, maxsize=admission.batch_queue_size
+            )
+            logger.info(
+                f"Priority classes enabled: default={priority.default_class}, "
+                f"aging_ms={priority.aging_ms}"
+            )
+        else:
+            self._inference_queue = queue.Queue(maxsize=admission.inference_queue_size)
+            self._batch_queue = queue.Queue(maxsize=admission.batch_queue_size)
+        if admission.enabled:
+            self._admission = AdmissionController(
+                admission.max_queue_delay_ms, parallelism=len(self.config.model_pool.instances)
+            )
+            logger.info(
+                f"Admission control enabled: max_queue_delay_ms={admission.max_queue_delay_ms}"
+            )
 
         if not self.tokenizer_pool or not self.model_pool or not self.metrics:
             raise RuntimeError(
@@ -56,6 +139,29 @@ class QueueBasedPipeline(BasePipeline):
             self._max_batch_size = self.config.batching.max_batch_size
             self._timeout_ms = self.config.batching.timeout_ms
             self._length_aware = self.config.batching.length_aware
+            self._max_tokens_per_batch = self.config.batching.max_tokens_per_batch
+
+            boundaries = self.config.batching.bucket_boundaries
+            if boundaries:
+                self._length_buckets = LengthBuckets(
+                    boundaries,
+                    self.config.batching.bucket_timeouts_ms or [self._timeout_ms] * len(boundaries),
+                    self.tokenizer_pool.max_length,
+                )
+
+            if self.config.batching.adaptive_timeout:
+                if self._length_buckets is not None:
+                    logger.warning("Adaptive batch timeout is ignored with length buckets")
+                else:
+                    self._adaptive_timeout = AdaptiveBatchTimeout(
+                        self._timeout_ms,
+                        self.config.batching.target_p99_ms,
+                        self.config.batching.min_timeout_ms,
+                        self.config.batching.max_timeout_ms,
+                        self._max_batch_size,
+                    )
+                    self._timeout_ms = self._adaptive_timeout.timeout_ms
+            self.metrics.set_batch_timeout(self._timeout_ms)
 
             self._batching_running = True
             self._batch_shutdown_event.clear()
@@ -64,7 +170,10 @@ class QueueBasedPipeline(BasePipeline):
             logger.info(
                 f"Batching enabled: max_batch_size={self._max_batch_size}, "
                 f"timeout_ms={self._timeout_ms}, "
-                f"length_aware={self._length_aware}"
+                f"length_aware={self._length_aware}, "
+                f"max_tokens_per_batch={self._max_tokens_per_batch}, "
+                f"bucket_boundaries={self.config.batching.bucket_boundaries}, "
+                f"adaptive_timeout={self._adaptive_timeout is not None}"
             )
         else:
             logger.info("Batching disabled - using direct pipeline processing")
@@ -101,6 +210,7 @@ class QueueBasedPipeline(BasePipeline):
             logger.info("Inference pool disabled in tokenization_only mode")
 
         if mode == "full":
+            self.model_pool.set_tensor_slab(self.tokenizer_pool.tensor_slab)
             self.tokenizer_pool.set_inference_queue(self._inference_queue)
             self.model_pool.set_inference_queue(self._inference_queue)
             logger.info("Pipeline setup complete - tokenization → inference queue connected")
@@ -134,38 +244,255 @@ class QueueBasedPipeline(BasePipeline):
         if self.tokenizer_pool:
             self.tokenizer_pool.stop()
 
-    def schedule(self, pairs: list[tuple[str, str]]) -> InferenceResult:
-        if self._batching_enabled:
-            queue_size = self._batch_queue.qsize()
+    def _batch_backlog(self) -> int:
+        queue_size = self._batch_queue.qsize()
+        if self._length_buckets is not None:
+            queue_size += len(self._length_buckets)
+        return queue_size
 
-            if queue_size == 0:
-                return self._schedule_direct(pairs)
+    def _submit_batched(
+        self,
+        pairs: list[tuple[str, str]],
+        done_callback: Callable[[], None] | None = None,
+        deadline: float | None = None,
+        cancel_event: threading.Event | None = None,
+        priority: int = 0,
+    ) -> PendingRequest:
+        req = PendingRequest(
+            pairs=pairs,
+            result_future=threading.Event(),
+            submit_time=time.perf_counter(),
+        )
+        _attach(req, done_callback, deadline, cancel_event, priority)
 
-            req = PendingRequest(
-                pairs=pairs,
-                result_future=threading.Event(),
-                submit_time=time.perf_counter(),
+        try:
+            self._batch_queue.put_nowait(req)
+        except queue.Full:
+            raise OverloadedError("Batch queue full") from None
+
+        with self._batch_condition:
+            self._batch_condition.notify()
+        return req
+
+    def _collect_batched(self, req: PendingRequest, completed: bool) -> InferenceResult:
+        if not completed:
+            raise RuntimeError(f"Scheduler request timed out after {_BATCH_TIMEOUT_S:.0f}s")
+
+        if req.error:
+            raise req.error
+
+        if req.result is None:
+            raise RuntimeError("Scheduler returned None result (unexpected error)")
+
+        return req.result
+
+    def schedule(
+        self,
+        pairs: list[tuple[str, str]],
+        deadline_ms: float | None = None,
+        cancel_event: threading.Event | None = None,
+        priority: str | None = None,
+    ) -> InferenceResult:
+        start = time.perf_counter()
+        priority_class = priority_index(priority, self.config.priority.default_class)
+        self._admit(len(pairs), deadline_ms)
+        self._record_arrival()
+        deadline = _absolute_deadline(deadline_ms)
+        result = None
+        try:
+            if self._batching_enabled and self._batch_backlog() > 0:
+                req = self._submit_batched(pairs, None, deadline, cancel_event, priority_class)
+                result = self._collect_batched(
+                    req, req.result_future.wait(timeout=_BATCH_TIMEOUT_S)
+                )
+            else:
+                request = self._submit_direct(pairs, None, deadline, cancel_event, priority_class)
+                completed = request.result_event.wait(timeout=self._direct_timeout())
+                result = self._collect_direct(request, completed)
+            self._record_class_latency(priority_class, start)
+            return result
+        except OverloadedError as e:
+            self._record_rejection(e)
+            raise
+        finally:
+            self._release(len(pairs), result)
+
+    async def schedule_async(
+        self,
+        pairs: list[tuple[str, str]],
+        deadline_ms: float | None = None,
+        cancel_event: threading.Event | None = None,
+        priority: str | None = None,
+    ) -> InferenceResult:
+        start = time.perf_counter()
+        priority_class = priority_index(priority, self.config.priority.default_class)
+        self._admit(len(pairs), deadline_ms)
+        self._record_arrival()
+        deadline = _absolute_deadline(deadline_ms)
+        cancel_event = cancel_event or threading.Event()
+        result = None
+        try:
+            future, resolve = _completion_future()
+            if self._batching_enabled and self._batch_backlog() > 0:
+                req = self._submit_batched(pairs, resolve, deadline, cancel_event, priority_class)
+                completed = await _wait_future(future, _BATCH_TIMEOUT_S)
+                result = self._collect_batched(req, completed)
+            else:
+                request = self._submit_direct(
+                    pairs, resolve, deadline, cancel_event, priority_class
+                )
+                completed = await _wait_future(future, self._direct_timeout())
+                result = self._collect_direct(request, completed)
+            self._record_class_latency(priority_class, start)
+            return result
+        except asyncio.CancelledError:
+            cancel_event.set()
+            raise
+        except OverloadedError as e:
+            self._record_rejection(e)
+            raise
+        finally:
+            self._release(len(pairs), result)
+
+    def schedule_tokens(
+        self,
+        tokens: TokenIdBatch,
+        deadline_ms: float | None = None,
+        cancel_event: threading.Event | None = None,
+        priority: str | None = None,
+    ) -> InferenceResult:
+        start = time.perf_counter()
+        priority_class = priority_index(priority, self.config.priority.default_class)
+        tokenized_batch = self._build_token_batch(tokens)
+        self._admit(len(tokens), deadline_ms)
+        self._record_arrival()
+        result = None
+        try:
+            request = self._submit_tokens(
+                tokenized_batch, None, _absolute_deadline(deadline_ms), cancel_event, priority_class
             )
+            completed = request.result_event.wait(timeout=self._direct_timeout())
+            result = self._collect_direct(request, completed)
+            self._record_class_latency(priority_class, start)
+            return result
+        except OverloadedError as e:
+            self._record_rejection(e)
+            raise
+        finally:
+            self._release(len(tokens), result)
 
-            self._batch_queue.put(req)
+    async def schedule_tokens_async(
+        self,
+        tokens: TokenIdBatch,
+        deadline_ms: float | None = None,
+        cancel_event: threading.Event | None = None,
+        priority: str | None = None,
+    ) -> InferenceResult:
+        start = time.perf_counter()
+        priority_class = priority_index(priority, self.config.priority.default_class)
+        tokenized_batch = self._build_token_batch(tokens)
+        self._admit(len(tokens), deadline_ms)
+        self._record_arrival()
+        cancel_event = cancel_event or threading.Event()
+        result = None
+        try:
+            future, resolve = _completion_future()
+            request = self._submit_tokens(
+                tokenized_batch,
+                resolve,
+                _absolute_deadline(deadline_ms),
+                cancel_event,
+                priority_class,
+            )
+            completed = await _wait_future(future, self._direct_timeout())
+            result = self._collect_direct(request, completed)
+            self._record_class_latency(priority_class, start)
+            return result
+        except asyncio.CancelledError:
+            cancel_event.set()
+            raise
+        except OverloadedError as e:
+            self._record_rejection(e)
+            raise
+        finally:
+            self._release(len(tokens), result)
+
+    def _build_token_batch(self, tokens: TokenIdBatch) -> TokenizedBatch:
+        with self._token_id_spec_lock:
+            if self._token_id_spec is None:
+                self._token_id_spec = load_token_id_spec(
+                    self.tokenizer_pool.model_name, self.tokenizer_pool.max_length
+                )
+        return build_tokenized_batch(tokens, self._token_id_spec)
+
+    def _submit_tokens(
+        self,
+        tokenized_batch: TokenizedBatch,
+        done_callback: Callable[[], None] | None,
+        deadline: float | None,
+        cancel_event: threading.Event | None,
+        priority: int,
+    ) -> PipelineRequest:
+        if not self._inference_started or self.config.pipeline.mode == "tokenization_only":
+            raise RuntimeError("Inference service not started")
+
+        request = self._create_request([])
+        _attach(request, done_callback, deadline, cancel_event, priority)
+        request.tokenized_batch = tokenized_batch
+        try:
+            self._inference_queue.put_nowait(
+                InferenceQueueItem(request=request, tokenized_batch=tokenized_batch)
+            )
+        except queue.Full:
+            self._cleanup_request(request.request_id)
+            raise OverloadedError("Inference queue full") from None
+        if self.metrics:
+            self.metrics.record_model_queue_in(1)
+        return request
 
-            with self._batch_condition:
-                self._batch_condition.notify()
+    def _record_class_latency(self, priority_class: int, start: float) -> None:
+        if self.config.priority.enabled and self.metrics:
+            self.metrics.record_priority_latency(
+                PRIORITY_CLASSES[priority_class], (time.perf_counter() - start) * 1000
+            )
 
-            if not req.result_future.wait(timeout=30.0):
-                raise RuntimeError("Scheduler request timed out after 30s")
+    def _record_arrival(self) -> None:
+        if self._adaptive_timeout is not None:
+            self._adaptive_timeout.record_arrival(time.perf_counter())
 
-            if hasattr(req, "error") and req.error:
-                raise req.error
+    def _admit(self, num_pairs: int, deadline_ms: float | None) -> None:
+        if self._admission is None:
+            return
+        try:
+            self._admission.admit(num_pairs, deadline_ms)
+        except OverloadedError as e:
+            self._record_rejection(e)
+            raise
 
-            if req.result is None:
-                raise RuntimeError("Scheduler returned None result (unexpected error)")
+    def _release(self, num_pairs: int, result: InferenceResult | None) -> None:
+        if self._admission is None:
+            return
+        if result is None:
+            self._admission.release(num_pairs)
+        else:
+            self._admission.release(num_pairs, result.t_model_inference_ms, result.batch_size)
 
-            return req.result
+    def _record_rejection(self, error: OverloadedError) -> None:
+        logger.debug(f"Request rejected ({error.reason}): {error}")
+        if self.metrics:
+            self.metrics.record_admission_rejection(error.reason)
 
-        return self._schedule_direct(pairs)
+    def _direct_timeout(self) -> float:
+        return 30.0 if self.config.pipeline.mode == "tokenization_only" else 300.0
 
-    def _schedule_direct(self, pairs: list[tuple[str, str]]) -> InferenceResult:
+    def _submit_direct(
+        self,
+        pairs: list[tuple[str, str]],
+        done_callback: Callable[[], None] | None = None,
+        deadline: float | None = None,
+        cancel_event: threading.Event | None = None,
+        priority: int = 0,
+    ) -> PipelineRequest:
         mode = self.config.pipeline.mode
         if mode == "full" and (not self._tokenization_started or not self._inference_started):
             raise RuntimeError("Pipeline services not started")
@@ -176,6 +503,7 @@ class QueueBasedPipeline(BasePipeline):
 
         request = self._create_request(pairs)
         req_id = request.request_id
+        _attach(request, done_callback, deadline, cancel_event, priority)
 
         try:
             tokenization_item = TokenizationQueueItem(
@@ -183,9 +511,7 @@ class QueueBasedPipeline(BasePipeline):
                 pairs=pairs,
             )
 
-            if mode == "tokenization_only":
-                self.tokenizer_pool.submit_pipeline(tokenization_item)
-            elif mode == "inference_only":
+            if mode == "inference_only":
                 max_len = 512
                 if self.tokenizer_pool:
                     max_len = self.tokenizer_pool.max_length
@@ -198,8 +524,8 @@ class QueueBasedPipeline(BasePipeline):
 
                 batch_size = len(pairs)
 
-                input_ids = torch.randint(0, 1000, (batch_size, estimated_len), dtype=torch.long)
-                attention_mask = torch.ones((batch_size, estimated_len), dtype=torch.long)
+                input_ids = np.random.randint(0, 1000, (batch_size, estimated_len), dtype=np.int16)
+                attention_mask = np.ones((batch_size, estimated_len), dtype=np.int8)
 
                 tokenized_batch = TokenizedBatch(
                     features={"input_ids": input_ids, "attention_mask": attention_mask},
@@ -218,18 +544,33 @@ class QueueBasedPipeline(BasePipeline):
                     tokenized_batch=tokenized_batch,
                 )
 
-                self._inference_queue.put(inference_item)
+                try:
+                    self._inference_queue.put_nowait(inference_item)
+                except queue.Full:
+                    raise OverloadedError("Inference queue full") from None
             else:
                 self.tokenizer_pool.submit_pipeline(tokenization_item)
 
-            if mode == "tokenization_only":
-                timeout_sec = 30.0
-                if not request.result_event.wait(timeout=timeout_sec):
-                    raise RuntimeError(f"Pipeline request {req_id} timed out after {timeout_sec}s")
+        except Exception as e:
+            if not isinstance(e, _SHED_ERRORS):
+                logger.error(f"Pipeline request {req_id} failed: {e}")
+            self._cleanup_request(req_id)
+            raise
+
+        return request
+
+    def _collect_direct(self, request: PipelineRequest, completed: bool) -> InferenceResult:
+        req_id = request.request_id
+        try:
+            if not completed:
+                raise RuntimeError(
+                    f"Pipeline request {req_id} timed out after {self._direct_timeout()}s"
+                )
 
-                if request.error:
-                    raise request.error
+            if request.error:
+                raise request.error
 
+            if self.config.pipeline.mode == "tokenization_only":
                 if request.tokenized_batch is None:
                     raise RuntimeError(
                         f"Pipeline request {req_id} completed with no tokenized result"
@@ -253,13 +594,6 @@ class QueueBasedPipeline(BasePipeline):
                     status_code=204,
                 )
                 request.inference_result = result
-            else:
-                timeout_sec = 300.0
-                if not request.result_event.wait(timeout=timeout_sec):
-                    raise RuntimeError(f"Pipeline request {req_id} timed out after {timeout_sec}s")
-
-                if request.error:
-                    raise request.error
 
             if request.inference_result is None:
                 raise RuntimeError(f"Pipeline request {req_id} completed with no result")
@@ -275,6 +609,9 @@ class QueueBasedPipeline(BasePipeline):
 
             return result
 
+        except _SHED_ERRORS:
+            raise
+
         except Exception as e:
             logger.error(f"Pipeline request {req_id} failed: {e}")
             raise
@@ -283,14 +620,29 @@ class QueueBasedPipeline(BasePipeline):
             self._cleanup_request(req_id)
 
     def _batch_loop(self) -> None:
+        max_length = self.tokenizer_pool.max_length if self.tokenizer_pool else 512
+        budget = TokenBudget(self._max_tokens_per_batch, max_length)
+        if self._length_buckets is not None:
+            self._bucket_loop(self._length_buckets, budget)
+            return
+
+        carry_over: PendingRequest | None = None
+
         while not self._batch_shutdown_event.is_set():
             batch: list[PendingRequest] = []
+            budget.reset()
+
+            if carry_over is not None:
+                batch.append(carry_over)
+                budget.add(carry_over.pairs)
+                carry_over = None
 
             try:
-                while not self._batch_shutdown_event.is_set():
+                while not batch and not self._batch_shutdown_event.is_set():
                     try:
                         first_item = self._batch_queue.get(timeout=0.01)
                         batch.append(first_item)
+                        budget.add(first_item.pairs)
                         break
                     except queue.Empty:
                         continue
@@ -304,26 +656,80 @@ class QueueBasedPipeline(BasePipeline):
 
             deadline = time.perf_counter() + (self._timeout_ms / 1000.0)
 
-            while len(batch) < self._max_batch_size and not self._batch_shutdown_event.is_set():
+            while (
+                len(batch) < self._max_batch_size
+                and not budget.exhausted
+                and not self._batch_shutdown_event.is_set()
+            ):
                 remaining = deadline - time.perf_counter()
                 if remaining <= 0:
                     break
 
                 try:
                     item = self._batch_queue.get(timeout=remaining)
-                    batch.append(item)
                 except queue.Empty:
                     break
 
+                if not budget.fits(item.pairs):
+                    carry_over = item
+                    break
+                batch.append(item)
+                budget.add(item.pairs)
+
             if batch:
                 logger.debug(
                     f"Processing batch of {len(batch)} requests "
-                    f"(total pairs: {sum(len(req.pairs) for req in batch)})"
+                    f"(total pairs: {budget.num_pairs}, "
+                    f"estimated padded tokens: {budget.padded_tokens})"
+                )
+                self._process_batch(batch)
+
+    def _bucket_loop(self, buckets: LengthBuckets, budget: TokenBudget) -> None:
+        while not self._batch_shutdown_event.is_set():
+            next_due = buckets.next_due()
+            wait = 0.01 if next_due is None else min(next_due - time.perf_counter(), 0.01)
+
+            try:
+                if wait > 0:
+                    buckets.put(self._batch_queue.get(timeout=wait), time.perf_counter())
+                while True:
+                    buckets.put(self._batch_queue.get_nowait(), time.perf_counter())
+            except queue.Empty:
+                pass
+
+            batch = buckets.pop_ready(time.perf_counter(), self._max_batch_size, budget)
+            while batch and not self._batch_shutdown_event.is_set():
+                logger.debug(
+                    f"Processing bucketed batch of {len(batch)} requests "
+                    f"(max estimated seq: {budget.max_seq})"
                 )
                 self._process_batch(batch)
+                batch = buckets.pop_ready(time.perf_counter(), self._max_batch_size, budget)
+
+        for req in buckets.drain():
+            req.error = RuntimeError("Batch scheduler stopped")
+            req.complete()
+
+    def _drop_expired(self, batch: list[PendingRequest], now: float) -> list[PendingRequest]:
+        live = []
+        for req in batch:
+            if req.is_expired(now):
+                req.error = RequestExpiredError("Request expired while waiting for a batch")
+                req.complete()
+            else:
+                live.append(req)
+        if len(live) < len(batch) and self.metrics:
+            self.metrics.record_expired_request("batch", len(batch) - len(live))
+        return live
 
     def _process_batch(self, batch: list[PendingRequest]) -> None:
         batch_start_time = time.perf_counter()
+        batch = self._drop_expired(batch, batch_start_time)
+        if not batch:
+            return
+
+        deadlines = [req.deadline for req in batch]
+        batch_deadline = None if None in deadlines else max(deadlines)
 
         all_pairs = []
         pair_counts = []
@@ -341,6 +747,8 @@ class QueueBasedPipeline(BasePipeline):
                 request_id=req_id,
                 pairs=all_pairs,
                 submit_time=batch_start_time,
+                deadline=batch_deadline,
+                priority=min(req.priority for req in batch),
             )
 
             tokenization_item = TokenizationQueueItem(
@@ -386,23 +794,52 @@ class QueueBasedPipeline(BasePipeline):
                     t_model_queue_wait_ms=getattr(result, "t_model_queue_wait_ms", 0.0),
                 )
                 idx += n
-                req.result_future.set()
+                req.complete()
+            self._adapt_timeout(batch, result.t_model_inference_ms)
 
         except Exception as e:
-            logger.error(f"Batch processing error: {e}", exc_info=True)
+            if isinstance(e, _SHED_ERRORS):
+                logger.warning(f"Batch of {len(batch)} requests shed: {e}")
+            else:
+                logger.error(f"Batch processing error: {e}", exc_info=True)
             for req in batch:
                 req.error = e
-                req.result_future.set()
+                req.complete()
+
+    def _adapt_timeout(self, batch: list[PendingRequest], step_ms: float) -> None:
+        if self._adaptive_timeout is None:
+            return
+        now = time.perf_counter()
+        latencies_ms = [(now - req.submit_time) * 1000 for req in batch]
+        timeout_ms = self._adaptive_timeout.record_batch(step_ms, latencies_ms, now)
+        if timeout_ms != self._timeout_ms:
+            logger.debug(f"Batch timeout {self._timeout_ms:.1f} -> {timeout_ms:.1f} ms")
+            self._timeout_ms = timeout_ms
+            if self.metrics:
+                self.metrics.set_batch_timeout(timeout_ms)
 
     def get_batching_info(self) -> dict:
+        buckets = self._length_buckets
         return {
             "batching_enabled": self._batching_enabled,
             "max_batch_size": self._max_batch_size,
             "timeout_ms": self._timeout_ms,
+            "adaptive_timeout": self._adaptive_timeout is not None,
             "length_aware": self._length_aware,
+            "max_tokens_per_batch": self._max_tokens_per_batch,
+            "bucket_boundaries": buckets.boundaries if buckets is not None else [],
+            "bucket_pending": buckets.pending() if buckets is not None else [],
             "pending": self._batch_queue.qsize(),
+            "priority_pending": self._priority_pending(),
         }
 
+    def _priority_pending(self) -> dict[str, dict[str, int]]:
+        pending = {}
+        for stage, stage_queue in (("batch", self._batch_queue), ("model", self._inference_queue)):
+            if isinstance(stage_queue, PriorityClassQueue):
+                pending[stage] = stage_queue.depths()
+        return pending
+
     def set_inference_queue(self, inference_queue: queue.Queue) -> None:
         self._inference_queue = inference_queue
         if self.tokenizer_pool:
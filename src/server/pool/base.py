@@ -1,6 +1,7 @@
 import logging
 import queue
 import threading
+import time
 from abc import ABC, abstractmethod
 from typing import Generic, TypeVar
 
@@ -17,6 +18,15 @@ class BaseWorkerPool(ABC, Generic[T, R]):
         self._inference_queue: queue.Queue | None = None
         self._shutdown_event = threading.Event()
         self._workers: list = []
+        self._processes: list = []
+        self._input_queues: list = []
+        self._supervisor_thread: threading.Thread | None = None
+        self._restart_counts: dict[int, int] = {}
+        self._use_multiprocessing = num_workers > 1
+        self._configured_workers = num_workers
+        self._retired: set[int] = set()
+        self._reaped: set[int] = set()
+        self._scale_lock = threading.Lock()
 
     @abstractmethod
     def start(self, timeout_s: float = 120.0) -> None:
@@ -31,6 +41,114 @@ class BaseWorkerPool(ABC, Generic[T, R]):
             raise RuntimeError(f"{self.__class__.__name__} not started")
         raise NotImplementedError("Subclass must implement submit() or override with custom logic")
 
+    def _start_supervisor(self, interval_s: float) -> None:
+        if interval_s <= 0:
+            return
+        self._supervisor_thread = threading.Thread(
+            target=self._supervisor_loop, args=(interval_s,), daemon=True
+        )
+        self._supervisor_thread.start()
+
+    def _stop_supervisor(self, timeout_s: float) -> None:
+        if self._supervisor_thread:
+            self._supervisor_thread.join(timeout=timeout_s)
+            self._supervisor_thread = None
+
+    def _supervisor_loop(self, interval_s: float) -> None:
+        while not self._shutdown_event.wait(interval_s):
+            for worker_id, process in enumerate(list(self._processes)):
+                if process.is_alive() or self._shutdown_event.is_set():
+                    continue
+                if worker_id in self._retired:
+                    self._reap_retired(worker_id)
+                    continue
+                logger.error(
+                    f"{type(self).__name__} worker {worker_id} died "
+                    f"(exit code {process.exitcode}), restarting"
+                )
+                self._restart_counts[worker_id] = self._restart_counts.get(worker_id, 0) + 1
+                try:
+                    self._restart_worker(worker_id)
+                except Exception as e:
+                    logger.error(f"Failed to restart worker {worker_id}: {e}", exc_info=True)
+
+    def _restart_worker(self, worker_id: int) -> None:
+        raise NotImplementedError
+
+    @property
+    def supports_scaling(self) -> bool:
+        return self._use_multiprocessing
+
+    def scale_up(self) -> bool:
+        with self._scale_lock:
+            if not self._is_started or not self.supports_scaling:
+                return False
+            for worker_id in sorted(self._retired):
+                if not self._processes[worker_id].is_alive():
+                    self._reap_retired(worker_id)
+            reusable = sorted(self._retired & self._reaped)
+            worker_id = reusable[0] if reusable else len(self._processes)
+            self._retired.add(worker_id)
+            if not self._add_worker(worker_id):
+                return False
+            self.num_workers += 1
+            self._retired.discard(worker_id)
+            self._reaped.discard(worker_id)
+            logger.info(f"{type(self).__name__} scaled up to {self.num_workers} workers")
+            return True
+
+    def scale_down(self) -> bool:
+        with self._scale_lock:
+            if not self._is_started or not self.supports_scaling:
+                return False
+            active = self._active_worker_ids()
+            if len(active) <= 1:
+                return False
+            worker_id = active[-1]
+            self._retired.add(worker_id)
+            self._retire_worker(worker_id)
+            self.num_workers -= 1
+            logger.info(
+                f"{type(self).__name__} scaled down to {self.num_workers} workers "
+                f"(draining worker {worker_id})"
+            )
+            return True
+
+    def _active_worker_ids(self) -> list[int]:
+        return [i for i in range(len(self._input_queues)) if i not in self._retired]
+
+    def _active_queues(self) -> list:
+        return [self._input_queues[i] for i in self._active_worker_ids()]
+
+    def _add_worker(self, worker_id: int) -> bool:
+        raise NotImplementedError
+
+    def _retire_worker(self, worker_id: int) -> None:
+        raise NotImplementedError
+
+    def _recover_requests(self, worker_id: int) -> None:
+        raise NotImplementedError
+
+    def _reset_scaling(self) -> bool:
+        scaled = bool(self._retired) or self.num_workers != self._configured_workers
+        self._retired.clear()
+        self._reaped.clear()
+        self.num_workers = self._configured_workers
+        return scaled
+
+    def _reap_retired(self, worker_id: int) -> None:
+        if worker_id in self._reaped:
+            return
+        self._reaped.add(worker_id)
+        self._recover_requests(worker_id)
+
+    def _wait_ready(self, ready_event, timeout_s: float) -> bool:
+        deadline = time.monotonic() + timeout_s
+        while not ready_event.wait(0.5):
+            if self._shutdown_event.is_set() or time.monotonic() >= deadline:
+                return False
+        return True
+
     def set_inference_queue(self, inference_queue: queue.Queue) -> None:
         self._inference_queue = inference_queue
 
@@ -3,27 +3,88 @@ import multiprocessing as mp
 import queue
 import threading
 import time
-from itertools import count
+from collections import deque
 from typing import TYPE_CHECKING
 
+from src.server.backends.device import resolve_device
 from src.server.dto import ModelConfig, PoolConfig
 from src.server.pool.base import BaseWorkerPool
-from src.server.worker.model_worker import ModelWorker
+from src.server.pool.routing import WorkerRouter
+from src.server.utils.admission import OverloadedError, RequestExpiredError, WorkerCrashedError
+from src.server.utils.placement import WorkerPlacement, apply_placement
+from src.server.worker.model_worker import ModelWorker, load_backend
 
 if TYPE_CHECKING:
+    from src.server.backends.base import BaseBackend
     from src.server.services.metrics_service import MetricsService
+    from src.server.utils.shared_memory import SharedTensorSlab
 
 logger = logging.getLogger(__name__)
 
 _STOP = "__STOP__"
 _GET_MEMORY = "__GET_MEMORY__"
 _GET_METRICS = "__GET_METRICS__"
+_WORKER_READY_TIMEOUT_S = 60.0
+# Workers created after start() must not fork the threaded server process.
+_REPLACEMENT_START_METHOD = "spawn"
 
 
 class _InferenceWorkItem:
-    def __init__(self, tokenized_batch, request_id):
+    def __init__(self, tokenized_batch, request_id, deadline: float | None = None):
         self.tokenized_batch = tokenized_batch
         self.req_id = request_id
+        self.deadline = deadline
+
+    def expired_error(self) -> RequestExpiredError | None:
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            return RequestExpiredError(f"Request {self.req_id} expired before inference")
+        return None
+
+
+def _drain_work(first_item, input_queue, merge_max_tokens: int) -> tuple[list, object | None]:
+    items = [first_item]
+    rows = first_item.tokenized_batch.batch_size
+    max_seq = first_item.tokenized_batch.max_seq_length
+    while True:
+        try:
+            item = input_queue.get_nowait()
+        except queue.Empty:
+            return items, None
+        if not hasattr(item, "tokenized_batch"):
+            return items, item
+        seq = max(max_seq, item.tokenized_batch.max_seq_length)
+        if (rows + item.tokenized_batch.batch_size) * seq > merge_max_tokens:
+            return items, item
+        items.append(item)
+        rows += item.tokenized_batch.batch_size
+        max_seq = seq
+
+
+def _run_work_items(worker: ModelWorker, items: list, emit) -> None:
+    from src.server.dto import WorkItem
+
+    live = []
+    for item in items:
+        expired = item.expired_error()
+        if expired:
+            emit((item.req_id, None, expired))
+        else:
+            live.append(item)
+    if not live:
+        return
+
+    try:
+        results = worker.process_many(
+            [WorkItem(req_id=item.req_id, tokenized_batch=item.tokenized_batch) for item in live]
+        )
+    except Exception as e:
+        logger.error(f"Worker {worker.worker_id} inference error: {e}")
+        for item in live:
+            emit((item.req_id, None, e))
+        return
+
+    for item, result in zip(live, results, strict=True):
+        emit((item.req_id, result, None))
 
 
 def _worker_main(
@@ -33,15 +94,23 @@ def _worker_main(
     output_queue,
     ready_event,
     memory_queue,
+    merge_max_tokens: int = 0,
+    backend=None,
+    placement: WorkerPlacement | None = None,
 ):
+    apply_placement(placement, torch_threads=True)
     cfg = ModelConfig(**config_dict)
-    worker = ModelWorker(worker_id, cfg)
+    worker = ModelWorker(worker_id, cfg, backend)
     worker.initialize()
     ready_event.set()
 
+    carried = None
     while True:
         try:
-            item = input_queue.get()
+            if carried is None:
+                item = input_queue.get()
+            else:
+                item, carried = carried, None
             if item == _STOP:
                 break
             if item == _GET_MEMORY:
@@ -55,15 +124,10 @@ def _worker_main(
                 continue
 
             if hasattr(item, "tokenized_batch") and hasattr(item, "req_id"):
-                from src.server.dto import WorkItem
-
-                work_item = WorkItem(req_id=item.req_id, tokenized_batch=item.tokenized_batch)
-                try:
-                    result = worker.process(work_item)
-                    output_queue.put((item.req_id, result, None))
-                except Exception as e:
-                    logger.error(f"Worker {worker_id} inference error: {e}")
-                    output_queue.put((item.req_id, None, e))
+                items = [item]
+                if merge_max_tokens > 0:
+                    items, carried = _drain_work(item, input_queue, merge_max_tokens)
+                _run_work_items(worker, items, output_queue.put)
             else:
                 result = worker.process(item)
                 output_queue.put(result)
@@ -72,10 +136,16 @@ def _worker_main(
 
 
 class ModelPool(BaseWorkerPool):
-    def __init__(self, config: PoolConfig):
+    def __init__(
+        self,
+        config: PoolConfig,
+        worker_queue_size: int = 0,
+        placements: list[WorkerPlacement] | None = None,
+    ):
         super().__init__(len(config.instances))
         self.config = config
-        self._use_multiprocessing = self.num_workers > 1
+        self.worker_queue_size = worker_queue_size
+        self.placements = placements or []
         self._processes: list[mp.Process] = []
         self._input_queues: list[mp.Queue | queue.Queue] = []
         self._output_queue: mp.Queue | queue.Queue | None = None
@@ -86,19 +156,36 @@ class ModelPool(BaseWorkerPool):
         self._local_workers: list[ModelWorker] = []
 
         self._request_counts: dict[int, int] = {}
+        self._direct_pending: dict[str, tuple[int, int]] = {}
 
         self._inference_queue: queue.Queue | None = None
         self._pipeline_consumer_thread: threading.Thread | None = None
-        self._round_robin_counter = count()
+        self._router = WorkerRouter(self.num_workers, config.routing_strategy)
         self._total_inference_batches = 0
         self._total_inference_queries = 0
         self._pipeline_start_time: float | None = None
         self._stats_lock = threading.Lock()
         self._metrics: MetricsService | None = None
+        self._tensor_slab: SharedTensorSlab | None = None
+        self._mp_context = mp.get_context()
+        self._crashed_workers: queue.Queue[int] = queue.Queue()
+        self._retiring_workers: queue.Queue[int] = queue.Queue()
 
     def set_metrics(self, metrics: "MetricsService") -> None:
         self._metrics = metrics
 
+    def set_tensor_slab(self, tensor_slab: "SharedTensorSlab | None") -> None:
+        self._tensor_slab = tensor_slab
+
+    def _record_expired(self) -> None:
+        if self._metrics:
+            self._metrics.record_expired_request("model")
+
+    def _release_shared_tensors(self, request) -> None:
+        tokenized_batch = request.tokenized_batch
+        if self._tensor_slab and tokenized_batch is not None and tokenized_batch.shm_ref:
+            self._tensor_slab.release(tokenized_batch.shm_ref)
+
     def start(self, timeout_s: float = 120.0) -> None:
         if self._is_started:
             return
@@ -106,30 +193,18 @@ class ModelPool(BaseWorkerPool):
         self._shutdown_event.clear()
 
         if self._use_multiprocessing:
-            self._output_queue = mp.Queue()
-            self._memory_queue = mp.Queue()
-            for i, inst in enumerate(self.config.instances):
-                ready = mp.Event()
-                self._ready_events.append(ready)
-                input_queue = mp.Queue()
+            preloaded = self._preload_backends() if self._can_fork_workers() else {}
+            self._mp_context = mp.get_context("fork") if preloaded else mp.get_context()
+            queue_context = mp.get_context(_REPLACEMENT_START_METHOD)
+            self._output_queue = queue_context.Queue()
+            self._memory_queue = queue_context.Queue()
+            for i in range(self.num_workers):
+                process, input_queue, ready = self._spawn_worker(i, preloaded.get(i))
+                self._processes.append(process)
                 self._input_queues.append(input_queue)
+                self._ready_events.append(ready)
 
-                p = mp.Process(
-                    target=_worker_main,
-                    args=(
-                        i,
-                        inst.model_dump(),
-                        input_queue,
-                        self._output_queue,
-                        ready,
-                        self._memory_queue,
-                    ),
-                    daemon=True,
-                )
-                p.start()
-                self._processes.append(p)
-
-            per_worker_timeout = 60.0
+            per_worker_timeout = _WORKER_READY_TIMEOUT_S
             for i, ev in enumerate(self._ready_events):
                 logger.info(
                     f"Waiting for worker {i} to initialize (timeout: {per_worker_timeout}s)..."
@@ -146,7 +221,7 @@ class ModelPool(BaseWorkerPool):
                 worker = ModelWorker(i, inst)
                 worker.initialize()
                 self._local_workers.append(worker)
-                input_queue = queue.Queue()
+                input_queue = queue.Queue(maxsize=self.worker_queue_size)
                 self._input_queues.append(input_queue)
                 thread = threading.Thread(
                     target=self._local_worker_loop,
@@ -158,21 +233,169 @@ class ModelPool(BaseWorkerPool):
 
         self._result_thread = threading.Thread(target=self._result_loop, daemon=True)
         self._result_thread.start()
+        if self._use_multiprocessing:
+            self._start_supervisor(self.config.supervise_interval_s)
 
         self._is_started = True
         mode = "MP" if self._use_multiprocessing else "Local"
         logger.info(f"Pool ready with {self.num_workers} workers ({mode})")
 
+    def _spawn_worker(
+        self,
+        worker_id: int,
+        backend: "BaseBackend | None" = None,
+        ctx: mp.context.BaseContext | None = None,
+    ) -> tuple:
+        ctx = ctx or self._mp_context
+        ready = ctx.Event()
+        input_queue = ctx.Queue(maxsize=self.worker_queue_size)
+        process = ctx.Process(
+            target=_worker_main,
+            args=(
+                worker_id,
+                self.config.instances[worker_id % len(self.config.instances)].model_dump(),
+                input_queue,
+                self._output_queue,
+                ready,
+                self._memory_queue,
+                self.config.merge_max_tokens,
+                backend,
+                self.placements[worker_id] if worker_id < len(self.placements) else None,
+            ),
+            daemon=True,
+        )
+        process.start()
+        return process, input_queue, ready
+
+    def _install_worker(self, worker_id: int) -> tuple:
+        process, input_queue, ready = self._spawn_worker(
+            worker_id, ctx=mp.get_context(_REPLACEMENT_START_METHOD)
+        )
+        if worker_id < len(self._processes):
+            self._input_queues[worker_id].cancel_join_thread()
+            self._processes[worker_id] = process
+            self._input_queues[worker_id] = input_queue
+            self._ready_events[worker_id] = ready
+        else:
+            self._processes.append(process)
+            self._input_queues.append(input_queue)
+            self._ready_events.append(ready)
+            self._router.add_worker(available=False)
+        return process, ready
+
+    def _restart_worker(self, worker_id: int) -> None:
+        self._router.set_available(worker_id, False)
+        process, ready = self._install_worker(worker_id)
+        self._recover_requests(worker_id)
+        if self._metrics:
+            self._metrics.record_worker_restart("model")
+
+        if not self._wait_ready(ready, _WORKER_READY_TIMEOUT_S):
+            logger.error(f"Restarted model worker {worker_id} did not become ready")
+            process.terminate()
+            return
+        self._router.set_available(worker_id, True)
+        logger.info(f"Model worker {worker_id} restarted")
+
+    def _add_worker(self, worker_id: int) -> bool:
+        process, ready = self._install_worker(worker_id)
+        if not self._wait_ready(ready, _WORKER_READY_TIMEOUT_S):
+            logger.error(f"Model worker {worker_id} did not become ready, not scaling up")
+            process.terminate()
+            return False
+        self._router.set_available(worker_id, True)
+        return True
+
+    def _retire_worker(self, worker_id: int) -> None:
+        self._router.set_available(worker_id, False)
+        if self._pipeline_consumer_thread is None:
+            self._input_queues[worker_id].put(_STOP)
+        else:
+            self._retiring_workers.put(worker_id)
+
+    def _recover_requests(self, worker_id: int) -> None:
+        self._crashed_workers.put(worker_id)
+
+    def _requeue_crashed(self, worker_idx: int, pending_results: dict, backlog: deque) -> None:
+        requeued = 0
+        for request_id, (item, idx, tokens) in list(pending_results.items()):
+            if idx != worker_idx:
+                continue
+            del pending_results[request_id]
+            self._router.release(idx, tokens)
+            request = item.request
+            if request.crash_retries >= self.config.max_request_retries:
+                self._release_shared_tensors(request)
+                request.error = WorkerCrashedError(
+                    f"Model worker {worker_idx} crashed while serving request {request_id}"
+                )
+                request.complete()
+                continue
+            request.crash_retries += 1
+            backlog.append(item)
+            requeued += 1
+
+        if requeued:
+            logger.warning(f"Requeued {requeued} requests from crashed model worker {worker_idx}")
+            if self._metrics:
+                self._metrics.record_requeued_requests("model", requeued)
+
+    def _can_fork_workers(self) -> bool:
+        if not self.config.fork_server:
+            return False
+        if "fork" not in mp.get_all_start_methods():
+            logger.warning("Fork server unavailable on this platform, loading per worker")
+            return False
+        devices = {resolve_device(inst.device) for inst in self.config.instances}
+        if devices != {"cpu"}:
+            logger.warning(
+                f"Fork server requires CPU workers (got {sorted(devices)}), loading per worker"
+            )
+            return False
+        return True
+
+    def _preload_backends(self) -> dict[int, "BaseBackend"]:
+        loaded: dict[str, BaseBackend] = {}
+        preloaded = {}
+        for i, inst in enumerate(self.config.instances):
+            key = inst.model_dump_json()
+            if key not in loaded:
+                start = time.perf_counter()
+                backend = load_backend(inst)
+                if not backend.share_memory():
+                    logger.warning(
+                        f"{type(backend).__name__} cannot be shared across forked workers, "
+                        "loading per worker"
+                    )
+                    return {}
+                loaded[key] = backend
+                logger.info(
+                    f"Fork server loaded {inst.name} in {(time.perf_counter() - start):.1f}s"
+                )
+            preloaded[i] = loaded[key]
+        logger.info(f"Forking {len(preloaded)} workers over {len(loaded)} shared model(s)")
+        return preloaded
+
     def submit(self, work_item) -> None:
         if not self._is_started:
             raise RuntimeError("Model pool not started")
 
-        worker_idx = next(self._round_robin_counter) % self.num_workers
+        tokens = work_item.tokenized_batch.total_tokens
+        worker_idx = self._router.acquire(tokens)
+        with self._stats_lock:
+            self._direct_pending[work_item.req_id] = (worker_idx, tokens)
 
         try:
             self._input_queues[worker_idx].put_nowait(work_item)
         except queue.Full:
-            raise RuntimeError("Model pool queue full") from None
+            self._release_direct(work_item.req_id)
+            raise OverloadedError("Model pool queue full") from None
+
+    def _release_direct(self, request_id: str) -> None:
+        with self._stats_lock:
+            pending = self._direct_pending.pop(request_id, None)
+        if pending is not None:
+            self._router.release(*pending)
 
     def set_inference_queue(self, inference_queue: queue.Queue) -> None:
         if not self._is_started:
@@ -194,6 +417,7 @@ class ModelPool(BaseWorkerPool):
             return
 
         self._shutdown_event.set()
+        self._stop_supervisor(timeout_s)
 
         for input_queue in self._input_queues:
             try:
@@ -266,6 +490,9 @@ class ModelPool(BaseWorkerPool):
         self._input_queues.clear()
         self._worker_threads.clear()
         self._local_workers.clear()
+        if self._reset_scaling():
+            self._router = WorkerRouter(self.num_workers, self.config.routing_strategy)
+        self._direct_pending.clear()
         self._output_queue = None
         self._memory_queue = None
         self._is_started = False
@@ -281,7 +508,9 @@ class ModelPool(BaseWorkerPool):
                 if not self._output_queue:
                     continue
                 result = self._output_queue.get(timeout=0.1)
-                if result is not None:
+                if isinstance(result, tuple) and len(result) == 3:
+                    self._release_direct(result[0])
+                elif result is not None:
                     logger.debug("Drained stale result from output queue")
             except (queue.Empty, EOFError):
                 continue
@@ -295,11 +524,23 @@ class ModelPool(BaseWorkerPool):
             return
 
         pending_results = {}
+        backlog: deque = deque()
 
         while not self._shutdown_event.is_set():
             try:
                 processed = False
 
+                while not self._crashed_workers.empty():
+                    self._requeue_crashed(self._crashed_workers.get(), pending_results, backlog)
+
+                while not self._retiring_workers.empty():
+                    retiring = self._retiring_workers.get()
+                    try:
+                        self._input_queues[retiring].put_nowait(_STOP)
+                    except queue.Full:
+                        self._retiring_workers.put(retiring)
+                        break
+
                 if self._output_queue:
                     while True:
                         try:
@@ -308,16 +549,25 @@ class ModelPool(BaseWorkerPool):
                             break
                         if isinstance(worker_result, tuple) and len(worker_result) == 3:
                             request_id, result, error = worker_result
-                            if request_id in pending_results:
-                                request, enqueue_time = pending_results.pop(request_id)
+                            if request_id not in pending_results:
+                                self._release_direct(request_id)
+                            else:
+                                item, worker_idx, tokens = pending_results.pop(request_id)
+                                request = item.request
+                                self._router.release(worker_idx, tokens)
+                                self._release_shared_tensors(request)
                                 if self._metrics:
                                     self._metrics.record_model_queue_out(1)
                                 if error:
+                                    if isinstance(error, RequestExpiredError):
+                                        self._record_expired()
                                     request.error = error
                                 else:
                                     from src.server.dto import InferenceResult
 
                                     if result:
+                                        if self._metrics and result.exit_layers is not None:
+                                            self._metrics.record_early_exits(result.exit_layers)
                                         t_tokenize_ms = 0.0
                                         if request.tokenized_batch:
                                             t_tokenize_ms = request.tokenized_batch.tokenize_time_ms
@@ -353,13 +603,16 @@ class ModelPool(BaseWorkerPool):
                                             worker_id=result.worker_id,
                                             tokenizer_worker_id=request.tokenizer_worker_id,
                                         )
-                                request.result_event.set()
+                                request.complete()
                                 processed = True
 
-                try:
-                    inference_item = self._inference_queue.get_nowait()
-                except queue.Empty:
-                    inference_item = None
+                if backlog:
+                    inference_item = backlog.popleft()
+                else:
+                    try:
+                        inference_item = self._inference_queue.get_nowait()
+                    except queue.Empty:
+                        inference_item = None
 
                 from src.server.dto.pipeline import InferenceQueueItem
 
@@ -374,34 +627,57 @@ class ModelPool(BaseWorkerPool):
                 tokenized_batch = inference_item.tokenized_batch
                 enqueue_time = inference_item.enqueue_time
 
+                if request.is_expired():
+                    self._release_shared_tensors(request)
+                    self._record_expired()
+                    request.error = RequestExpiredError(
+                        f"Request {request.request_id} expired before inference"
+                    )
+                    request.complete()
+                    processed = True
+                    continue
+
                 queue_wait_ms = (time.perf_counter() - enqueue_time) * 1000
                 request.t_queue_inference_wait_ms = queue_wait_ms
 
+                tokens = tokenized_batch.total_tokens
+                worker_idx = self._router.acquire(tokens)
                 try:
-                    worker_idx = next(self._round_robin_counter) % self.num_workers
                     selected_queue = self._input_queues[worker_idx]
-                    work_item = _InferenceWorkItem(tokenized_batch, request.request_id)
+                    work_item = _InferenceWorkItem(
+                        tokenized_batch, request.request_id, request.deadline
+                    )
+                    pending_results[request.request_id] = (inference_item, worker_idx, tokens)
                     selected_queue.put_nowait(work_item)
-                    pending_results[request.request_id] = (request, enqueue_time)
 
                     with self._stats_lock:
                         self._total_inference_batches += 1
                         self._total_inference_queries += tokenized_batch.batch_size
 
                 except queue.Full:
-                    logger.error("Worker queue full, dropping inference request")
-                    request.error = RuntimeError("Inference queue full")
-                    request.result_event.set()
+                    pending_results.pop(request.request_id, None)
+                    self._router.release(worker_idx, tokens)
+                    backlog.appendleft(inference_item)
+                    time.sleep(0.001)
+                    continue
                 except Exception as e:
                     logger.error(f"Pipeline routing error: {e}", exc_info=True)
+                    pending_results.pop(request.request_id, None)
+                    self._router.release(worker_idx, tokens)
+                    self._release_shared_tensors(request)
                     request.error = e
-                    request.result_event.set()
+                    request.complete()
                 processed = True
 
             except Exception as e:
                 logger.error(f"Pipeline consumer loop error: {e}", exc_info=True)
                 continue
 
+        for inference_item in backlog:
+            self._release_shared_tensors(inference_item.request)
+            inference_item.request.error = RuntimeError("Model pool stopped")
+            inference_item.request.complete()
+
     def get_gpu_memory_mb(self) -> float:
         if not self._is_started:
             return 0.0
@@ -410,7 +686,7 @@ class ModelPool(BaseWorkerPool):
                 return max(worker.get_memory_mb() for worker in self._local_workers)
             except Exception:
                 return 0.0
-        for input_queue in self._input_queues:
+        for input_queue in self._active_queues():
             try:
                 input_queue.put(_GET_MEMORY, block=False)
             except Exception as e:
@@ -452,9 +728,13 @@ class ModelPool(BaseWorkerPool):
         return 0.0
 
     def _local_worker_loop(self, worker: ModelWorker, input_queue: queue.Queue) -> None:
+        carried = None
         while not self._shutdown_event.is_set():
             try:
-                item = input_queue.get()
+                if carried is None:
+                    item = input_queue.get()
+                else:
+                    item, carried = carried, None
                 if item == _STOP:
                     break
                 if item == _GET_MEMORY:
@@ -468,17 +748,13 @@ class ModelPool(BaseWorkerPool):
                 if item == _GET_METRICS:
                     continue
                 if hasattr(item, "tokenized_batch") and hasattr(item, "req_id"):
-                    from src.server.dto import WorkItem
-
-                    work_item = WorkItem(req_id=item.req_id, tokenized_batch=item.tokenized_batch)
-                    try:
-                        result = worker.process(work_item)
-                        if self._output_queue:
-                            self._output_queue.put((item.req_id, result, None))
-                    except Exception as e:
-                        logger.error(f"Worker {worker.worker_id} inference error: {e}")
-                        if self._output_queue:
-                            self._output_queue.put((item.req_id, None, e))
+                    items = [item]
+                    if self.config.merge_max_tokens > 0:
+                        items, carried = _drain_work(
+                            item, input_queue, self.config.merge_max_tokens
+                        )
+                    if self._output_queue:
+                        _run_work_items(worker, items, self._output_queue.put)
                 else:
                     result = worker.process(item)
                     if self._output_queue:
@@ -494,7 +770,7 @@ class ModelPool(BaseWorkerPool):
                 if self._inference_queue:
                     queue_size = self._inference_queue.qsize()
 
-                for q in self._input_queues:
+                for q in self._active_queues():
                     worker_queue_size += q.qsize()
             except Exception as e:
                 logger.debug(f"Error getting model queue size: {e}")
@@ -506,6 +782,10 @@ class ModelPool(BaseWorkerPool):
             "queue_size": queue_size + worker_queue_size,
             "inference_queue_size": queue_size,
             "worker_queue_size": worker_queue_size,
+            "routing_strategy": self._router.strategy,
+            "worker_load": self._router.get_load(),
+            "placement": [p.to_dict() for p in self.placements],
+            "worker_restarts": dict(self._restart_counts),
         }
 
     def get_worker_metrics(self) -> list[dict]:
@@ -0,0 +1,96 @@
+import logging
+import random
+import threading
+from itertools import count
+
+logger = logging.getLogger(__name__)
+
+_STRATEGY_ALIASES = {
+    "smart_idle": "least_requests",
+    "first_idle": "least_requests",
+}
+
+
+class WorkerRouter:
+    def __init__(self, num_workers: int, strategy: str = "round_robin"):
+        self.num_workers = num_workers
+        self.strategy = _STRATEGY_ALIASES.get(strategy, strategy)
+        self._outstanding_requests = [0] * num_workers
+        self._outstanding_tokens = [0] * num_workers
+        self._available = [True] * num_workers
+        self._round_robin_counter = count()
+        self._rng = random.Random()
+        self._lock = threading.Lock()
+
+    def _candidates_locked(self) -> list[int]:
+        available = [idx for idx in range(self.num_workers) if self._available[idx]]
+        return available or list(range(self.num_workers))
+
+    def _select_locked(self) -> int:
+        if self.num_workers == 1:
+            return 0
+
+        candidates = self._candidates_locked()
+        if self.strategy == "round_robin":
+            return candidates[next(self._round_robin_counter) % len(candidates)]
+
+        if self.strategy == "power_of_two":
+            if len(candidates) == 1:
+                return candidates[0]
+            a, b = self._rng.sample(candidates, 2)
+            load_a = (self._outstanding_tokens[a], self._outstanding_requests[a])
+            load_b = (self._outstanding_tokens[b], self._outstanding_requests[b])
+            return a if load_a <= load_b else b
+
+        primary = (
+            self._outstanding_tokens
+            if self.strategy == "least_tokens"
+            else self._outstanding_requests
+        )
+        offset = next(self._round_robin_counter)
+        rotated = [candidates[(k + offset) % len(candidates)] for k in range(len(candidates))]
+        return min(rotated, key=lambda idx: primary[idx])
+
+    def set_available(self, worker_idx: int, available: bool) -> None:
+        with self._lock:
+            self._available[worker_idx] = available
+
+    def add_worker(self, available: bool = True) -> int:
+        with self._lock:
+            self._outstanding_requests.append(0)
+            self._outstanding_tokens.append(0)
+            self._available.append(available)
+            self.num_workers += 1
+            return self.num_workers - 1
+
+    def select(self) -> int:
+        with self._lock:
+            return self._select_locked()
+
+    def acquire(self, tokens: int) -> int:
+        with self._lock:
+            worker_idx = self._select_locked()
+            self._outstanding_requests[worker_idx] += 1
+            self._outstanding_tokens[worker_idx] += tokens
+            return worker_idx
+
+    def release(self, worker_idx: int, tokens: int) -> None:
+        with self._lock:
+            self._outstanding_requests[worker_idx] = max(
+                0, self._outstanding_requests[worker_idx] - 1
+            )
+            self._outstanding_tokens[worker_idx] = max(
+                0, self._outstanding_tokens[worker_idx] - tokens
+            )
+
+    def get_load(self) -> list[dict]:
+        with self._lock:
+            return [
+                {"worker_id": idx, "outstanding_requests": reqs, "outstanding_tokens": tokens}
+                for idx, (reqs, tokens) in enumerate(
+                    zip(self._outstanding_requests, self._outstanding_tokens, strict=True)
+                )
+            ]
+
+
+__all__ = ["WorkerRouter"]
@@ -7,6 +7,10 @@ from typing import TYPE_CHECKING
 
 from src.server.dto.pipeline import InferenceQueueItem, TokenizationQueueItem
 from src.server.pool.base import BaseWorkerPool
+from src.server.pool.routing import WorkerRouter
+from src.server.utils.admission import OverloadedError, RequestExpiredError, WorkerCrashedError
+from src.server.utils.placement import WorkerPlacement, apply_placement
+from src.server.utils.shared_memory import SharedTensorSlab
 from src.server.worker.tokenizer_worker import TokenizerWorker
 
 if TYPE_CHECKING:
@@ -16,6 +20,15 @@ logger = logging.getLogger(__name__)
 
 _STOP = "__STOP__"
 _GET_METRICS = "__GET_METRICS__"
+_WORKER_READY_TIMEOUT_S = 30.0
+# Workers created after start() must not fork the threaded server process.
+_REPLACEMENT_START_METHOD = "spawn"
+
+
+def _expired_error(req_id: int, deadline: float | None) -> RequestExpiredError | None:
+    if deadline is not None and time.perf_counter() >= deadline:
+        return RequestExpiredError(f"Request {req_id} expired before tokenization")
+    return None
 
 
 def _tokenizer_worker_main(
@@ -26,13 +39,20 @@ def _tokenizer_worker_main(
     input_queue: mp.Queue,
     output_queue: mp.Queue,
     ready_event: mp.Event,
+    slab_handle: tuple | None = None,
+    doc_cache_size: int = 0,
+    placement: WorkerPlacement | None = None,
 ):
     try:
+        apply_placement(placement)
+        tensor_slab = SharedTensorSlab.attach(*slab_handle) if slab_handle else None
         worker = TokenizerWorker(
             worker_id,
             model_name,
             max_length,
             tokenizers_parallelism,
+            tensor_slab=tensor_slab,
+            doc_cache_size=doc_cache_size,
         )
         worker.initialize()
         ready_event.set()
@@ -47,7 +67,12 @@ def _tokenizer_worker_main(
                 if item == _GET_METRICS:
                     continue
 
-                req_id, pairs, enqueue_time = item
+                req_id, pairs, enqueue_time, deadline = item
+
+                expired = _expired_error(req_id, deadline)
+                if expired:
+                    output_queue.put((req_id, None, expired, enqueue_time, worker_id))
+                    continue
 
                 try:
                     tokenized = worker.process(pairs)
@@ -73,15 +98,33 @@ class TokenizerPool(BaseWorkerPool):
         num_workers: int = 1,
         max_length: int = 512,
         tokenizers_parallelism: bool = False,
+        shared_memory: bool = False,
+        shm_num_slots: int = 32,
+        shm_slot_tokens: int = 128 * 512,
+        doc_cache_size: int = 0,
+        queue_size: int = 0,
+        placements: list[WorkerPlacement] | None = None,
+        supervise_interval_s: float = 1.0,
+        max_request_retries: int = 1,
     ):
         super().__init__(num_workers)
+        self.placements = placements or []
+        self.supervise_interval_s = supervise_interval_s
+        self.max_request_retries = max_request_retries
+        self._slab_handle: tuple | None = None
         self.model_name = model_name
         self.max_length = max_length
         self.tokenizers_parallelism = tokenizers_parallelism
-        self._use_multiprocessing = num_workers > 1
+        self.shared_memory = shared_memory
+        self._shm_num_slots = shm_num_slots
+        self._shm_slot_tokens = shm_slot_tokens
+        self.doc_cache_size = doc_cache_size
+        self.queue_size = queue_size
+        self._tensor_slab: SharedTensorSlab | None = None
 
         self._processes: list[mp.Process] = []
-        self._input_queue: mp.Queue | queue.Queue | None = None
+        self._input_queues: list[mp.Queue | queue.Queue] = []
+        self._router = WorkerRouter(num_workers, "least_tokens")
         self._output_queue: mp.Queue | queue.Queue | None = None
         self._ready_events: list[mp.Event] = []
 
@@ -93,7 +136,10 @@ class TokenizerPool(BaseWorkerPool):
         self._metrics: MetricsService | None = None
 
         self._pending_items: dict[int, TokenizationQueueItem] = {}
+        self._assignments: dict[int, tuple[int, int]] = {}
         self._pending_lock = threading.Lock()
+        self._dispatch_lock = threading.Lock()
+        self._draining: set[int] = set()
 
         self._total_batches = 0
         self._total_queries = 0
@@ -103,6 +149,10 @@ class TokenizerPool(BaseWorkerPool):
     def set_metrics(self, metrics: "MetricsService") -> None:
         self._metrics = metrics
 
+    @property
+    def tensor_slab(self) -> SharedTensorSlab | None:
+        return self._tensor_slab
+
     def start(self, timeout_s: float = 120.0) -> None:
         if self._is_started:
             return
@@ -113,42 +163,35 @@ class TokenizerPool(BaseWorkerPool):
         self._shutdown_event.clear()
 
         if self._use_multiprocessing:
-            self._input_queue = mp.Queue()
-            self._output_queue = mp.Queue()
+            self._output_queue = mp.get_context(_REPLACEMENT_START_METHOD).Queue()
         else:
-            self._input_queue = queue.Queue()
+            self._input_queues = [queue.Queue(maxsize=self.queue_size)]
             self._output_queue = queue.Queue()
 
         if self._use_multiprocessing:
+            if self.shared_memory:
+                self._tensor_slab = SharedTensorSlab.create(
+                    self._shm_num_slots, self._shm_slot_tokens
+                )
+            self._slab_handle = self._tensor_slab.handle() if self._tensor_slab else None
+
             for i in range(self.num_workers):
-                ready_event = mp.Event()
+                process, input_queue, ready_event = self._spawn_worker(i)
+                self._processes.append(process)
+                self._input_queues.append(input_queue)
                 self._ready_events.append(ready_event)
 
-                p = mp.Process(
-                    target=_tokenizer_worker_main,
-                    args=(
-                        i,
-                        self.model_name,
-                        self.max_length,
-                        self.tokenizers_parallelism,
-                        self._input_queue,
-                        self._output_queue,
-                        ready_event,
-                    ),
-                    daemon=True,
-                )
-                p.start()
-                self._processes.append(p)
-
             for i, ev in enumerate(self._ready_events):
-                if not ev.wait(timeout=30.0):
+                if not ev.wait(timeout=_WORKER_READY_TIMEOUT_S):
                     logger.warning(f"Tokenizer worker {i} failed to start within timeout")
+            self._start_supervisor(self.supervise_interval_s)
         else:
             self._local_worker = TokenizerWorker(
                 0,
                 self.model_name,
                 self.max_length,
                 self.tokenizers_parallelism,
+                doc_cache_size=self.doc_cache_size,
             )
             self._local_worker.initialize()
             self._worker_thread = threading.Thread(target=self._local_worker_loop, daemon=True)
@@ -161,18 +204,169 @@ class TokenizerPool(BaseWorkerPool):
         mode = "MP" if self._use_multiprocessing else "Local"
         logger.info(f"Tokenizer pool ready with {self.num_workers} workers ({mode})")
 
+    def _spawn_worker(self, worker_id: int, ctx: mp.context.BaseContext | None = None) -> tuple:
+        ctx = ctx or mp.get_context()
+        ready_event = ctx.Event()
+        worker_queue_size = -(-self.queue_size // self.num_workers) if self.queue_size > 0 else 0
+        input_queue = ctx.Queue(maxsize=worker_queue_size)
+        process = ctx.Process(
+            target=_tokenizer_worker_main,
+            args=(
+                worker_id,
+                self.model_name,
+                self.max_length,
+                self.tokenizers_parallelism,
+                input_queue,
+                self._output_queue,
+                ready_event,
+                self._slab_handle,
+                self.doc_cache_size,
+                self.placements[worker_id] if worker_id < len(self.placements) else None,
+            ),
+            daemon=True,
+        )
+        process.start()
+        return process, input_queue, ready_event
+
+    def _install_worker(self, worker_id: int) -> tuple:
+        process, input_queue, ready_event = self._spawn_worker(
+            worker_id, ctx=mp.get_context(_REPLACEMENT_START_METHOD)
+        )
+        if worker_id < len(self._processes):
+            self._input_queues[worker_id].cancel_join_thread()
+            self._processes[worker_id] = process
+            self._input_queues[worker_id] = input_queue
+            self._ready_events[worker_id] = ready_event
+        else:
+            self._processes.append(process)
+            self._input_queues.append(input_queue)
+            self._ready_events.append(ready_event)
+            self._router.add_worker(available=False)
+        return process, ready_event
+
+    def _restart_worker(self, worker_id: int) -> None:
+        self._router.set_available(worker_id, False)
+        process, ready_event = self._install_worker(worker_id)
+        if self._metrics:
+            self._metrics.record_worker_restart("tokenizer")
+        self._requeue_crashed(worker_id)
+
+        if not self._wait_ready(ready_event, _WORKER_READY_TIMEOUT_S):
+            logger.error(f"Restarted tokenizer worker {worker_id} did not become ready")
+            process.terminate()
+            return
+        self._router.set_available(worker_id, True)
+        logger.info(f"Tokenizer worker {worker_id} restarted")
+
+    def _add_worker(self, worker_id: int) -> bool:
+        process, ready_event = self._install_worker(worker_id)
+        if not self._wait_ready(ready_event, _WORKER_READY_TIMEOUT_S):
+            logger.error(f"Tokenizer worker {worker_id} did not become ready, not scaling up")
+            process.terminate()
+            return False
+        self._router.set_available(worker_id, True)
+        return True
+
+    def _retire_worker(self, worker_id: int) -> None:
+        with self._dispatch_lock:
+            self._router.set_available(worker_id, False)
+            self._draining.add(worker_id)
+        self._stop_if_drained(worker_id)
+
+    def _stop_if_drained(self, worker_id: int) -> None:
+        with self._pending_lock:
+            if worker_id not in self._draining:
+                return
+            if any(idx == worker_id for idx, _ in self._assignments.values()):
+                return
+            self._draining.discard(worker_id)
+        self._input_queues[worker_id].put(_STOP)
+
+    def _recover_requests(self, worker_id: int) -> None:
+        self._draining.discard(worker_id)
+        self._requeue_crashed(worker_id)
+
+    def _requeue_crashed(self, worker_id: int) -> None:
+        with self._pending_lock:
+            stranded = [
+                (req_id, tokens)
+                for req_id, (idx, tokens) in self._assignments.items()
+                if idx == worker_id
+            ]
+            for req_id, _ in stranded:
+                del self._assignments[req_id]
+
+        requeued = 0
+        for req_id, tokens in stranded:
+            self._router.release(worker_id, tokens)
+            with self._pending_lock:
+                tokenization_item = self._pending_items.get(req_id)
+            if tokenization_item is None:
+                continue
+            request = tokenization_item.request
+            if request.crash_retries >= self.max_request_retries:
+                self._fail_pending(
+                    req_id,
+                    WorkerCrashedError(
+                        f"Tokenizer worker {worker_id} crashed while serving request {req_id}"
+                    ),
+                )
+                continue
+            request.crash_retries += 1
+            try:
+                self._dispatch(req_id, tokenization_item)
+                requeued += 1
+            except queue.Full:
+                self._fail_pending(req_id, OverloadedError("Tokenizer pool queue full"))
+
+        if requeued:
+            logger.warning(
+                f"Requeued {requeued} requests from crashed tokenizer worker {worker_id}"
+            )
+            if self._metrics:
+                self._metrics.record_requeued_requests("tokenizer", requeued)
+
+    def _fail_pending(self, req_id: int, error: Exception) -> None:
+        with self._pending_lock:
+            tokenization_item = self._pending_items.pop(req_id, None)
+            self._assignments.pop(req_id, None)
+        if tokenization_item is not None:
+            tokenization_item.request.error = error
+            tokenization_item.request.complete()
+
+    def _dispatch(self, req_id: int, tokenization_item: TokenizationQueueItem) -> None:
+        tokens = len(tokenization_item.pairs)
+        with self._dispatch_lock:
+            worker_idx = self._router.acquire(tokens)
+            with self._pending_lock:
+                self._assignments[req_id] = (worker_idx, tokens)
+            try:
+                self._input_queues[worker_idx].put_nowait(
+                    (
+                        req_id,
+                        tokenization_item.pairs,
+                        tokenization_item.enqueue_time,
+                        tokenization_item.request.deadline,
+                    )
+                )
+            except queue.Full:
+                with self._pending_lock:
+                    self._assignments.pop(req_id, None)
+                self._router.release(worker_idx, tokens)
+                raise
+
     def stop(self, timeout_s: float = 30.0) -> None:
         if not self._is_started:
             return
 
         self._shutdown_event.set()
+        self._stop_supervisor(timeout_s)
 
-        if self._input_queue:
-            for _ in range(self.num_workers):
-                try:
-                    self._input_queue.put(_STOP)
-                except Exception:
-                    pass
+        for input_queue in self._input_queues:
+            try:
+                input_queue.put(_STOP, timeout=1.0)
+            except Exception:
+                pass
 
         deadline = time.time() + timeout_s
         if self._use_multiprocessing:
@@ -189,12 +383,19 @@ class TokenizerPool(BaseWorkerPool):
         if self._result_thread:
             self._result_thread.join(timeout=1.0)
 
+        if self._tensor_slab:
+            self._tensor_slab.close()
+            self._tensor_slab = None
+
         self._processes.clear()
-        self._input_queue = None
+        self._input_queues = []
         self._output_queue = None
         self._ready_events.clear()
         self._worker_thread = None
         self._local_worker = None
+        self._draining.clear()
+        if self._reset_scaling():
+            self._router = WorkerRouter(self.num_workers, "least_tokens")
 
         self._is_started = False
 
@@ -219,27 +420,27 @@ class TokenizerPool(BaseWorkerPool):
         self.submit_pipeline(work_item)
 
     def submit_pipeline(self, tokenization_item: TokenizationQueueItem) -> None:
-        if not self._is_started or not self._input_queue:
+        if not self._is_started or not self._input_queues:
             raise RuntimeError("Tokenizer pool not started")
 
-        req_id = tokenization_item.request.request_id
+        request = tokenization_item.request
+        req_id = request.request_id
 
-        if not self._input_queue:
-            raise RuntimeError("Tokenizer pool input queue not initialized")
+        if request.is_expired():
+            self._record_expired()
+            raise RequestExpiredError(f"Request {req_id} expired before tokenization")
 
         with self._pending_lock:
             self._pending_items[req_id] = tokenization_item
 
         try:
-            self._input_queue.put_nowait(
-                (req_id, tokenization_item.pairs, tokenization_item.enqueue_time)
-            )
+            self._dispatch(req_id, tokenization_item)
             if self._metrics:
                 self._metrics.record_tokenizer_queue_in(1)
         except queue.Full:
             with self._pending_lock:
                 self._pending_items.pop(req_id, None)
-            raise RuntimeError("Tokenizer pool shared queue full") from None
+            raise OverloadedError("Tokenizer pool queue full") from None
 
     def _result_loop(self) -> None:
         while not self._shutdown_event.is_set():
@@ -253,20 +454,37 @@ class TokenizerPool(BaseWorkerPool):
 
                 req_id, tokenized_batch, error, enqueue_time, worker_id = result
 
-                tokenization_item = None
                 with self._pending_lock:
                     tokenization_item = self._pending_items.pop(req_id, None)
+                    assignment = self._assignments.pop(req_id, None)
+                if assignment is not None:
+                    self._router.release(*assignment)
+                    if assignment[0] in self._draining:
+                        self._stop_if_drained(assignment[0])
 
                 if not tokenization_item:
                     logger.warning(f"Received result for unknown/cancelled request {req_id}")
+                    self.release_shared_tensors(tokenized_batch)
                     continue
 
                 request = tokenization_item.request
 
                 if error:
-                    logger.error(f"Tokenization error for {req_id}: {error}")
+                    if isinstance(error, RequestExpiredError):
+                        self._record_expired()
+                    else:
+                        logger.error(f"Tokenization error for {req_id}: {error}")
                     request.error = error
-                    request.result_event.set()
+                    request.complete()
+                    continue
+
+                if request.is_expired():
+                    self.release_shared_tensors(tokenized_batch)
+                    self._record_expired()
+                    request.error = RequestExpiredError(
+                        f"Request {req_id} expired before inference"
+                    )
+                    request.complete()
                     continue
 
                 num_pairs = len(tokenization_item.pairs)
@@ -293,25 +511,40 @@ class TokenizerPool(BaseWorkerPool):
                             self._metrics.record_model_queue_in(1)
                     except queue.Full:
                         logger.warning("Inference queue full, dropping tokenized result")
-                        request.error = RuntimeError("Inference queue full")
-                        request.result_event.set()
+                        self.release_shared_tensors(tokenized_batch)
+                        request.error = OverloadedError("Inference queue full")
+                        request.complete()
                 else:
-                    request.result_event.set()
+                    self.release_shared_tensors(tokenized_batch)
+                    request.complete()
 
             except Exception as e:
                 logger.error(f"Tokenizer pool result loop error: {e}", exc_info=True)
 
+    def _record_expired(self) -> None:
+        if self._metrics:
+            self._metrics.record_expired_request("tokenizer")
+
+    def release_shared_tensors(self, tokenized_batch) -> None:
+        if self._tensor_slab and tokenized_batch is not None and tokenized_batch.shm_ref:
+            self._tensor_slab.release(tokenized_batch.shm_ref)
+
     def _local_worker_loop(self) -> None:
-        if not self._input_queue or not self._output_queue or not self._local_worker:
+        if not self._input_queues or not self._output_queue or not self._local_worker:
             return
+        input_queue = self._input_queues[0]
         while not self._shutdown_event.is_set():
             try:
-                item = self._input_queue.get()
+                item = input_queue.get()
                 if item == _STOP:
                     break
                 if item == _GET_METRICS:
                     continue
-                req_id, pairs, enqueue_time = item
+                req_id, pairs, enqueue_time, deadline = item
+                expired = _expired_error(req_id, deadline)
+                if expired:
+                    self._output_queue.put((req_id, None, expired, enqueue_time, 0))
+                    continue
                 try:
                     tokenized = self._local_worker.process(pairs)
                     self._output_queue.put((req_id, tokenized, None, enqueue_time, 0))
@@ -322,28 +555,33 @@ class TokenizerPool(BaseWorkerPool):
                 logger.error(f"Tokenizer worker 0 loop error: {e}")
 
     def get_info(self) -> dict:
-        total_worker_queue_size = 0
+        queue_sizes = [0] * self.num_workers
         inference_queue_size = 0
 
-        if self._is_started and self._input_queue:
+        if self._is_started and self._input_queues:
             try:
                 try:
-                    total_worker_queue_size = self._input_queue.qsize()
+                    for i, input_queue in enumerate(self._active_queues()):
+                        queue_sizes[i] = input_queue.qsize()
                 except NotImplementedError:
-                    total_worker_queue_size = 0
+                    pass
 
                 if self._inference_queue:
                     inference_queue_size = self._inference_queue.qsize()
             except Exception as e:
                 logger.debug(f"Error getting tokenizer queue sizes: {e}")
 
-        queue_sizes = [total_worker_queue_size] + [0] * (self.num_workers - 1)
+        total_worker_queue_size = sum(queue_sizes)
 
         return {
             "model_name": self.model_name,
             "num_workers": self.num_workers,
             "is_loaded": self._is_started,
             "tokenizers_parallelism": self.tokenizers_parallelism,
+            "shared_memory": self._tensor_slab is not None,
+            "doc_cache_size": self.doc_cache_size,
+            "placement": [p.to_dict() for p in self.placements],
+            "worker_restarts": dict(self._restart_counts),
             "queue_sizes": queue_sizes,
             "total_queue_size": total_worker_queue_size,
             "inference_queue_size": inference_queue_size,
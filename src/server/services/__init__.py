@@ -1,4 +1,5 @@
 from src.server.pool import BaseWorkerPool
+from src.server.services.autoscaler_service import AutoscalerService
 from src.server.services.metrics_service import MetricsService
 from src.server.services.orchestrator_service import OrchestratorService
 from src.server.services.service_base import BaseService, PoolBasedService
@@ -43,4 +44,5 @@ __all__ = [
     "TokenizerWorker",
     "OrchestratorService",
     "MetricsService",
+    "AutoscalerService",
 ]
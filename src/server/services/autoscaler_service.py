@@ -0,0 +1,176 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from src.server.dto import AutoscaleConfig
+from src.server.pool.base import BaseWorkerPool
+from src.server.services.service_base import BaseService
+
+if TYPE_CHECKING:
+    from src.server.services.metrics_service import MetricsService
+
+logger = logging.getLogger(__name__)
+
+_QUEUE_SIZE_KEYS = {"tokenizer": "total_queue_size", "model": "queue_size"}
+
+
+@dataclass
+class _Stage:
+    name: str
+    pool: BaseWorkerPool
+    min_workers: int
+    max_workers: int
+    overloaded_streak: int = 0
+    idle_streak: int = 0
+    last_scaled: float = float("-inf")
+    wait_totals: tuple[float, float] = (0.0, 0.0)
+
+
+class AutoscalerService(BaseService):
+    def __init__(
+        self,
+        config: AutoscaleConfig,
+        tokenizer_pool: BaseWorkerPool,
+        model_pool: BaseWorkerPool,
+        metrics: "MetricsService | None" = None,
+    ):
+        super().__init__()
+        self.config = config
+        self._metrics = metrics
+        self._stages = [
+            _Stage(
+                "tokenizer",
+                tokenizer_pool,
+                config.tokenizer_min_workers,
+                config.tokenizer_max_workers,
+            ),
+            _Stage("model", model_pool, config.model_min_workers, config.model_max_workers),
+        ]
+        self._shutdown_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._is_started:
+            return
+
+        for stage in self._stages:
+            if not stage.pool.supports_scaling:
+                logger.warning(
+                    f"{stage.name} pool runs a single in-process worker and will not be "
+                    f"autoscaled (start it with at least 2 workers)"
+                )
+            if self._metrics:
+                self._metrics.set_pool_workers(stage.name, stage.pool.num_workers)
+        if self._metrics:
+            for stage, totals in self._metrics.get_queue_wait_totals().items():
+                self._stage(stage).wait_totals = totals
+
+        self._shutdown_event.clear()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+        self._is_started = True
+        logger.info(
+            f"Autoscaler started: tokenizer {self.config.tokenizer_min_workers}-"
+            f"{self.config.tokenizer_max_workers}, model {self.config.model_min_workers}-"
+            f"{self.config.model_max_workers} workers, every {self.config.interval_s}s"
+        )
+
+    def stop(self) -> None:
+        self._shutdown_event.set()
+        if self._thread:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+        self._is_started = False
+
+    def _loop(self) -> None:
+        while not self._shutdown_event.wait(self.config.interval_s):
+            try:
+                self.tick()
+            except Exception as e:
+                logger.error(f"Autoscaler error: {e}", exc_info=True)
+
+    def _stage(self, name: str) -> _Stage:
+        return next(stage for stage in self._stages if stage.name == name)
+
+    def tick(self, now: float | None = None) -> None:
+        now = time.monotonic() if now is None else now
+        wait_totals = self._metrics.get_queue_wait_totals() if self._metrics else {}
+        stages = [stage for stage in self._stages if stage.pool.supports_scaling]
+        for stage in stages:
+            self._observe(stage, wait_totals.get(stage.name))
+
+        sustain = self.config.sustain_intervals
+        for stage in stages:
+            if stage.overloaded_streak >= sustain:
+                self._grow(stage, stages, now)
+        for stage in stages:
+            if (
+                stage.idle_streak >= sustain
+                and stage.pool.num_workers > stage.min_workers
+                and self._cooled(stage, now)
+            ):
+                self._scale(stage, "down", now)
+
+    def _observe(self, stage: _Stage, totals: tuple[float, float] | None) -> None:
+        cfg = self.config
+        queued = stage.pool.get_info().get(_QUEUE_SIZE_KEYS[stage.name], 0)
+        depth = queued / max(stage.pool.num_workers, 1)
+
+        wait_ms = None
+        if totals is not None:
+            wait_sum = totals[0] - stage.wait_totals[0]
+            wait_count = totals[1] - stage.wait_totals[1]
+            stage.wait_totals = totals
+            if wait_count > 0 and wait_sum >= 0:
+                wait_ms = wait_sum / wait_count * 1000
+
+        overloaded = depth >= cfg.scale_up_queue_depth or (
+            cfg.scale_up_wait_ms > 0 and wait_ms is not None and wait_ms >= cfg.scale_up_wait_ms
+        )
+        idle = depth <= cfg.scale_down_queue_depth and (
+            wait_ms is None or wait_ms <= cfg.scale_down_wait_ms
+        )
+        stage.overloaded_streak = stage.overloaded_streak + 1 if overloaded else 0
+        stage.idle_streak = stage.idle_streak + 1 if idle else 0
+        logger.debug(
+            f"Autoscaler {stage.name}: {stage.pool.num_workers} workers, depth={depth:.1f}, "
+            f"wait_ms={wait_ms}, overloaded={stage.overloaded_streak}, idle={stage.idle_streak}"
+        )
+
+    def _grow(self, stage: _Stage, stages: list[_Stage], now: float) -> None:
+        if stage.pool.num_workers >= stage.max_workers or not self._cooled(stage, now):
+            return
+
+        budget = self.config.max_total_workers
+        if budget > 0 and sum(s.pool.num_workers for s in stages) >= budget:
+            donor = next(
+                (
+                    s
+                    for s in stages
+                    if s is not stage
+                    and s.overloaded_streak == 0
+                    and s.pool.num_workers > s.min_workers
+                ),
+                None,
+            )
+            if donor is None or not self._scale(donor, "down", now):
+                return
+            logger.info(f"Autoscaler moved a worker from {donor.name} to {stage.name}")
+        self._scale(stage, "up", now)
+
+    def _cooled(self, stage: _Stage, now: float) -> bool:
+        return now - stage.last_scaled >= self.config.cooldown_s
+
+    def _scale(self, stage: _Stage, direction: str, now: float) -> bool:
+        scaled = stage.pool.scale_up() if direction == "up" else stage.pool.scale_down()
+        stage.overloaded_streak = 0
+        stage.idle_streak = 0
+        stage.last_scaled = now
+        if scaled and self._metrics:
+            self._metrics.record_autoscale(stage.name, direction, stage.pool.num_workers)
+        return scaled
+
+
+__all__ = ["AutoscalerService"]
@@ -3,6 +3,7 @@ import threading
 from typing import TYPE_CHECKING, Any
 from wsgiref.simple_server import WSGIRequestHandler, make_server
 
+import numpy as np
 from prometheus_client import Counter, Gauge, Histogram, make_wsgi_app
 
 
@@ -60,6 +61,7 @@ class MetricsService(BaseService):
         self.prom_tokenizer_queue_size = Gauge("tokenizer_queue_size", "Tokenizer Queue Size")
         self.prom_model_queue_size = Gauge("model_queue_size", "Model Queue Size")
         self.prom_batch_queue_size = Gauge("batch_queue_size", "Batch Queue Size")
+        self.prom_batch_timeout = Gauge("batch_timeout_ms", "Current batch window in ms")
         self.prom_padding_ratio = Gauge("padding_ratio", "Padding ratio")
         self.prom_max_seq_length = Gauge("max_seq_length", "Max sequence length")
         self.prom_avg_seq_length = Gauge("avg_seq_length", "Avg sequence length")
@@ -88,7 +90,61 @@ class MetricsService(BaseService):
             "model_queue_items_out_total", "Items dequeued from model"
         )
 
+        self.prom_cache_hits = Counter("score_cache_hits_total", "Score cache hits")
+        self.prom_cache_misses = Counter("score_cache_misses_total", "Score cache misses")
+        self.prom_cache_evictions = Counter(
+            "score_cache_evictions_total", "Score cache evictions", ["reason"]
+        )
+        self.prom_cache_size = Gauge("score_cache_entries", "Score cache entries")
+
+        self.prom_admission_rejections = Counter(
+            "admission_rejections_total", "Requests shed by admission control", ["reason"]
+        )
+        self.prom_expired_requests = Counter(
+            "expired_requests_total",
+            "Requests dropped after their deadline passed or the client cancelled",
+            ["stage"],
+        )
+
+        self.prom_cascade_pairs = Counter(
+            "cascade_pairs_total", "Pairs scored per cascade stage", ["stage"]
+        )
+        self.prom_cascade_stage_latency = Histogram(
+            "cascade_stage_latency_seconds",
+            "Cascade stage latency",
+            ["stage"],
+            buckets=LATENCY_BUCKETS,
+        )
+        self.prom_early_exits = Counter(
+            "early_exit_rows_total", "Rows finished at each encoder layer", ["layer"]
+        )
+        self.prom_worker_restarts = Counter(
+            "worker_restarts_total", "Worker processes respawned after dying", ["worker_type"]
+        )
+        self.prom_requeued_requests = Counter(
+            "worker_requeued_requests_total",
+            "In-flight requests retried on another worker after a crash",
+            ["worker_type"],
+        )
+        self.prom_pool_workers = Gauge("pool_workers", "Active workers per pool", ["worker_type"])
+        self.prom_autoscale_events = Counter(
+            "autoscale_events_total", "Autoscaler scaling actions", ["worker_type", "direction"]
+        )
+        self.prom_priority_queue_depth = Gauge(
+            "priority_queue_depth",
+            "Queued requests per priority class",
+            ["stage", "priority_class"],
+        )
+        self.prom_priority_latency = Histogram(
+            "priority_request_latency_seconds",
+            "End-to-end scheduling latency per priority class",
+            ["priority_class"],
+            buckets=LATENCY_BUCKETS,
+        )
+
     def start(self) -> None:
+        if self._is_started:
+            return
         self._is_started = True
         self._shutdown_event.clear()
         try:
@@ -218,8 +274,70 @@ class MetricsService(BaseService):
     def record_model_queue_out(self, count: int = 1) -> None:
         self.prom_model_queue_out.inc(count)
 
+    def record_cache_lookup(self, hits: int, misses: int) -> None:
+        if hits:
+            self.prom_cache_hits.inc(hits)
+        if misses:
+            self.prom_cache_misses.inc(misses)
+
+    def record_cache_evictions(self, count: int, reason: str) -> None:
+        self.prom_cache_evictions.labels(reason=reason).inc(count)
+
+    def set_cache_size(self, size: int) -> None:
+        self.prom_cache_size.set(size)
+
+    def record_admission_rejection(self, reason: str) -> None:
+        self.prom_admission_rejections.labels(reason=reason).inc()
+
+    def record_expired_request(self, stage: str, count: int = 1) -> None:
+        self.prom_expired_requests.labels(stage=stage).inc(count)
+
+    def record_early_exits(self, exit_layers: np.ndarray) -> None:
+        layers, counts = np.unique(exit_layers, return_counts=True)
+        for layer, count in zip(layers.tolist(), counts.tolist(), strict=True):
+            self.prom_early_exits.labels(layer=str(layer)).inc(count)
+
+    def record_worker_restart(self, worker_type: str) -> None:
+        self.prom_worker_restarts.labels(worker_type=worker_type).inc()
+
+    def record_requeued_requests(self, worker_type: str, count: int = 1) -> None:
+        self.prom_requeued_requests.labels(worker_type=worker_type).inc(count)
+
+    def set_batch_timeout(self, timeout_ms: float) -> None:
+        self.prom_batch_timeout.set(timeout_ms)
+
+    def record_autoscale(self, worker_type: str, direction: str, workers: int) -> None:
+        self.prom_autoscale_events.labels(worker_type=worker_type, direction=direction).inc()
+        self.prom_pool_workers.labels(worker_type=worker_type).set(workers)
+
+    def set_pool_workers(self, worker_type: str, workers: int) -> None:
+        self.prom_pool_workers.labels(worker_type=worker_type).set(workers)
+
+    def record_priority_latency(self, priority_class: str, latency_ms: float) -> None:
+        self.prom_priority_latency.labels(priority_class=priority_class).observe(
+            latency_ms / 1000.0
+        )
+
+    def get_queue_wait_totals(self) -> dict[str, tuple[float, float]]:
+        totals = {}
+        for stage, histogram in (
+            ("tokenizer", self.prom_tokenizer_queue_wait_latency),
+            ("model", self.prom_model_queue_wait_latency),
+        ):
+            samples = {s.name: s.value for s in histogram.collect()[0].samples}
+            totals[stage] = (
+                samples.get(f"{histogram._name}_sum", 0.0),
+                samples.get(f"{histogram._name}_count", 0.0),
+            )
+        return totals
+
+    def record_cascade_stage(self, stage: str, num_pairs: int, latency_s: float) -> None:
+        self.prom_cascade_pairs.labels(stage=stage).inc(num_pairs)
+        self.prom_cascade_stage_latency.labels(stage=stage).observe(latency_s)
+
     def _get_queue_sizes(self) -> dict:
         tokenizer_queue_size = model_queue_size = batch_queue_size = 0
+        priority_pending = {}
         if self._collector._tokenizer_pool:
             try:
                 info = self._collector._tokenizer_pool.get_info()
@@ -233,11 +351,14 @@ class MetricsService(BaseService):
             except Exception:
                 pass
         if self._orchestrator:
-            batch_queue_size = self._orchestrator.get_batching_info().get("pending", 0)
+            batching_info = self._orchestrator.get_batching_info()
+            batch_queue_size = batching_info.get("pending", 0)
+            priority_pending = batching_info.get("priority_pending", {})
         return {
             "tokenizer_queue_size": tokenizer_queue_size,
             "model_queue_size": model_queue_size,
             "batch_queue_size": batch_queue_size,
+            "priority_pending": priority_pending,
         }
 
     def reset(self) -> None:
@@ -249,6 +370,7 @@ class MetricsService(BaseService):
         self.prom_padding_ratio.set(0)
         self.prom_max_seq_length.set(0)
         self.prom_avg_seq_length.set(0)
+        self.prom_cache_size.set(0)
         self._reset_counter(self.prom_request_count)
         self._reset_counter(self.prom_padded_tokens)
         self._reset_counter(self.prom_total_tokens)
@@ -256,6 +378,8 @@ class MetricsService(BaseService):
         self._reset_counter(self.prom_tokenizer_queue_out)
         self._reset_counter(self.prom_model_queue_in)
         self._reset_counter(self.prom_model_queue_out)
+        self._reset_counter(self.prom_cache_hits)
+        self._reset_counter(self.prom_cache_misses)
         self._reset_histogram(self.prom_request_latency)
         self._reset_histogram(self.prom_inference_latency)
         self._reset_histogram(self.prom_tokenization_latency)
@@ -266,6 +390,17 @@ class MetricsService(BaseService):
         self.prom_worker_latency.clear()
         self.prom_worker_requests.clear()
         self.prom_worker_tokens.clear()
+        self.prom_cache_evictions.clear()
+        self.prom_admission_rejections.clear()
+        self.prom_expired_requests.clear()
+        self.prom_cascade_pairs.clear()
+        self.prom_cascade_stage_latency.clear()
+        self.prom_early_exits.clear()
+        self.prom_worker_restarts.clear()
+        self.prom_requeued_requests.clear()
+        self.prom_autoscale_events.clear()
+        self.prom_priority_queue_depth.clear()
+        self.prom_priority_latency.clear()
 
     def _reset_counter(self, counter: Counter) -> None:
         counter._value.set(0)
@@ -326,6 +461,11 @@ class MetricsService(BaseService):
             self.prom_tokenizer_queue_size.set(queue_info["tokenizer_queue_size"])
             self.prom_model_queue_size.set(queue_info["model_queue_size"])
             self.prom_batch_queue_size.set(queue_info["batch_queue_size"])
+            for stage, depths in queue_info["priority_pending"].items():
+                for priority_class, depth in depths.items():
+                    self.prom_priority_queue_depth.labels(
+                        stage=stage, priority_class=priority_class
+                    ).set(depth)
         except Exception as e:
             logger.warning(f"Error updating system metrics: {e}")
 
@@ -1,14 +1,27 @@
 import logging
 import threading
+import time
 
-from src.server.dto import Config, InferenceResult
+import numpy as np
+
+from src.server.dto import Config, InferenceResult, TokenIdBatch
 from src.server.pipeline.queue_based import QueueBasedPipeline
 from src.server.pool import ModelPool, TokenizerPool
+from src.server.services.autoscaler_service import AutoscalerService
 from src.server.services.metrics_service import MetricsService
+from src.server.utils.cascade import cascade_filters, merge_cascade_scores, select_candidates
+from src.server.utils.placement import plan_placement
+from src.server.utils.score_cache import ScoreCache, cache_namespace
 
 logger = logging.getLogger(__name__)
 
 
+def _remaining_ms(deadline_ms: float | None, start: float) -> float | None:
+    if deadline_ms is None:
+        return None
+    return deadline_ms - (time.perf_counter() - start) * 1000
+
+
 class OrchestratorService:
     def __init__(self, config: Config, experiment_name: str = "default"):
         self.config = config
@@ -18,32 +31,25 @@ class OrchestratorService:
         self.pool = None
         self.metrics = None
         self.pipeline = None
+        self.cascade_pipeline: QueueBasedPipeline | None = None
+        self.score_cache: ScoreCache | None = None
+        self.autoscaler: AutoscalerService | None = None
 
     def setup(self) -> None:
         logger.info(f"Setting up orchestrator for experiment: {self.experiment_name}")
 
-        tokenizer_model = self.config.tokenizer_pool.model_name
-        if not tokenizer_model and self.config.model_pool.instances:
-            tokenizer_model = self.config.model_pool.instances[0].name
+        cascade = self.config.cascade
+        stage_configs = [self.config]
+        if cascade.enabled and cascade.instances and self.config.pipeline.mode == "full":
+            stage_configs.append(self._cascade_stage_config())
+        placements = self._plan_placements(stage_configs)
 
-        tokenizer_max_length = 512
-        if self.config.model_pool.instances:
-            tokenizer_max_length = min(inst.max_length for inst in self.config.model_pool.instances)
-
-        self.tokenizer_pool = TokenizerPool(
-            model_name=tokenizer_model,
-            num_workers=self.config.tokenizer_pool.num_workers,
-            max_length=tokenizer_max_length,
-            tokenizers_parallelism=self.config.tokenizer_pool.tokenizers_parallelism,
-        )
-        self.pool = ModelPool(self.config.model_pool)
+        self.tokenizer_pool, self.pool = self._create_pools(self.config, placements[0])
         self.metrics = MetricsService(prometheus_port=self.config.server.prometheus_port)
         self.metrics.set_inference_service(self)
         self.metrics.set_tokenization_service(self)
         self.metrics.set_model_pool(self.pool)
         self.metrics.set_tokenizer_pool(self.tokenizer_pool)
-        self.tokenizer_pool.set_metrics(self.metrics)
-        self.pool.set_metrics(self.metrics)
         self.metrics.set_experiment_info(
             name=self.experiment_name,
             description=self.config.description,
@@ -54,30 +60,327 @@ class OrchestratorService:
             if self.config.model_pool.instances
             else "cpu",
         )
+        self.pipeline = self._create_pipeline(self.config, self.tokenizer_pool, self.pool)
+
+        if len(stage_configs) > 1:
+            stage_config = stage_configs[1]
+            self.cascade_pipeline = self._create_pipeline(
+                stage_config, *self._create_pools(stage_config, placements[1])
+            )
+            logger.info(
+                f"Cascade enabled: {len(cascade.instances)} stage-1 instances, "
+                f"top_k={cascade.top_k}, threshold={cascade.threshold}"
+            )
+
+        cache_config = self.config.cache
+        if cache_config.enabled and self.config.pipeline.mode == "full":
+            self.score_cache = ScoreCache(
+                namespace=cache_namespace(self.config.model_pool.instances),
+                max_entries=cache_config.max_entries,
+                ttl_seconds=cache_config.ttl_seconds,
+            )
+            self.score_cache.set_metrics(self.metrics)
+            logger.info(
+                f"Score cache enabled: max_entries={cache_config.max_entries}, "
+                f"ttl_seconds={cache_config.ttl_seconds}"
+            )
+
+        if self.config.autoscale.enabled and self.config.pipeline.mode == "full":
+            if self.config.model_pool.pin_cpus:
+                logger.warning("Autoscaled workers beyond the planned placement run unpinned")
+            self.autoscaler = AutoscalerService(
+                self.config.autoscale, self.tokenizer_pool, self.pool, self.metrics
+            )
+        logger.info("Orchestrator setup complete")
+
+    def _plan_placements(self, configs: list[Config]) -> list[tuple[list, list]]:
+        if not self.config.model_pool.pin_cpus:
+            return [([], [])] * len(configs)
+
+        def process_workers(count: int) -> int:
+            return count if count > 1 else 0
 
-        self.pipeline = QueueBasedPipeline(
-            config=self.config,
-            tokenizer_pool=self.tokenizer_pool,
-            model_pool=self.pool,
+        tokenizer_counts = [process_workers(c.tokenizer_pool.num_workers) for c in configs]
+        model_counts = [process_workers(len(c.model_pool.instances)) for c in configs]
+        tokenizer, model = plan_placement(
+            sum(tokenizer_counts),
+            sum(model_counts),
+            tokenizer_cores=self.config.tokenizer_pool.cores_per_worker,
+        )
+
+        placements = []
+        for tokenizer_count, model_count in zip(tokenizer_counts, model_counts, strict=True):
+            placements.append((tokenizer[:tokenizer_count], model[:model_count]))
+            tokenizer, model = tokenizer[tokenizer_count:], model[model_count:]
+        return placements
+
+    def _create_pools(
+        self, config: Config, placements: tuple[list, list] = ([], [])
+    ) -> tuple[TokenizerPool, ModelPool]:
+        tokenizer_model = config.tokenizer_pool.model_name
+        if not tokenizer_model and config.model_pool.instances:
+            tokenizer_model = config.model_pool.instances[0].name
+
+        tokenizer_max_length = 512
+        if config.model_pool.instances:
+            tokenizer_max_length = min(inst.max_length for inst in config.model_pool.instances)
+
+        tokenizer_pool = TokenizerPool(
+            model_name=tokenizer_model,
+            num_workers=config.tokenizer_pool.num_workers,
+            max_length=tokenizer_max_length,
+            tokenizers_parallelism=config.tokenizer_pool.tokenizers_parallelism,
+            shared_memory=config.tokenizer_pool.shared_memory,
+            shm_num_slots=config.tokenizer_pool.shm_num_slots,
+            shm_slot_tokens=config.tokenizer_pool.shm_slot_tokens,
+            doc_cache_size=config.tokenizer_pool.doc_cache_size,
+            queue_size=config.admission.tokenizer_queue_size,
+            placements=placements[0],
+            supervise_interval_s=config.tokenizer_pool.supervise_interval_s,
+            max_request_retries=config.tokenizer_pool.max_request_retries,
+        )
+        pool = ModelPool(
+            config.model_pool,
+            worker_queue_size=config.admission.worker_queue_size,
+            placements=placements[1],
+        )
+        return tokenizer_pool, pool
+
+    def _create_pipeline(
+        self, config: Config, tokenizer_pool: TokenizerPool, pool: ModelPool
+    ) -> QueueBasedPipeline:
+        tokenizer_pool.set_metrics(self.metrics)
+        pool.set_metrics(self.metrics)
+        pipeline = QueueBasedPipeline(
+            config=config,
+            tokenizer_pool=tokenizer_pool,
+            model_pool=pool,
             metrics_service=self.metrics,
             experiment_name=self.experiment_name,
         )
-        self.pipeline.setup()
-        logger.info("Orchestrator setup complete")
+        pipeline.setup()
+        return pipeline
+
+    def _cascade_stage_config(self) -> Config:
+        cascade = self.config.cascade
+        return self.config.model_copy(
+            update={
+                "model_pool": self.config.model_pool.model_copy(
+                    update={"instances": cascade.instances}
+                ),
+                "tokenizer_pool": self.config.tokenizer_pool.model_copy(
+                    update={"model_name": "", "num_workers": cascade.tokenizer_workers}
+                ),
+            }
+        )
 
     def start(self) -> None:
+        if self.cascade_pipeline:
+            self.cascade_pipeline.start()
         if self.pipeline:
             self.pipeline.start()
+        if self.autoscaler:
+            self.autoscaler.start()
 
     def stop(self) -> None:
         self.shutdown_event.set()
+        if self.autoscaler:
+            self.autoscaler.stop()
         if self.pipeline:
             self.pipeline.stop()
+        if self.cascade_pipeline:
+            self.cascade_pipeline.stop()
+
+    def schedule(
+        self,
+        pairs: list[tuple[str, str]],
+        deadline_ms: float | None = None,
+        cancel_event: threading.Event | None = None,
+        priority: str | None = None,
+    ) -> InferenceResult:
+        if not self.pipeline:
+            raise RuntimeError("Pipeline not initialized")
+        if not self._cascade_applies(pairs):
+            return self._score(pairs, deadline_ms, cancel_event, priority)
 
-    def schedule(self, pairs: list[tuple[str, str]]) -> InferenceResult:
+        start = time.perf_counter()
+        first = self.cascade_pipeline.schedule(
+            pairs, deadline_ms=deadline_ms, cancel_event=cancel_event, priority=priority
+        )
+        keep, stage1_end = self._cascade_keep(pairs, first, start)
+        second = None
+        if keep:
+            second = self._score(
+                [pairs[i] for i in keep], _remaining_ms(deadline_ms, start), cancel_event, priority
+            )
+        return self._cascade_result(first, keep, second, start, stage1_end)
+
+    async def schedule_async(
+        self,
+        pairs: list[tuple[str, str]],
+        deadline_ms: float | None = None,
+        cancel_event: threading.Event | None = None,
+        priority: str | None = None,
+    ) -> InferenceResult:
         if not self.pipeline:
             raise RuntimeError("Pipeline not initialized")
-        return self.pipeline.schedule(pairs)
+        if not self._cascade_applies(pairs):
+            return await self._score_async(pairs, deadline_ms, cancel_event, priority)
+
+        start = time.perf_counter()
+        first = await self.cascade_pipeline.schedule_async(
+            pairs, deadline_ms=deadline_ms, cancel_event=cancel_event, priority=priority
+        )
+        keep, stage1_end = self._cascade_keep(pairs, first, start)
+        second = None
+        if keep:
+            second = await self._score_async(
+                [pairs[i] for i in keep], _remaining_ms(deadline_ms, start), cancel_event, priority
+            )
+        return self._cascade_result(first, keep, second, start, stage1_end)
+
+    def schedule_tokens(
+        self,
+        tokens: TokenIdBatch,
+        deadline_ms: float | None = None,
+        cancel_event: threading.Event | None = None,
+        priority: str | None = None,
+    ) -> InferenceResult:
+        if not self.pipeline:
+            raise RuntimeError("Pipeline not initialized")
+        return self.pipeline.schedule_tokens(
+            tokens, deadline_ms=deadline_ms, cancel_event=cancel_event, priority=priority
+        )
+
+    async def schedule_tokens_async(
+        self,
+        tokens: TokenIdBatch,
+        deadline_ms: float | None = None,
+        cancel_event: threading.Event | None = None,
+        priority: str | None = None,
+    ) -> InferenceResult:
+        if not self.pipeline:
+            raise RuntimeError("Pipeline not initialized")
+        return await self.pipeline.schedule_tokens_async(
+            tokens, deadline_ms=deadline_ms, cancel_event=cancel_event, priority=priority
+        )
+
+    def _score(
+        self,
+        pairs: list[tuple[str, str]],
+        deadline_ms: float | None,
+        cancel_event: threading.Event | None,
+        priority: str | None = None,
+    ) -> InferenceResult:
+        if self.score_cache is None:
+            return self.pipeline.schedule(
+                pairs, deadline_ms=deadline_ms, cancel_event=cancel_event, priority=priority
+            )
+
+        start = time.perf_counter()
+        keys, cached, miss_slots, miss_pairs = self._cache_lookup(pairs)
+        if not miss_pairs:
+            return self._cache_hit_result(cached, start)
+        result = self.pipeline.schedule(
+            miss_pairs, deadline_ms=deadline_ms, cancel_event=cancel_event, priority=priority
+        )
+        return self._merge_cache_misses(keys, cached, miss_slots, result)
+
+    async def _score_async(
+        self,
+        pairs: list[tuple[str, str]],
+        deadline_ms: float | None,
+        cancel_event: threading.Event | None,
+        priority: str | None = None,
+    ) -> InferenceResult:
+        if self.score_cache is None:
+            return await self.pipeline.schedule_async(
+                pairs, deadline_ms=deadline_ms, cancel_event=cancel_event, priority=priority
+            )
+
+        start = time.perf_counter()
+        keys, cached, miss_slots, miss_pairs = self._cache_lookup(pairs)
+        if not miss_pairs:
+            return self._cache_hit_result(cached, start)
+        result = await self.pipeline.schedule_async(
+            miss_pairs, deadline_ms=deadline_ms, cancel_event=cancel_event, priority=priority
+        )
+        return self._merge_cache_misses(keys, cached, miss_slots, result)
+
+    def _cascade_applies(self, pairs: list[tuple[str, str]]) -> bool:
+        if self.cascade_pipeline is None:
+            return False
+        cascade = self.config.cascade
+        return cascade_filters(pairs, cascade.top_k, cascade.threshold)
+
+    def _cascade_keep(
+        self, pairs: list[tuple[str, str]], first: InferenceResult, start: float
+    ) -> tuple[list[int], float]:
+        stage1_end = time.perf_counter()
+        self.metrics.record_cascade_stage("stage1", len(pairs), stage1_end - start)
+        cascade = self.config.cascade
+        return select_candidates(pairs, first.scores, cascade.top_k, cascade.threshold), stage1_end
+
+    def _cascade_result(
+        self,
+        first: InferenceResult,
+        keep: list[int],
+        second: InferenceResult | None,
+        start: float,
+        stage1_end: float,
+    ) -> InferenceResult:
+        now = time.perf_counter()
+        self.metrics.record_cascade_stage("stage2", len(keep), now - stage1_end)
+
+        result = second if second is not None else first
+        result.scores = merge_cascade_scores(
+            first.scores, keep, second.scores if second is not None else []
+        )
+        result.batch_size = len(first.scores)
+        result.total_ms = (now - start) * 1000
+        return result
+
+    def _cache_lookup(
+        self, pairs: list[tuple[str, str]]
+    ) -> tuple[list[bytes], list[float | None], dict[bytes, int], list[tuple[str, str]]]:
+        keys = [self.score_cache.key(pair) for pair in pairs]
+        cached = self.score_cache.get_many(keys)
+
+        miss_slots: dict[bytes, int] = {}
+        miss_pairs: list[tuple[str, str]] = []
+        for key, pair, score in zip(keys, pairs, cached, strict=True):
+            if score is None and key not in miss_slots:
+                miss_slots[key] = len(miss_pairs)
+                miss_pairs.append(pair)
+        return keys, cached, miss_slots, miss_pairs
+
+    def _cache_hit_result(self, cached: list[float | None], start: float) -> InferenceResult:
+        return InferenceResult(
+            scores=np.asarray(cached, dtype=np.float32),
+            total_ms=(time.perf_counter() - start) * 1000,
+            batch_size=len(cached),
+        )
+
+    def _merge_cache_misses(
+        self,
+        keys: list[bytes],
+        cached: list[float | None],
+        miss_slots: dict[bytes, int],
+        result: InferenceResult,
+    ) -> InferenceResult:
+        miss_scores = np.asarray(result.scores, dtype=np.float32)
+        self.score_cache.put_many(list(miss_slots), miss_scores.tolist())
+
+        result.scores = np.asarray(
+            [
+                miss_scores[miss_slots[key]] if score is None else score
+                for key, score in zip(keys, cached, strict=True)
+            ],
+            dtype=np.float32,
+        )
+        # Token and padding counts describe the scored misses; cache hits cost no tokens.
+        result.batch_size = len(keys)
+        return result
 
     def get_metrics(self) -> MetricsService:
         if self.metrics is None:
@@ -1,4 +1,6 @@
+from src.server.utils.batching import TokenBudget, estimate_pair_tokens
 from src.server.utils.config_loader import get_experiment_name, hydra_config_to_config, load_config
+from src.server.utils.shared_memory import SharedTensorSlab
 from src.server.utils.sweep import expand_sweep_config, get_sweep_name
 from src.server.utils.tokenizer import TokenizerService
 
@@ -9,4 +11,7 @@ __all__ = [
     "expand_sweep_config",
     "get_sweep_name",
     "TokenizerService",
+    "SharedTensorSlab",
+    "TokenBudget",
+    "estimate_pair_tokens",
 ]
@@ -0,0 +1,75 @@
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class OverloadedError(RuntimeError):
+    def __init__(self, message: str, reason: str = "queue_full"):
+        super().__init__(message)
+        self.reason = reason
+
+
+class RequestExpiredError(RuntimeError):
+    pass
+
+
+class WorkerCrashedError(RuntimeError):
+    pass
+
+
+class InvalidRequestError(ValueError):
+    pass
+
+
+class AdmissionController:
+    def __init__(self, max_queue_delay_ms: float, parallelism: int = 1, alpha: float = 0.2):
+        self.max_queue_delay_ms = max_queue_delay_ms
+        self.parallelism = max(1, parallelism)
+        self.alpha = alpha
+        self._in_flight_pairs = 0
+        self._ms_per_pair = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight_pairs(self) -> int:
+        return self._in_flight_pairs
+
+    def estimated_delay_ms(self, num_pairs: int = 0) -> float:
+        return (self._in_flight_pairs + num_pairs) * self._ms_per_pair / self.parallelism
+
+    def admit(self, num_pairs: int, deadline_ms: float | None = None) -> None:
+        budget_ms = self.max_queue_delay_ms
+        if deadline_ms is not None:
+            budget_ms = min(budget_ms, deadline_ms)
+
+        with self._lock:
+            estimate_ms = self.estimated_delay_ms(num_pairs)
+            if self._in_flight_pairs > 0 and estimate_ms > budget_ms:
+                raise OverloadedError(
+                    f"Estimated delay {estimate_ms:.0f}ms exceeds budget {budget_ms:.0f}ms",
+                    reason="deadline",
+                )
+            self._in_flight_pairs += num_pairs
+
+    def release(self, num_pairs: int, service_ms: float = 0.0, batch_size: int = 0) -> None:
+        with self._lock:
+            self._in_flight_pairs = max(0, self._in_flight_pairs - num_pairs)
+            if service_ms > 0 and batch_size > 0:
+                sample = service_ms / batch_size
+                if self._ms_per_pair == 0.0:
+                    self._ms_per_pair = sample
+                else:
+                    self._ms_per_pair += self.alpha * (sample - self._ms_per_pair)
+
+    def get_info(self) -> dict:
+        with self._lock:
+            return {
+                "in_flight_pairs": self._in_flight_pairs,
+                "ms_per_pair": self._ms_per_pair,
+                "estimated_delay_ms": self.estimated_delay_ms(),
+                "max_queue_delay_ms": self.max_queue_delay_ms,
+            }
+
+
+__all__ = ["AdmissionController", "OverloadedError", "RequestExpiredError"]
@@ -0,0 +1,201 @@
+import threading
+from bisect import bisect_left
+from collections import deque
+from typing import Any
+
+import numpy as np
+
+CHARS_PER_TOKEN = 4
+SPECIAL_TOKENS_PER_PAIR = 3
+
+_ADAPT_MIN_SAMPLES = 16
+_ADAPT_SMOOTHING = 0.2
+_ADAPT_BACKOFF = 0.7
+_ADAPT_GAIN = 0.5
+_ADAPT_HEADROOM = 0.8
+
+
+def estimate_pair_tokens(pair: tuple[str, str], max_length: int) -> int:
+    estimated = (len(pair[0]) + len(pair[1])) // CHARS_PER_TOKEN + SPECIAL_TOKENS_PER_PAIR
+    return min(estimated, max_length)
+
+
+def estimate_max_seq(pairs: list[tuple[str, str]], max_length: int) -> int:
+    return max((estimate_pair_tokens(pair, max_length) for pair in pairs), default=0)
+
+
+class TokenBudget:
+    def __init__(self, max_tokens: int, max_length: int):
+        self.max_tokens = max_tokens
+        self.max_length = max_length
+        self.num_pairs = 0
+        self.max_seq = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_tokens > 0
+
+    @property
+    def padded_tokens(self) -> int:
+        return self.num_pairs * self.max_seq
+
+    def reset(self) -> None:
+        self.num_pairs = 0
+        self.max_seq = 0
+
+    def fits(self, pairs: list[tuple[str, str]]) -> bool:
+        if not self.enabled or self.num_pairs == 0:
+            return True
+        max_seq = max(self.max_seq, estimate_max_seq(pairs, self.max_length))
+        return (self.num_pairs + len(pairs)) * max_seq <= self.max_tokens
+
+    def add(self, pairs: list[tuple[str, str]]) -> None:
+        self.num_pairs += len(pairs)
+        self.max_seq = max(self.max_seq, estimate_max_seq(pairs, self.max_length))
+
+    @property
+    def exhausted(self) -> bool:
+        return self.enabled and self.padded_tokens >= self.max_tokens
+
+
+class LengthBuckets:
+    def __init__(self, boundaries: list[int], timeouts_ms: list[float], max_length: int):
+        if len(timeouts_ms) != len(boundaries):
+            raise ValueError(f"Expected {len(boundaries)} bucket timeouts, got {len(timeouts_ms)}")
+        order = sorted(range(len(boundaries)), key=lambda i: boundaries[i])
+        self.boundaries = [boundaries[i] for i in order]
+        self.timeouts = [timeouts_ms[i] / 1000.0 for i in order]
+        self.max_length = max_length
+        self._queues: list[deque[tuple[float, Any]]] = [deque() for _ in self.boundaries]
+
+    def __len__(self) -> int:
+        return sum(len(q) for q in self._queues)
+
+    def bucket_index(self, pairs: list[tuple[str, str]]) -> int:
+        index = bisect_left(self.boundaries, estimate_max_seq(pairs, self.max_length))
+        return min(index, len(self.boundaries) - 1)
+
+    def put(self, item: Any, now: float) -> int:
+        index = self.bucket_index(item.pairs)
+        self._queues[index].append((now, item))
+        return index
+
+    def pending(self) -> list[int]:
+        return [len(q) for q in self._queues]
+
+    def next_due(self) -> float | None:
+        due = [
+            q[0][0] + timeout for q, timeout in zip(self._queues, self.timeouts, strict=True) if q
+        ]
+        return min(due, default=None)
+
+    def _fill(self, index: int, max_items: int, budget: TokenBudget) -> tuple[int, bool]:
+        budget.reset()
+        taken = 0
+        for _, item in self._queues[index]:
+            if taken >= max_items or not budget.fits(item.pairs):
+                return taken, True
+            budget.add(item.pairs)
+            taken += 1
+        return taken, taken >= max_items or budget.exhausted
+
+    def pop_ready(self, now: float, max_items: int, budget: TokenBudget) -> list[Any]:
+        for index, q in enumerate(self._queues):
+            if not q:
+                continue
+            taken, full = self._fill(index, max_items, budget)
+            if full or now >= q[0][0] + self.timeouts[index]:
+                return [q.popleft()[1] for _ in range(taken)]
+        return []
+
+    def drain(self) -> list[Any]:
+        items = [item for q in self._queues for _, item in q]
+        for q in self._queues:
+            q.clear()
+        return items
+
+
+class AdaptiveBatchTimeout:
+    def __init__(
+        self,
+        initial_ms: float,
+        target_p99_ms: float,
+        min_ms: float,
+        max_ms: float,
+        max_batch_size: int,
+        window: int = 256,
+        adjust_interval_s: float = 0.5,
+    ):
+        self.target_p99_ms = target_p99_ms
+        self.min_ms = min_ms
+        self.max_ms = max(max_ms, min_ms)
+        self.max_batch_size = max_batch_size
+        self.adjust_interval_s = adjust_interval_s
+        self._timeout_ms = self._clamp(initial_ms)
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._interarrival_s: float | None = None
+        self._last_arrival: float | None = None
+        self._step_ms: float | None = None
+        self._last_adjust = float("-inf")
+        self._lock = threading.Lock()
+
+    @property
+    def timeout_ms(self) -> float:
+        return self._timeout_ms
+
+    @property
+    def arrival_rate(self) -> float:
+        if not self._interarrival_s:
+            return 0.0
+        return 1.0 / self._interarrival_s
+
+    def _clamp(self, timeout_ms: float) -> float:
+        return min(max(timeout_ms, self.min_ms), self.max_ms)
+
+    def _smooth(self, current: float | None, sample: float) -> float:
+        return sample if current is None else current + _ADAPT_SMOOTHING * (sample - current)
+
+    def record_arrival(self, now: float) -> None:
+        with self._lock:
+            if self._last_arrival is not None:
+                gap = max(now - self._last_arrival, 0.0)
+                self._interarrival_s = self._smooth(self._interarrival_s, gap)
+            self._last_arrival = now
+
+    def ceiling_ms(self) -> float:
+        rate = self.arrival_rate
+        fill_ms = (self.max_batch_size - 1) / rate * 1000 if rate > 0 else self.max_ms
+        slo_ms = self.target_p99_ms - (self._step_ms or 0.0)
+        return self._clamp(min(fill_ms, slo_ms))
+
+    def record_batch(self, step_ms: float, latencies_ms: list[float], now: float) -> float:
+        with self._lock:
+            self._step_ms = self._smooth(self._step_ms, step_ms)
+            self._latencies.extend(latencies_ms)
+            if (
+                now - self._last_adjust >= self.adjust_interval_s
+                and len(self._latencies) >= _ADAPT_MIN_SAMPLES
+            ):
+                self._adjust()
+                self._last_adjust = now
+            return self._timeout_ms
+
+    def _adjust(self) -> None:
+        p99 = float(np.percentile(self._latencies, 99))
+        ceiling = self.ceiling_ms()
+        timeout = self._timeout_ms
+        if p99 > self.target_p99_ms:
+            timeout *= _ADAPT_BACKOFF
+        elif p99 < self.target_p99_ms * _ADAPT_HEADROOM:
+            timeout += (ceiling - timeout) * _ADAPT_GAIN
+        self._timeout_ms = self._clamp(min(timeout, ceiling))
+        self._latencies.clear()
+
+
+__all__ = [
+    "AdaptiveBatchTimeout",
+    "LengthBuckets",
+    "TokenBudget",
+    "estimate_max_seq",
+    "estimate_pair_tokens",
+]
@@ -0,0 +1,40 @@
+import numpy as np
+
+FILTERED_SCORE_OFFSET = 1.0
+
+
+def _query_groups(pairs: list[tuple[str, str]]) -> list[list[int]]:
+    groups: dict[str, list[int]] = {}
+    for index, (query, _) in enumerate(pairs):
+        groups.setdefault(query, []).append(index)
+    return list(groups.values())
+
+
+def cascade_filters(pairs: list[tuple[str, str]], top_k: int, threshold: float | None) -> bool:
+    if threshold is not None:
+        return True
+    return top_k > 0 and any(len(group) > top_k for group in _query_groups(pairs))
+
+
+def select_candidates(
+    pairs: list[tuple[str, str]], scores: np.ndarray, top_k: int, threshold: float | None
+) -> list[int]:
+    keep = []
+    for group in _query_groups(pairs):
+        if threshold is not None:
+            group = [i for i in group if scores[i] >= threshold]
+        if top_k > 0 and len(group) > top_k:
+            group = sorted(group, key=lambda i: scores[i], reverse=True)[:top_k]
+        keep.extend(group)
+    return sorted(keep)
+
+
+def merge_cascade_scores(
+    stage1_scores: np.ndarray, keep: list[int], stage2_scores: np.ndarray
+) -> np.ndarray:
+    scores = np.asarray(stage1_scores, dtype=np.float32) - FILTERED_SCORE_OFFSET
+    scores[keep] = stage2_scores
+    return scores
+
+
+__all__ = ["cascade_filters", "select_candidates", "merge_cascade_scores", "FILTERED_SCORE_OFFSET"]
@@ -5,11 +5,16 @@ import yaml
 from omegaconf import DictConfig, OmegaConf
 
 from src.server.dto.config import (
+    AdmissionConfig,
+    AutoscaleConfig,
     BatchConfig,
+    CacheConfig,
+    CascadeConfig,
     Config,
     ModelConfig,
     PipelineConfig,
     PoolConfig,
+    PriorityConfig,
     ServerConfig,
     TokenizerPoolConfig,
 )
@@ -27,6 +32,60 @@ def _deep_merge(base: dict, override: dict) -> dict:
     return result
 
 
+def _model_config(m: dict) -> ModelConfig:
+    return ModelConfig(
+        name=m.get("name", "cross-encoder/ms-marco-MiniLM-L-6-v2"),
+        device=m.get("device", "mps"),
+        backend=m.get("backend", "mps"),
+        quantization=m.get("quantization", "fp16"),
+        compile_model=m.get("compile_model", False),
+        compile_mode=m.get("compile_mode", None),
+        max_length=m.get("max_length", 512),
+        packed=m.get("packed", False),
+        early_exit_heads=m.get("early_exit_heads", ""),
+        early_exit_confidence=m.get("early_exit_confidence"),
+        onnx_optimize=m.get("onnx_optimize", True),
+    )
+
+
+def _cascade_config(c: dict) -> CascadeConfig:
+    return CascadeConfig(
+        enabled=c.get("enabled", False),
+        instances=[_model_config(m) for m in c.get("instances") or []],
+        top_k=c.get("top_k", 0),
+        threshold=c.get("threshold"),
+        tokenizer_workers=c.get("tokenizer_workers", 1),
+    )
+
+
+def _autoscale_config(a: dict) -> AutoscaleConfig:
+    return AutoscaleConfig(
+        enabled=a.get("enabled", False),
+        interval_s=float(a.get("interval_s", 2.0)),
+        tokenizer_min_workers=a.get("tokenizer_min_workers", 1),
+        tokenizer_max_workers=a.get("tokenizer_max_workers", 4),
+        model_min_workers=a.get("model_min_workers", 1),
+        model_max_workers=a.get("model_max_workers", 4),
+        max_total_workers=a.get("max_total_workers", 0),
+        scale_up_queue_depth=float(a.get("scale_up_queue_depth", 4.0)),
+        scale_down_queue_depth=float(a.get("scale_down_queue_depth", 0.5)),
+        scale_up_wait_ms=float(a.get("scale_up_wait_ms", 50.0)),
+        scale_down_wait_ms=float(a.get("scale_down_wait_ms", 5.0)),
+        sustain_intervals=a.get("sustain_intervals", 3),
+        cooldown_s=float(a.get("cooldown_s", 10.0)),
+    )
+
+
+def _priority_config(p: dict) -> PriorityConfig:
+    defaults = PriorityConfig()
+    aging_ms = p.get("aging_ms", defaults.aging_ms)
+    return PriorityConfig(
+        enabled=p.get("enabled", False),
+        default_class=p.get("default_class", "interactive"),
+        aging_ms={name: float(ms) for name, ms in aging_ms.items()},
+    )
+
+
 def _parse_model_instances(data: dict) -> list[ModelConfig]:
     instances = []
 
@@ -42,6 +101,9 @@ def _parse_model_instances(data: dict) -> list[ModelConfig]:
                     ),
                     compile_model=m.get("compile", False),
                     max_length=m.get("max_length", 512),
+                    packed=m.get("packed", False),
+                    early_exit_heads=m.get("early_exit_heads", ""),
+                    early_exit_confidence=m.get("early_exit_confidence"),
                 )
             )
     elif "models" in data:
@@ -54,6 +116,9 @@ def _parse_model_instances(data: dict) -> list[ModelConfig]:
                     quantization=m.get("quantization", "fp16"),
                     compile_model=m.get("compile", False),
                     max_length=m.get("max_length", 512),
+                    packed=m.get("packed", False),
+                    early_exit_heads=m.get("early_exit_heads", ""),
+                    early_exit_confidence=m.get("early_exit_confidence"),
                 )
             )
     elif "model" in data:
@@ -66,6 +131,9 @@ def _parse_model_instances(data: dict) -> list[ModelConfig]:
                 quantization=m.get("quantization", "fp16"),
                 compile_model=m.get("compile", False),
                 max_length=m.get("max_length", 512),
+                packed=m.get("packed", False),
+                early_exit_heads=m.get("early_exit_heads", ""),
+                early_exit_confidence=m.get("early_exit_confidence"),
             )
         )
     else:
@@ -84,6 +152,13 @@ def _parse_batching_config(data: dict) -> BatchConfig:
         max_batch_size=b.get("max_batch_size", 8),
         timeout_ms=b.get("timeout_ms", 100),
         length_aware=b.get("length_aware", False),
+        max_tokens_per_batch=b.get("max_tokens_per_batch", 0),
+        bucket_boundaries=b.get("bucket_boundaries", []),
+        bucket_timeouts_ms=b.get("bucket_timeouts_ms", []),
+        adaptive_timeout=b.get("adaptive_timeout", False),
+        target_p99_ms=float(b.get("target_p99_ms", 200.0)),
+        min_timeout_ms=float(b.get("min_timeout_ms", 1.0)),
+        max_timeout_ms=float(b.get("max_timeout_ms", 200.0)),
     )
 
 
@@ -97,6 +172,13 @@ def _parse_tokenizer_pool_config(data: dict) -> TokenizerPoolConfig:
         num_workers=tp.get("num_workers", 1),
         model_name=tp.get("model_name", ""),
         tokenizers_parallelism=tp.get("tokenizers_parallelism", False),
+        shared_memory=tp.get("shared_memory", False),
+        shm_num_slots=tp.get("shm_num_slots", 32),
+        shm_slot_tokens=tp.get("shm_slot_tokens", 128 * 512),
+        doc_cache_size=tp.get("doc_cache_size", 0),
+        cores_per_worker=tp.get("cores_per_worker", 1),
+        supervise_interval_s=tp.get("supervise_interval_s", 1.0),
+        max_request_retries=tp.get("max_request_retries", 1),
     )
 
 
@@ -111,6 +193,51 @@ def _parse_pipeline_config(data: dict) -> PipelineConfig:
     )
 
 
+def _parse_cache_config(data: dict) -> CacheConfig:
+    if "cache" not in data:
+        return CacheConfig()
+
+    c = data["cache"]
+    return CacheConfig(
+        enabled=c.get("enabled", False),
+        max_entries=c.get("max_entries", 100_000),
+        ttl_seconds=c.get("ttl_seconds", 300.0),
+    )
+
+
+def _parse_admission_config(data: dict) -> AdmissionConfig:
+    if "admission" not in data:
+        return AdmissionConfig()
+
+    a = data["admission"]
+    return AdmissionConfig(
+        enabled=a.get("enabled", False),
+        max_queue_delay_ms=a.get("max_queue_delay_ms", 1000.0),
+        batch_queue_size=a.get("batch_queue_size", 0),
+        tokenizer_queue_size=a.get("tokenizer_queue_size", 0),
+        inference_queue_size=a.get("inference_queue_size", 0),
+        worker_queue_size=a.get("worker_queue_size", 0),
+    )
+
+
+def _parse_cascade_config(data: dict) -> CascadeConfig:
+    if "cascade" not in data:
+        return CascadeConfig()
+    return _cascade_config(data["cascade"])
+
+
+def _parse_autoscale_config(data: dict) -> AutoscaleConfig:
+    if "autoscale" not in data:
+        return AutoscaleConfig()
+    return _autoscale_config(data["autoscale"])
+
+
+def _parse_priority_config(data: dict) -> PriorityConfig:
+    if "priority" not in data:
+        return PriorityConfig()
+    return _priority_config(data["priority"])
+
+
 def _parse_server_config(data: dict) -> ServerConfig:
     if "server" not in data:
         return ServerConfig()
@@ -122,6 +249,8 @@ def _parse_server_config(data: dict) -> ServerConfig:
         http_port=s.get("http_port", 8080),
         prometheus_port=s.get("prometheus_port", 8000),
         grpc_workers=s.get("grpc_workers", 10),
+        grpc_mode=s.get("grpc_mode", "threaded"),
+        stream_window=s.get("stream_window", 8),
     )
 
 
@@ -145,13 +274,31 @@ def load_config(config_path: str) -> Config:
     batching = _parse_batching_config(data)
     tokenizer_pool = _parse_tokenizer_pool_config(data)
     pipeline = _parse_pipeline_config(data)
+    cache = _parse_cache_config(data)
+    admission = _parse_admission_config(data)
+    cascade = _parse_cascade_config(data)
+    autoscale = _parse_autoscale_config(data)
+    priority = _parse_priority_config(data)
     server = _parse_server_config(data)
 
     return Config(
-        model_pool=PoolConfig(instances=instances),
+        model_pool=PoolConfig(
+            instances=instances,
+            routing_strategy=data.get("model_pool", {}).get("routing_strategy", "round_robin"),
+            merge_max_tokens=data.get("model_pool", {}).get("merge_max_tokens", 0),
+            fork_server=data.get("model_pool", {}).get("fork_server", False),
+            pin_cpus=data.get("model_pool", {}).get("pin_cpus", False),
+            supervise_interval_s=data.get("model_pool", {}).get("supervise_interval_s", 1.0),
+            max_request_retries=data.get("model_pool", {}).get("max_request_retries", 1),
+        ),
         tokenizer_pool=tokenizer_pool,
         batching=batching,
         pipeline=pipeline,
+        cache=cache,
+        admission=admission,
+        cascade=cascade,
+        autoscale=autoscale,
+        priority=priority,
         server=server,
         name=data.get("name", ""),
         description=data.get("description", ""),
@@ -164,18 +311,7 @@ def hydra_config_to_config(cfg: DictConfig) -> Config:
     instances = []
     if "model_pool" in cfg_dict and "instances" in cfg_dict["model_pool"]:
         for m in cfg_dict["model_pool"]["instances"]:
-            instances.append(
-                ModelConfig(
-                    name=m.get("name", "cross-encoder/ms-marco-MiniLM-L-6-v2"),
-                    device=m.get("device", "mps"),
-                    backend=m.get("backend", "mps"),
-                    quantization=m.get("quantization", "fp16"),
-                    compile_model=m.get("compile_model", False),
-                    compile_mode=m.get("compile_mode", None),
-                    max_length=m.get("max_length", 512),
-                    onnx_optimize=m.get("onnx_optimize", True),
-                )
-            )
+            instances.append(_model_config(m))
     else:
         instances.append(ModelConfig(name="cross-encoder/ms-marco-MiniLM-L-6-v2"))
 
@@ -186,6 +322,13 @@ def hydra_config_to_config(cfg: DictConfig) -> Config:
         tokenizers_parallelism=cfg_dict.get("tokenizer_pool", {}).get(
             "tokenizers_parallelism", False
         ),
+        shared_memory=cfg_dict.get("tokenizer_pool", {}).get("shared_memory", False),
+        shm_num_slots=cfg_dict.get("tokenizer_pool", {}).get("shm_num_slots", 32),
+        shm_slot_tokens=cfg_dict.get("tokenizer_pool", {}).get("shm_slot_tokens", 128 * 512),
+        doc_cache_size=cfg_dict.get("tokenizer_pool", {}).get("doc_cache_size", 0),
+        cores_per_worker=cfg_dict.get("tokenizer_pool", {}).get("cores_per_worker", 1),
+        supervise_interval_s=cfg_dict.get("tokenizer_pool", {}).get("supervise_interval_s", 1.0),
+        max_request_retries=cfg_dict.get("tokenizer_pool", {}).get("max_request_retries", 1),
     )
 
     pipeline = PipelineConfig(
@@ -198,21 +341,62 @@ def hydra_config_to_config(cfg: DictConfig) -> Config:
         max_batch_size=cfg_dict.get("batching", {}).get("max_batch_size", 8),
         timeout_ms=float(cfg_dict.get("batching", {}).get("timeout_ms", 100.0)),
         length_aware=cfg_dict.get("batching", {}).get("length_aware", False),
+        max_tokens_per_batch=cfg_dict.get("batching", {}).get("max_tokens_per_batch", 0),
+        bucket_boundaries=cfg_dict.get("batching", {}).get("bucket_boundaries", []),
+        bucket_timeouts_ms=cfg_dict.get("batching", {}).get("bucket_timeouts_ms", []),
+        adaptive_timeout=cfg_dict.get("batching", {}).get("adaptive_timeout", False),
+        target_p99_ms=float(cfg_dict.get("batching", {}).get("target_p99_ms", 200.0)),
+        min_timeout_ms=float(cfg_dict.get("batching", {}).get("min_timeout_ms", 1.0)),
+        max_timeout_ms=float(cfg_dict.get("batching", {}).get("max_timeout_ms", 200.0)),
+    )
+
+    cache = CacheConfig(
+        enabled=cfg_dict.get("cache", {}).get("enabled", False),
+        max_entries=cfg_dict.get("cache", {}).get("max_entries", 100_000),
+        ttl_seconds=float(cfg_dict.get("cache", {}).get("ttl_seconds", 300.0)),
+    )
+
+    admission = AdmissionConfig(
+        enabled=cfg_dict.get("admission", {}).get("enabled", False),
+        max_queue_delay_ms=float(cfg_dict.get("admission", {}).get("max_queue_delay_ms", 1000.0)),
+        batch_queue_size=cfg_dict.get("admission", {}).get("batch_queue_size", 0),
+        tokenizer_queue_size=cfg_dict.get("admission", {}).get("tokenizer_queue_size", 0),
+        inference_queue_size=cfg_dict.get("admission", {}).get("inference_queue_size", 0),
+        worker_queue_size=cfg_dict.get("admission", {}).get("worker_queue_size", 0),
     )
 
+    cascade = _cascade_config(cfg_dict.get("cascade", {}))
+    autoscale = _autoscale_config(cfg_dict.get("autoscale", {}))
+    priority = _priority_config(cfg_dict.get("priority", {}))
+
     server = ServerConfig(
         host=cfg_dict.get("server", {}).get("host", "0.0.0.0"),
         grpc_port=cfg_dict.get("server", {}).get("grpc_port", 50051),
         http_port=cfg_dict.get("server", {}).get("http_port", 8080),
         prometheus_port=cfg_dict.get("server", {}).get("prometheus_port", 8000),
         grpc_workers=cfg_dict.get("server", {}).get("grpc_workers", 10),
+        grpc_mode=cfg_dict.get("server", {}).get("grpc_mode", "threaded"),
+        stream_window=cfg_dict.get("server", {}).get("stream_window", 8),
     )
 
     return Config(
-        model_pool=PoolConfig(instances=instances),
+        model_pool=PoolConfig(
+            instances=instances,
+            routing_strategy=cfg_dict.get("model_pool", {}).get("routing_strategy", "round_robin"),
+            merge_max_tokens=cfg_dict.get("model_pool", {}).get("merge_max_tokens", 0),
+            fork_server=cfg_dict.get("model_pool", {}).get("fork_server", False),
+            pin_cpus=cfg_dict.get("model_pool", {}).get("pin_cpus", False),
+            supervise_interval_s=cfg_dict.get("model_pool", {}).get("supervise_interval_s", 1.0),
+            max_request_retries=cfg_dict.get("model_pool", {}).get("max_request_retries", 1),
+        ),
         tokenizer_pool=tokenizer_pool,
         batching=batching,
         pipeline=pipeline,
+        cache=cache,
+        admission=admission,
+        cascade=cascade,
+        autoscale=autoscale,
+        priority=priority,
         server=server,
         name=cfg_dict.get("name", ""),
         description=cfg_dict.get("description", ""),
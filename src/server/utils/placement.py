@@ -0,0 +1,146 @@
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_NODE_ROOT = Path("/sys/devices/system/node")
+
+Topology = list[tuple[int | None, list[int]]]
+
+
+@dataclass(frozen=True)
+class WorkerPlacement:
+    cores: tuple[int, ...]
+    numa_node: int | None = None
+
+    @property
+    def num_threads(self) -> int:
+        return len(self.cores)
+
+    def to_dict(self) -> dict:
+        return {"cores": list(self.cores), "numa_node": self.numa_node}
+
+
+def parse_cpulist(text: str) -> list[int]:
+    cpus = []
+    for part in text.strip().split(","):
+        if not part:
+            continue
+        start, _, end = part.partition("-")
+        cpus.extend(range(int(start), int(end or start) + 1))
+    return cpus
+
+
+def detect_topology(node_root: Path = _NODE_ROOT) -> Topology:
+    if hasattr(os, "sched_getaffinity"):
+        available = sorted(os.sched_getaffinity(0))
+    else:
+        available = list(range(os.cpu_count() or 1))
+
+    usable = set(available)
+    topology = []
+    node_dirs = sorted(node_root.glob("node[0-9]*"), key=lambda p: int(p.name[4:]))
+    for node_dir in node_dirs:
+        try:
+            cpus = [c for c in parse_cpulist((node_dir / "cpulist").read_text()) if c in usable]
+        except OSError:
+            continue
+        if cpus:
+            topology.append((int(node_dir.name[4:]), cpus))
+    return topology or [(None, available)]
+
+
+def _placement(cpus: list[tuple[int | None, int]]) -> WorkerPlacement:
+    nodes = {node for node, _ in cpus}
+    return WorkerPlacement(
+        cores=tuple(cpu for _, cpu in cpus), numa_node=nodes.pop() if len(nodes) == 1 else None
+    )
+
+
+def _node_shares(sizes: list[int], workers: int) -> list[int]:
+    total = sum(sizes)
+    raw = [workers * size / total for size in sizes]
+    shares = [int(r) for r in raw]
+    by_remainder = sorted(range(len(sizes)), key=lambda i: raw[i] - shares[i], reverse=True)
+    for i in by_remainder[: workers - sum(shares)]:
+        shares[i] += 1
+    return shares
+
+
+def _partition(cpus: list[tuple[int | None, int]], workers: int) -> list[WorkerPlacement]:
+    if workers == 0:
+        return []
+    if len(cpus) < workers:
+        logger.warning(f"{workers} workers share {len(cpus)} cores")
+        return [_placement([cpus[i % len(cpus)]]) for i in range(workers)]
+
+    nodes: dict[int | None, list[tuple[int | None, int]]] = {}
+    for node, cpu in cpus:
+        nodes.setdefault(node, []).append((node, cpu))
+
+    placements = []
+    groups = list(nodes.values())
+    for group, share in zip(groups, _node_shares([len(g) for g in groups], workers), strict=True):
+        placements.extend(
+            _placement(group[i * len(group) // share : (i + 1) * len(group) // share])
+            for i in range(share)
+        )
+    return placements
+
+
+def plan_placement(
+    tokenizer_workers: int,
+    model_workers: int,
+    tokenizer_cores: int = 1,
+    topology: Topology | None = None,
+) -> tuple[list[WorkerPlacement], list[WorkerPlacement]]:
+    topology = topology or detect_topology()
+    cpus = [(node, cpu) for node, node_cpus in topology for cpu in node_cpus]
+
+    reserved = min(tokenizer_workers * tokenizer_cores, max(len(cpus) - model_workers, 0))
+    split = len(cpus) - reserved
+    tokenizer_cpus = cpus[split:] or cpus
+    if reserved >= tokenizer_workers * tokenizer_cores:
+        tokenizer = [
+            _placement(tokenizer_cpus[i * tokenizer_cores : (i + 1) * tokenizer_cores])
+            for i in range(tokenizer_workers)
+        ]
+    else:
+        tokenizer = _partition(tokenizer_cpus, tokenizer_workers)
+    model = _partition(cpus[:split], model_workers)
+
+    logger.info(
+        f"CPU placement over {len(cpus)} cores / {len(topology)} node(s): "
+        f"tokenizers={[list(p.cores) for p in tokenizer]}, models={[list(p.cores) for p in model]}"
+    )
+    return tokenizer, model
+
+
+def apply_placement(placement: WorkerPlacement | None, torch_threads: bool = False) -> None:
+    if placement is None:
+        return
+
+    threads = str(placement.num_threads)
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "RAYON_NUM_THREADS"):
+        os.environ[var] = threads
+    if hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, placement.cores)
+        except OSError as e:
+            logger.warning(f"Could not pin worker to cores {list(placement.cores)}: {e}")
+    if torch_threads:
+        import torch
+
+        torch.set_num_threads(placement.num_threads)
+
+
+__all__ = [
+    "Topology",
+    "WorkerPlacement",
+    "apply_placement",
+    "detect_topology",
+    "parse_cpulist",
+    "plan_placement",
+]
@@ -0,0 +1,100 @@
+import logging
+import time
+from dataclasses import dataclass
+
+import numpy as np
+from transformers import AutoConfig, AutoTokenizer
+
+from src.server.dto.inference import TokenIdBatch, TokenizedBatch
+from src.server.utils.admission import InvalidRequestError
+from src.server.utils.tokenizer import compact_features
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TokenIdSpec:
+    vocab_size: int
+    max_length: int
+    pad_token_id: int
+    sep_token_id: int | None
+    type_vocab_size: int
+    input_names: tuple[str, ...]
+
+
+def load_token_id_spec(model_name: str, max_length: int) -> TokenIdSpec:
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model_config = AutoConfig.from_pretrained(model_name)
+    spec = TokenIdSpec(
+        vocab_size=model_config.vocab_size,
+        max_length=max_length,
+        pad_token_id=tokenizer.pad_token_id or 0,
+        sep_token_id=tokenizer.sep_token_id,
+        type_vocab_size=getattr(model_config, "type_vocab_size", 1),
+        input_names=tuple(tokenizer.model_input_names),
+    )
+    logger.info(
+        f"Pre-tokenized input spec for {model_name}: vocab_size={spec.vocab_size}, "
+        f"max_length={spec.max_length}, inputs={spec.input_names}"
+    )
+    return spec
+
+
+def _validate(tokens: TokenIdBatch, spec: TokenIdSpec) -> None:
+    if len(tokens) == 0:
+        raise InvalidRequestError("Pre-tokenized request has no sequences")
+    if tokens.lengths.min() == 0:
+        raise InvalidRequestError("Pre-tokenized sequences must not be empty")
+    if tokens.lengths.max() > spec.max_length:
+        raise InvalidRequestError(
+            f"Pre-tokenized sequence of {tokens.lengths.max()} tokens exceeds "
+            f"max_length {spec.max_length}"
+        )
+    if tokens.input_ids.min() < 0 or tokens.input_ids.max() >= spec.vocab_size:
+        raise InvalidRequestError(f"Token ids must be in [0, {spec.vocab_size})")
+    if tokens.token_type_ids is not None and tokens.token_type_ids.max() >= spec.type_vocab_size:
+        raise InvalidRequestError(f"Token type ids must be in [0, {spec.type_vocab_size})")
+
+
+def build_tokenized_batch(tokens: TokenIdBatch, spec: TokenIdSpec) -> TokenizedBatch:
+    start = time.perf_counter()
+    _validate(tokens, spec)
+
+    lengths = tokens.lengths.astype(np.int64)
+    batch_size, max_seq = len(lengths), int(lengths.max())
+    mask = np.arange(max_seq) < lengths[:, None]
+
+    input_ids = np.full((batch_size, max_seq), spec.pad_token_id, dtype=np.int32)
+    input_ids[mask] = tokens.input_ids
+    features = {"input_ids": input_ids, "attention_mask": mask}
+
+    if "token_type_ids" in spec.input_names:
+        if tokens.token_type_ids is not None:
+            token_type_ids = np.zeros((batch_size, max_seq), dtype=np.int8)
+            token_type_ids[mask] = tokens.token_type_ids
+        elif spec.sep_token_id is not None:
+            is_sep = input_ids == spec.sep_token_id
+            token_type_ids = (np.cumsum(is_sep, axis=1) - is_sep > 0) & mask
+        else:
+            token_type_ids = np.zeros((batch_size, max_seq), dtype=np.int8)
+        features["token_type_ids"] = token_type_ids
+    features = compact_features(
+        {name: features[name] for name in spec.input_names if name in features}, spec.vocab_size
+    )
+
+    real_tokens = int(lengths.sum())
+    total_tokens = batch_size * max_seq
+    return TokenizedBatch(
+        features=features,
+        batch_size=batch_size,
+        max_seq_length=max_seq,
+        total_tokens=total_tokens,
+        real_tokens=real_tokens,
+        padded_tokens=total_tokens - real_tokens,
+        padding_ratio=(total_tokens - real_tokens) / total_tokens,
+        avg_seq_length=real_tokens / batch_size,
+        tokenize_time_ms=(time.perf_counter() - start) * 1000,
+    )
+
+
+__all__ = ["TokenIdSpec", "build_tokenized_batch", "load_token_id_spec"]
@@ -0,0 +1,101 @@
+import queue
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Generic, TypeVar
+
+PRIORITY_CLASSES = ("interactive", "batch", "best_effort")
+
+T = TypeVar("T")
+
+
+def priority_index(name: str | None, default: str = "interactive") -> int:
+    name = default if name is None else name
+    if name not in PRIORITY_CLASSES:
+        raise ValueError(f"Unknown priority class {name!r}, expected one of {PRIORITY_CLASSES}")
+    return PRIORITY_CLASSES.index(name)
+
+
+class PriorityClassQueue(Generic[T]):
+    def __init__(
+        self,
+        class_of: Callable[[T], int],
+        aging_ms: dict[str, float] | None = None,
+        maxsize: int = 0,
+    ):
+        aging_ms = aging_ms or {}
+        unknown = set(aging_ms) - set(PRIORITY_CLASSES)
+        if unknown:
+            raise ValueError(f"Unknown priority classes in aging_ms: {sorted(unknown)}")
+        self.maxsize = maxsize
+        self._class_of = class_of
+        self._aging_s = [aging_ms.get(name, 0.0) / 1000 for name in PRIORITY_CLASSES]
+        self._queues: list[deque[tuple[float, T]]] = [deque() for _ in PRIORITY_CLASSES]
+        self._size = 0
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+
+    def qsize(self) -> int:
+        return self._size
+
+    def empty(self) -> bool:
+        return self._size == 0
+
+    def full(self) -> bool:
+        return 0 < self.maxsize <= self._size
+
+    def depths(self) -> dict[str, int]:
+        with self._lock:
+            return {name: len(q) for name, q in zip(PRIORITY_CLASSES, self._queues, strict=True)}
+
+    def put(self, item: T, block: bool = True, timeout: float | None = None) -> None:
+        cls = min(max(self._class_of(item), 0), len(PRIORITY_CLASSES) - 1)
+        with self._not_full:
+            if not self._wait(self._not_full, self.full, block, timeout):
+                raise queue.Full
+            self._queues[cls].append((time.perf_counter(), item))
+            self._size += 1
+            self._not_empty.notify()
+
+    def put_nowait(self, item: T) -> None:
+        self.put(item, block=False)
+
+    def get(self, block: bool = True, timeout: float | None = None) -> T:
+        with self._not_empty:
+            if not self._wait(self._not_empty, self.empty, block, timeout):
+                raise queue.Empty
+            item = self._pop_locked(time.perf_counter())
+            self._not_full.notify()
+            return item
+
+    def get_nowait(self) -> T:
+        return self.get(block=False)
+
+    def _wait(
+        self,
+        condition: threading.Condition,
+        blocked: Callable[[], bool],
+        block: bool,
+        timeout: float | None,
+    ) -> bool:
+        if not block:
+            return not blocked()
+        return condition.wait_for(lambda: not blocked(), timeout=timeout)
+
+    def _pop_locked(self, now: float) -> T:
+        top = next(idx for idx, q in enumerate(self._queues) if q)
+        candidates = [top] + [
+            idx
+            for idx in range(top + 1, len(self._queues))
+            if self._queues[idx]
+            and self._aging_s[idx] > 0
+            and now - self._queues[idx][0][0] >= self._aging_s[idx]
+        ]
+        chosen = min(candidates, key=lambda idx: self._queues[idx][0][0])
+        self._size -= 1
+        return self._queues[chosen].popleft()[1]
+
+
+__all__ = ["PRIORITY_CLASSES", "PriorityClassQueue", "priority_index"]
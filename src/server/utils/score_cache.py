@@ -0,0 +1,96 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.server.dto import ModelConfig
+    from src.server.services.metrics_service import MetricsService
+
+logger = logging.getLogger(__name__)
+
+
+def cache_namespace(instances: list["ModelConfig"]) -> str:
+    return "|".join(
+        sorted(
+            {
+                f"{inst.name}:{inst.backend}:{inst.quantization}:{inst.max_length}:"
+                f"{inst.early_exit_heads}:{inst.early_exit_confidence}"
+                for inst in instances
+            }
+        )
+    )
+
+
+class ScoreCache:
+    def __init__(self, namespace: str, max_entries: int = 100_000, ttl_seconds: float = 300.0):
+        self.namespace = namespace.encode()
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[bytes, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._metrics: MetricsService | None = None
+
+    def set_metrics(self, metrics: "MetricsService") -> None:
+        self._metrics = metrics
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key(self, pair: tuple[str, str]) -> bytes:
+        digest = hashlib.blake2b(self.namespace, digest_size=16)
+        for text in pair:
+            encoded = text.encode()
+            digest.update(len(encoded).to_bytes(8, "little"))
+            digest.update(encoded)
+        return digest.digest()
+
+    def get_many(self, keys: list[bytes]) -> list[float | None]:
+        now = time.monotonic()
+        scores: list[float | None] = []
+        expired = 0
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and entry[1] <= now:
+                    del self._entries[key]
+                    expired += 1
+                    entry = None
+                if entry is None:
+                    scores.append(None)
+                    continue
+                self._entries.move_to_end(key)
+                scores.append(entry[0])
+
+        if self._metrics:
+            misses = scores.count(None)
+            self._metrics.record_cache_lookup(hits=len(keys) - misses, misses=misses)
+            if expired:
+                self._metrics.record_cache_evictions(expired, reason="ttl")
+        return scores
+
+    def put_many(self, keys: list[bytes], scores: list[float]) -> None:
+        expires_at = time.monotonic() + self.ttl_seconds
+        evicted = 0
+        with self._lock:
+            for key, score in zip(keys, scores, strict=True):
+                self._entries[key] = (float(score), expires_at)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            size = len(self._entries)
+
+        if self._metrics:
+            if evicted:
+                self._metrics.record_cache_evictions(evicted, reason="lru")
+            self._metrics.set_cache_size(size)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+__all__ = ["ScoreCache", "cache_namespace"]
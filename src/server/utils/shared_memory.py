@@ -0,0 +1,130 @@
+import logging
+import multiprocessing as mp
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from src.server.dto.shared_memory import SharedTensorRef
+
+logger = logging.getLogger(__name__)
+
+_ALIGNMENT = 64
+_ARRAYS_PER_SLOT = 3
+_MAX_ITEMSIZE = 4
+
+
+def _align(nbytes: int) -> int:
+    return (nbytes + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+class SharedTensorSlab:
+    def __init__(
+        self,
+        shm: SharedMemory,
+        num_slots: int,
+        slot_bytes: int,
+        slot_flags: "mp.Array | None" = None,
+        owner: bool = False,
+    ):
+        self._shm = shm
+        self.num_slots = num_slots
+        self.slot_bytes = slot_bytes
+        self._slot_flags = slot_flags
+        self._owner = owner
+
+    @classmethod
+    def create(cls, num_slots: int, slot_tokens: int) -> "SharedTensorSlab":
+        slot_bytes = _align(slot_tokens * _MAX_ITEMSIZE) * _ARRAYS_PER_SLOT
+        shm = SharedMemory(create=True, size=num_slots * slot_bytes)
+        slot_flags = mp.get_context("spawn").Array("b", num_slots)
+        logger.info(
+            f"Shared tensor slab {shm.name} created: {num_slots} slots x "
+            f"{slot_bytes / (1024 * 1024):.1f} MB"
+        )
+        return cls(shm, num_slots, slot_bytes, slot_flags, owner=True)
+
+    @classmethod
+    def attach(
+        cls,
+        name: str,
+        num_slots: int = 0,
+        slot_bytes: int = 0,
+        slot_flags: "mp.Array | None" = None,
+    ) -> "SharedTensorSlab":
+        return cls(SharedMemory(name=name), num_slots, slot_bytes, slot_flags)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def handle(self) -> tuple[str, int, int, "mp.Array | None"]:
+        return self.name, self.num_slots, self.slot_bytes, self._slot_flags
+
+    def _acquire_slot(self) -> int | None:
+        with self._slot_flags.get_lock():
+            for slot_id in range(self.num_slots):
+                if not self._slot_flags[slot_id]:
+                    self._slot_flags[slot_id] = 1
+                    return slot_id
+        return None
+
+    def write(self, arrays: dict[str, np.ndarray]) -> SharedTensorRef | None:
+        if self._slot_flags is None or not arrays:
+            return None
+
+        shapes = {a.shape for a in arrays.values()}
+        if len(shapes) != 1:
+            return None
+        required = sum(_align(a.nbytes) for a in arrays.values())
+        if required > self.slot_bytes:
+            return None
+
+        slot_id = self._acquire_slot()
+        if slot_id is None:
+            return None
+
+        base = slot_id * self.slot_bytes
+        offset = base
+        for array in arrays.values():
+            view = np.ndarray(array.shape, dtype=array.dtype, buffer=self._shm.buf, offset=offset)
+            view[...] = array
+            offset += _align(array.nbytes)
+
+        return SharedTensorRef(
+            slab_name=self.name,
+            slot_id=slot_id,
+            offset=base,
+            shape=shapes.pop(),
+            keys=tuple(arrays.keys()),
+            dtypes=tuple(a.dtype.str for a in arrays.values()),
+        )
+
+    def read(self, ref: SharedTensorRef) -> dict[str, np.ndarray]:
+        arrays = {}
+        offset = ref.offset
+        for key, dtype in zip(ref.keys, ref.dtypes, strict=True):
+            view = np.ndarray(ref.shape, dtype=np.dtype(dtype), buffer=self._shm.buf, offset=offset)
+            arrays[key] = view
+            offset += _align(view.nbytes)
+        return arrays
+
+    def release(self, ref: SharedTensorRef) -> None:
+        if self._slot_flags is None:
+            raise RuntimeError("Shared tensor slab attached without slot table")
+        with self._slot_flags.get_lock():
+            self._slot_flags[ref.slot_id] = 0
+
+    def close(self) -> None:
+        try:
+            self._shm.close()
+        except BufferError:
+            logger.debug(f"Shared tensor slab {self.name} still has exported views")
+
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+__all__ = ["SharedTensorSlab"]
@@ -50,6 +50,11 @@ def expand_sweep_config(config: dict[str, Any]) -> list[dict[str, Any]]:
         if isinstance(batch_size_val, list):
             sweep_params["batching.max_batch_size"] = batch_size_val
 
+    if "batching" in config and "max_tokens_per_batch" in config["batching"]:
+        token_budget_val = config["batching"]["max_tokens_per_batch"]
+        if isinstance(token_budget_val, list):
+            sweep_params["batching.max_tokens_per_batch"] = token_budget_val
+
     if not sweep_params:
         return [config]
 
@@ -153,4 +158,9 @@ def get_sweep_name(config: dict[str, Any], base_name: str) -> str:
         if isinstance(max_batch, int):
             parts.append(f"batch{max_batch}")
 
+    if "batching" in config and "max_tokens_per_batch" in config["batching"]:
+        token_budget = config["batching"]["max_tokens_per_batch"]
+        if isinstance(token_budget, int) and token_budget > 0:
+            parts.append(f"tok{token_budget}")
+
     return "_".join(parts)
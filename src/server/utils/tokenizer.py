@@ -1,40 +1,164 @@
 import logging
 import time
+from collections import OrderedDict
 
+import numpy as np
 from transformers import AutoTokenizer
 
 from src.server.dto.inference import TokenizedBatch
 
 logger = logging.getLogger(__name__)
 
+_PAIR_SPECIAL_TOKENS = 3
+_PROBE_PAIRS = [("what is a probe", "a probe document " * 4), ("q", "short")]
+_MASK_DTYPE = np.dtype(np.int8)
+
+
+def token_id_dtype(vocab_size: int) -> np.dtype:
+    if vocab_size <= np.iinfo(np.int16).max + 1:
+        return np.dtype(np.int16)
+    return np.dtype(np.int32)
+
+
+def compact_features(features: dict[str, np.ndarray], vocab_size: int) -> dict[str, np.ndarray]:
+    id_dtype = token_id_dtype(vocab_size)
+    return {
+        k: v.astype(id_dtype if k == "input_ids" else _MASK_DTYPE, copy=False)
+        for k, v in features.items()
+    }
+
+
+def truncate_longest_first(n_query: int, n_doc: int, max_tokens: int) -> tuple[int, int]:
+    if n_query + n_doc <= max_tokens:
+        return n_query, n_doc
+
+    n1, n2 = n_query, n_doc
+    swap = n1 > n2
+    if swap:
+        n1, n2 = n2, n1
+    n2 = n1 if n1 > max_tokens else max(n1, max_tokens - n1)
+    if n1 + n2 > max_tokens:
+        n1 = max_tokens // 2
+        n2 = n1 + max_tokens % 2
+    if swap:
+        n1, n2 = n2, n1
+    return min(n1, n_query), min(n2, n_doc)
+
 
 class TokenizerService:
-    def __init__(self, model_name: str, max_length: int = 512):
+    def __init__(self, model_name: str, max_length: int = 512, doc_cache_size: int = 0):
         self._tokenizer = AutoTokenizer.from_pretrained(model_name)
         self._max_length = max_length
+        self._doc_cache_size = doc_cache_size
+        self._doc_cache: OrderedDict[str, tuple[list[int], int]] = OrderedDict()
+        self._doc_cache_hits = 0
+        self._doc_cache_misses = 0
+        self._id_dtype = token_id_dtype(len(self._tokenizer))
+        self._pair_assembly = self._supports_pair_assembly()
+        if doc_cache_size > 0 and not self._pair_assembly:
+            logger.warning(f"Document token cache disabled: unsupported tokenizer {model_name}")
+            self._doc_cache_size = 0
         logger.info(f"Tokenizer loaded: {model_name}")
 
-    def tokenize(self, pairs: list[tuple[str, str]], device: str = "cpu") -> TokenizedBatch:
-        start = time.perf_counter()
+    def _supports_pair_assembly(self) -> bool:
+        tok = self._tokenizer
+        if (
+            not tok.is_fast
+            or tok.truncation_side != "right"
+            or tok.padding_side != "right"
+            or tok.cls_token_id is None
+            or tok.sep_token_id is None
+            or tok.num_special_tokens_to_add(pair=True) != _PAIR_SPECIAL_TOKENS
+        ):
+            return False
 
-        texts = [[p[0], p[1]] for p in pairs]
-        features = self._tokenizer(
-            texts,
+        expected = self._encode_pairs(_PROBE_PAIRS)
+        assembled = self._assemble_pairs(_PROBE_PAIRS)
+        self._doc_cache.clear()
+        self._doc_cache_hits = self._doc_cache_misses = 0
+        return all(np.array_equal(expected[k], assembled[k]) for k in expected)
+
+    def _encode_pairs(self, pairs: list[tuple[str, str]]) -> dict[str, np.ndarray]:
+        encoded = self._tokenizer(
+            [[p[0], p[1]] for p in pairs],
             padding=True,
             truncation="longest_first",
-            return_tensors="pt",
+            return_tensors="np",
             max_length=self._max_length,
         )
+        return compact_features(dict(encoded), len(self._tokenizer))
+
+    def _doc_ids(self, docs: list[str]) -> list[tuple[list[int], int]]:
+        if self._doc_cache_size == 0:
+            encoded = self._tokenizer(docs, add_special_tokens=False)["input_ids"]
+            return [(ids[: self._max_length], len(ids)) for ids in encoded]
+
+        missing = [doc for doc in dict.fromkeys(docs) if doc not in self._doc_cache]
+        self._doc_cache_misses += len(missing)
+        self._doc_cache_hits += len(docs) - len(missing)
+
+        if missing:
+            encoded = self._tokenizer(missing, add_special_tokens=False)["input_ids"]
+            for doc, ids in zip(missing, encoded, strict=True):
+                self._doc_cache[doc] = (ids[: self._max_length], len(ids))
+
+        doc_ids = []
+        for doc in docs:
+            self._doc_cache.move_to_end(doc)
+            doc_ids.append(self._doc_cache[doc])
+
+        while len(self._doc_cache) > self._doc_cache_size:
+            self._doc_cache.popitem(last=False)
+        return doc_ids
+
+    def _assemble_pairs(self, pairs: list[tuple[str, str]]) -> dict[str, np.ndarray]:
+        tok = self._tokenizer
+        queries = list(dict.fromkeys(p[0] for p in pairs))
+        encoded_queries = tok(queries, add_special_tokens=False)["input_ids"]
+        ids_by_query = dict(zip(queries, encoded_queries, strict=True))
+        query_ids = [ids_by_query[p[0]] for p in pairs]
+        doc_ids = self._doc_ids([p[1] for p in pairs])
+        budget = self._max_length - _PAIR_SPECIAL_TOKENS
+
+        lengths = []
+        for q, (_, doc_len) in zip(query_ids, doc_ids, strict=True):
+            n_q, n_d = truncate_longest_first(len(q), doc_len, budget)
+            lengths.append((n_q, n_d))
+        max_seq = max(n_q + n_d for n_q, n_d in lengths) + _PAIR_SPECIAL_TOKENS
+
+        input_ids = np.full((len(pairs), max_seq), tok.pad_token_id or 0, dtype=self._id_dtype)
+        token_type_ids = np.zeros((len(pairs), max_seq), dtype=_MASK_DTYPE)
+        attention_mask = np.zeros((len(pairs), max_seq), dtype=_MASK_DTYPE)
+        for row, (q, (d, _), (n_q, n_d)) in enumerate(
+            zip(query_ids, doc_ids, lengths, strict=True)
+        ):
+            ids = [tok.cls_token_id, *q[:n_q], tok.sep_token_id, *d[:n_d], tok.sep_token_id]
+            input_ids[row, : len(ids)] = ids
+            token_type_ids[row, n_q + 2 : len(ids)] = 1
+            attention_mask[row, : len(ids)] = 1
+
+        features = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in tok.model_input_names:
+            features["token_type_ids"] = token_type_ids
+        return {k: features[k] for k in tok.model_input_names if k in features}
+
+    def tokenize(self, pairs: list[tuple[str, str]]) -> TokenizedBatch:
+        start = time.perf_counter()
+
+        if self._pair_assembly and (
+            self._doc_cache_size > 0 or len({p[0] for p in pairs}) < len(pairs)
+        ):
+            features = self._assemble_pairs(pairs)
+        else:
+            features = self._encode_pairs(pairs)
 
         mask = features["attention_mask"]
         batch_size, max_seq = mask.shape
-        real_per_seq = mask.sum(dim=1)
-        total_real = int(real_per_seq.sum().item())
+        real_per_seq = mask.sum(axis=1)
+        total_real = int(real_per_seq.sum())
         total_tokens = batch_size * max_seq
         padded = total_tokens - total_real
 
-        features = {k: v.to(device) for k, v in features.items()}
-
         return TokenizedBatch(
             features=features,
             batch_size=batch_size,
@@ -43,10 +167,18 @@ class TokenizerService:
             real_tokens=total_real,
             padded_tokens=padded,
             padding_ratio=padded / total_tokens if total_tokens > 0 else 0.0,
-            avg_seq_length=float(real_per_seq.float().mean().item()),
+            avg_seq_length=float(real_per_seq.mean()),
             tokenize_time_ms=(time.perf_counter() - start) * 1000,
         )
 
+    def get_doc_cache_stats(self) -> dict:
+        return {
+            "size": len(self._doc_cache),
+            "capacity": self._doc_cache_size,
+            "hits": self._doc_cache_hits,
+            "misses": self._doc_cache_misses,
+        }
+
     @property
     def max_length(self) -> int:
         return self._max_length
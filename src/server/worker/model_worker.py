@@ -1,25 +1,68 @@
 import logging
-import time
+from dataclasses import replace
+from typing import TYPE_CHECKING
 
-from src.server.dto import ModelConfig, WorkItem, WorkResult
+import numpy as np
+
+from src.server.dto import InferenceResult, ModelConfig, TokenizedBatch, WorkItem, WorkResult
+from src.server.utils.shared_memory import SharedTensorSlab
 from src.server.worker.base import BaseWorker, get_worker_gpu_memory, setup_worker_environment
 
+if TYPE_CHECKING:
+    from src.server.backends.base import BaseBackend
+
 logger = logging.getLogger(__name__)
 
 
+def _merge_batches(batches: list[TokenizedBatch]) -> TokenizedBatch:
+    max_seq = max(b.max_seq_length for b in batches)
+    features = {
+        key: np.concatenate(
+            [np.pad(b.features[key], ((0, 0), (0, max_seq - b.max_seq_length))) for b in batches]
+        )
+        for key in batches[0].features
+    }
+    batch_size = sum(b.batch_size for b in batches)
+    total_tokens = batch_size * max_seq
+    real_tokens = sum(b.real_tokens for b in batches)
+    padded_tokens = total_tokens - real_tokens
+    return TokenizedBatch(
+        features=features,
+        batch_size=batch_size,
+        max_seq_length=max_seq,
+        total_tokens=total_tokens,
+        real_tokens=real_tokens,
+        padded_tokens=padded_tokens,
+        padding_ratio=padded_tokens / total_tokens if total_tokens > 0 else 0.0,
+        avg_seq_length=real_tokens / batch_size if batch_size > 0 else 0.0,
+        tokenize_time_ms=0.0,
+    )
+
+
+def load_backend(config: ModelConfig) -> "BaseBackend":
+    from src.server.backends import create_backend
+
+    backend = create_backend(config)
+    backend.load_model()
+    if config.early_exit_heads:
+        backend.enable_early_exit(config.early_exit_heads, config.early_exit_confidence)
+    elif config.packed:
+        backend.enable_packed()
+    backend.warmup(3)
+    return backend
+
+
 class ModelWorker(BaseWorker[WorkItem, WorkResult]):
-    def __init__(self, worker_id: int, config: ModelConfig):
+    def __init__(self, worker_id: int, config: ModelConfig, backend: "BaseBackend | None" = None):
         super().__init__(worker_id, worker_type="model")
         self.config = config
-        self._backend = None
+        self._backend = backend
+        self._attached_slabs: dict[str, SharedTensorSlab] = {}
 
     def initialize(self) -> None:
         setup_worker_environment()
-        from src.server.backends import create_backend
-
-        self._backend = create_backend(self.config)
-        self._backend.load_model()
-        self._backend.warmup(3)
+        if self._backend is None:
+            self._backend = load_backend(self.config)
 
         try:
             initial_mem = get_worker_gpu_memory()
@@ -30,20 +73,52 @@ class ModelWorker(BaseWorker[WorkItem, WorkResult]):
         self.set_ready()
 
     def process(self, work_item: WorkItem) -> WorkResult:
+        return self.process_many([work_item])[0]
+
+    def process_many(self, work_items: list[WorkItem]) -> list[WorkResult]:
         if not self._backend:
             raise RuntimeError(f"Model worker {self.worker_id} not initialized")
 
-        time.perf_counter()
-        result = self._backend.infer_with_tokenized(work_item.tokenized_batch)
-        latency_ms = result.t_model_inference_ms
+        batches = [self._resolve_features(item.tokenized_batch) for item in work_items]
+        if len(batches) == 1:
+            return [self._to_work_result(work_items[0].req_id, self._infer(batches[0]))]
+
+        merged = _merge_batches(batches)
+        result = self._infer(merged)
+
+        results = []
+        offset = 0
+        for item, batch in zip(work_items, batches, strict=True):
+            total_tokens = batch.batch_size * merged.max_seq_length
+            padded_tokens = total_tokens - batch.real_tokens
+            share = replace(
+                result,
+                scores=result.scores[offset : offset + batch.batch_size],
+                batch_size=batch.batch_size,
+                total_tokens=total_tokens,
+                real_tokens=batch.real_tokens,
+                padded_tokens=padded_tokens,
+                padding_ratio=padded_tokens / total_tokens if total_tokens > 0 else 0.0,
+                avg_seq_length=batch.avg_seq_length,
+                exit_layers=None
+                if result.exit_layers is None
+                else result.exit_layers[offset : offset + batch.batch_size],
+            )
+            results.append(self._to_work_result(item.req_id, share))
+            offset += batch.batch_size
+        return results
 
+    def _infer(self, tokenized_batch: TokenizedBatch) -> InferenceResult:
+        result = self._backend.infer_with_tokenized(tokenized_batch)
         self._record_metrics(
-            latency_ms=latency_ms,
+            latency_ms=result.t_model_inference_ms,
             num_queries=result.batch_size,
         )
+        return result
 
+    def _to_work_result(self, req_id: int, result: InferenceResult) -> WorkResult:
         return WorkResult(
-            req_id=work_item.req_id,
+            req_id=req_id,
             scores=result.scores,
             worker_id=self.worker_id,
             t_tokenize_ms=0.0,
@@ -57,10 +132,23 @@ class ModelWorker(BaseWorker[WorkItem, WorkResult]):
             max_seq_length=result.max_seq_length,
             avg_seq_length=result.avg_seq_length,
             batch_size=result.batch_size,
+            exit_layers=result.exit_layers,
         )
 
+    def _resolve_features(self, tokenized_batch: TokenizedBatch) -> TokenizedBatch:
+        ref = tokenized_batch.shm_ref
+        if ref is None:
+            return tokenized_batch
+
+        slab = self._attached_slabs.get(ref.slab_name)
+        if slab is None:
+            slab = SharedTensorSlab.attach(ref.slab_name)
+            self._attached_slabs[ref.slab_name] = slab
+
+        return replace(tokenized_batch, features=slab.read(ref), shm_ref=None)
+
     def get_memory_mb(self) -> float:
         return get_worker_gpu_memory()
 
 
-__all__ = ["ModelWorker"]
+__all__ = ["ModelWorker", "load_backend"]
@@ -1,10 +1,14 @@
 import logging
 import time
+from typing import TYPE_CHECKING
 
 from src.server.dto.inference import TokenizedBatch
 from src.server.utils.tokenizer import TokenizerService
 from src.server.worker.base import BaseWorker, setup_worker_environment
 
+if TYPE_CHECKING:
+    from src.server.utils.shared_memory import SharedTensorSlab
+
 logger = logging.getLogger(__name__)
 
 
@@ -15,16 +19,22 @@ class TokenizerWorker(BaseWorker[list[tuple[str, str]], TokenizedBatch]):
         model_name: str,
         max_length: int = 512,
         tokenizers_parallelism: bool = False,
+        tensor_slab: "SharedTensorSlab | None" = None,
+        doc_cache_size: int = 0,
     ):
         super().__init__(worker_id, worker_type="tokenizer")
         self.model_name = model_name
         self.max_length = max_length
         self.tokenizers_parallelism = tokenizers_parallelism
         self._tokenizer: TokenizerService | None = None
+        self._tensor_slab = tensor_slab
+        self.doc_cache_size = doc_cache_size
 
     def initialize(self) -> None:
         setup_worker_environment(self.tokenizers_parallelism)
-        self._tokenizer = TokenizerService(self.model_name, self.max_length)
+        self._tokenizer = TokenizerService(
+            self.model_name, self.max_length, doc_cache_size=self.doc_cache_size
+        )
         logger.info(f"Tokenizer worker {self.worker_id} loaded: {self.model_name}")
         self.set_ready()
 
@@ -33,7 +43,7 @@ class TokenizerWorker(BaseWorker[list[tuple[str, str]], TokenizedBatch]):
             raise RuntimeError(f"Tokenizer worker {self.worker_id} not initialized")
 
         start_time = time.perf_counter()
-        result = self._tokenizer.tokenize(pairs, device="cpu")
+        result = self._tokenizer.tokenize(pairs)
         latency_ms = (time.perf_counter() - start_time) * 1000
 
         self._record_metrics(
@@ -42,8 +52,19 @@ class TokenizerWorker(BaseWorker[list[tuple[str, str]], TokenizedBatch]):
             num_queries=len(pairs),
         )
 
+        if self._tensor_slab is not None:
+            return self._publish_to_slab(result)
         return result
 
+    def _publish_to_slab(self, batch: TokenizedBatch) -> TokenizedBatch:
+        ref = self._tensor_slab.write(batch.features)
+        if ref is None:
+            logger.debug(f"Tokenizer worker {self.worker_id}: no free slab slot, pickling batch")
+            return batch
+        batch.features = {}
+        batch.shm_ref = ref
+        return batch
+
     def get_memory_mb(self) -> float:
         return 0.0
 
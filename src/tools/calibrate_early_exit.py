@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+
+def _load_pairs(dataset_size: int, logger: logging.Logger) -> list[tuple[str, str]]:
+    from src.client.loader import DatasetLoader
+
+    pairs = DatasetLoader().load(dataset_size)
+    if not pairs:
+        raise RuntimeError("No pairs loaded for calibration")
+    logger.info(f"Loaded {len(pairs)} pairs")
+    return pairs
+
+
+def _feature_batches(
+    pairs: list[tuple[str, str]], model_name: str, max_length: int, batch_size: int, device: str
+):
+    from src.server.backends.device import features_to_torch
+    from src.server.utils.tokenizer import TokenizerService
+
+    tokenizer = TokenizerService(model_name, max_length)
+    for start in range(0, len(pairs), batch_size):
+        features = tokenizer.tokenize(pairs[start : start + batch_size]).features
+        yield features_to_torch(features, device)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Fit early-exit heads against the full cross-encoder's scores"
+    )
+    parser.add_argument("--model-name", default="cross-encoder/ms-marco-MiniLM-L-6-v2")
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--max-length", type=int, default=512)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--dataset-size", type=int, default=2000)
+    parser.add_argument(
+        "--layers", default="", help="Comma-separated 1-based exit layers (default: all but last)"
+    )
+    parser.add_argument(
+        "--max-error",
+        type=float,
+        default=0.02,
+        help="Mean absolute score error allowed on rows that exit at each layer",
+    )
+    parser.add_argument("--ridge", type=float, default=1e-3)
+    parser.add_argument("--output", required=True)
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(levelname)s | %(message)s",
+    )
+    logger = logging.getLogger(__name__)
+
+    from src.server.backends import create_backend
+    from src.server.backends.early_exit import (
+        EarlyExitBertEncoder,
+        calibrate_exit_heads,
+        save_exit_heads,
+    )
+    from src.server.dto.config import ModelConfig
+
+    backend = create_backend(
+        ModelConfig(
+            name=args.model_name,
+            device=args.device,
+            backend="pytorch",
+            quantization="fp32",
+            max_length=args.max_length,
+        )
+    )
+    backend.load_model()
+    model = backend.model.model
+    if not EarlyExitBertEncoder.supports(model):
+        raise SystemExit(f"{args.model_name} is not a single-logit BERT cross-encoder")
+
+    pairs = _load_pairs(args.dataset_size, logger)
+    layers = [int(layer) for layer in args.layers.split(",") if layer] or None
+    heads = calibrate_exit_heads(
+        model,
+        _feature_batches(pairs, args.model_name, args.max_length, args.batch_size, backend.device),
+        layers=layers,
+        max_error=args.max_error,
+        ridge=args.ridge,
+    )
+    heads["model_name"] = args.model_name
+    save_exit_heads(heads, args.output)
+    logger.info(f"Saved {len(heads['layers'])} exit heads to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -56,6 +56,7 @@ class PerfHammer:
         duration: float | None = None,
         num_requests: int | None = None,
         target_rps: float | None = None,
+        packed: bool = False,
     ):
         self.host = host
         self.port = port
@@ -64,6 +65,7 @@ class PerfHammer:
         self.duration = duration
         self.num_requests = num_requests
         self.target_rps = target_rps
+        self.packed = packed
         self.running = True
 
         self.latencies: list[float] = []
@@ -90,7 +92,7 @@ class PerfHammer:
         self, client: AsyncInferenceClient, batch: list[tuple[str, str]]
     ) -> tuple[bool, float, float]:
         try:
-            _, latency_ms = await client.infer(batch, timeout=120.0)
+            _, latency_ms = await client.infer(batch, timeout=120.0, packed=self.packed)
             throughput = self.batch_size / (latency_ms / 1000.0) if latency_ms > 0 else 0
             return True, latency_ms, throughput
         except Exception:
@@ -373,6 +375,9 @@ def main():
     parser.add_argument("--duration", type=float, default=None, help="Run duration in seconds")
     parser.add_argument("--requests", type=int, default=None, help="Total number of requests")
     parser.add_argument("--target-rps", type=float, default=None, help="Target RPS (total)")
+    parser.add_argument(
+        "--packed", action="store_true", help="Send packed pairs and receive float32 score bytes"
+    )
 
     args = parser.parse_args()
 
@@ -388,6 +393,7 @@ def main():
         duration=args.duration,
         num_requests=args.requests,
         target_rps=args.target_rps,
+        packed=args.packed,
     )
 
     hammer.run()
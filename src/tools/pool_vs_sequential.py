@@ -76,7 +76,7 @@ def _run_sequential(
     for i in range(num_requests):
         batch = _create_batch(pairs, batch_size, i)
         t0 = time.perf_counter()
-        tokenized = tokenizer.tokenize(batch, device="cpu")
+        tokenized = tokenizer.tokenize(batch)
         result = backend_instance.infer_with_tokenized(tokenized)
         total_times.append((time.perf_counter() - t0) * 1000)
         tokenize_times.append(tokenized.tokenize_time_ms)
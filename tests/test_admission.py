@@ -0,0 +1,103 @@
+from concurrent import futures
+from unittest.mock import MagicMock
+
+import grpc
+import pytest
+
+from src.client.grpc_client import InferenceClient
+from src.proto import inference_pb2_grpc
+from src.server.dto import AdmissionConfig
+from src.server.grpc import InferenceServicer
+from src.server.services.orchestrator_service import OrchestratorService
+from src.server.utils.admission import AdmissionController, OverloadedError
+
+
+def _warm(controller: AdmissionController, in_flight: int, ms_per_pair: float) -> None:
+    controller.admit(in_flight)
+    controller.release(0, service_ms=ms_per_pair, batch_size=1)
+
+
+class TestAdmissionController:
+    def test_admits_until_service_time_known(self):
+        controller = AdmissionController(max_queue_delay_ms=1.0)
+        controller.admit(1000)
+        controller.admit(1000)
+        assert controller.in_flight_pairs == 2000
+
+    def test_rejects_when_estimated_delay_exceeds_budget(self):
+        controller = AdmissionController(max_queue_delay_ms=100.0, parallelism=2)
+        _warm(controller, in_flight=30, ms_per_pair=5.0)
+
+        assert controller.estimated_delay_ms() == pytest.approx(75.0)
+        controller.admit(10)
+        with pytest.raises(OverloadedError) as exc:
+            controller.admit(10)
+        assert exc.value.reason == "deadline"
+        assert controller.in_flight_pairs == 40
+
+    def test_client_deadline_tightens_budget(self):
+        controller = AdmissionController(max_queue_delay_ms=1000.0)
+        _warm(controller, in_flight=10, ms_per_pair=2.0)
+
+        controller.admit(1)
+        with pytest.raises(OverloadedError):
+            controller.admit(1, deadline_ms=5.0)
+
+    def test_release_updates_service_time_ewma(self):
+        controller = AdmissionController(max_queue_delay_ms=1000.0, alpha=0.5)
+        controller.admit(8)
+        controller.release(4, service_ms=40.0, batch_size=4)
+        controller.release(4, service_ms=80.0, batch_size=4)
+
+        info = controller.get_info()
+        assert info["in_flight_pairs"] == 0
+        assert info["ms_per_pair"] == pytest.approx(15.0)
+
+
+class TestPipelineAdmission:
+    def test_schedule_sheds_before_submitting(self, minimal_config):
+        minimal_config.admission = AdmissionConfig(enabled=True, max_queue_delay_ms=10.0)
+        orchestrator = OrchestratorService(minimal_config, "test")
+        orchestrator.setup()
+        pipeline = orchestrator.pipeline
+        pipeline._submit_direct = MagicMock()
+        _warm(pipeline._admission, in_flight=100, ms_per_pair=1.0)
+
+        with pytest.raises(OverloadedError):
+            orchestrator.schedule([("query", "doc")])
+
+        pipeline._submit_direct.assert_not_called()
+        rejections = orchestrator.metrics.prom_admission_rejections
+        assert rejections.labels(reason="deadline")._value.get() == 1
+
+    def test_queue_capacities_applied(self, minimal_config):
+        minimal_config.admission = AdmissionConfig(
+            batch_queue_size=4, inference_queue_size=8, tokenizer_queue_size=16
+        )
+        orchestrator = OrchestratorService(minimal_config, "test")
+        orchestrator.setup()
+
+        assert orchestrator.pipeline._batch_queue.maxsize == 4
+        assert orchestrator.pipeline._inference_queue.maxsize == 8
+        assert orchestrator.tokenizer_pool.queue_size == 16
+        assert orchestrator.pipeline._admission is None
+
+
+class TestOverloadStatus:
+    def test_overload_maps_to_resource_exhausted(self):
+        handler = MagicMock()
+        handler.schedule.side_effect = OverloadedError("Batch queue full")
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+        inference_pb2_grpc.add_InferenceServiceServicer_to_server(
+            InferenceServicer(handler), server
+        )
+        port = server.add_insecure_port("127.0.0.1:0")
+        server.start()
+        try:
+            with InferenceClient(host="127.0.0.1", port=port) as client:
+                with pytest.raises(grpc.RpcError) as exc:
+                    client.infer([("q", "d")], timeout=5.0)
+            assert exc.value.code() == grpc.StatusCode.RESOURCE_EXHAUSTED
+            assert handler.schedule.call_args.kwargs["deadline_ms"] <= 5000.0
+        finally:
+            server.stop(None)
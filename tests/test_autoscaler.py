@@ -0,0 +1,94 @@
+from unittest.mock import MagicMock
+
+from src.server.dto import AutoscaleConfig
+from src.server.services.autoscaler_service import AutoscalerService
+
+
+def _pool(workers: int, queued: int = 0, key: str = "queue_size") -> MagicMock:
+    pool = MagicMock()
+    pool.supports_scaling = True
+    pool.num_workers = workers
+    pool.get_info.side_effect = lambda: {key: queued}
+
+    def scale(delta):
+        pool.num_workers += delta
+        return True
+
+    pool.scale_up.side_effect = lambda: scale(1)
+    pool.scale_down.side_effect = lambda: scale(-1)
+    return pool
+
+
+def _autoscaler(tokenizer, model, **overrides) -> AutoscalerService:
+    config = AutoscaleConfig(
+        enabled=True, sustain_intervals=2, cooldown_s=10.0, scale_up_queue_depth=4.0
+    ).model_copy(update=overrides)
+    return AutoscalerService(config, tokenizer, model)
+
+
+class TestAutoscaler:
+    def test_scales_up_after_sustained_backlog(self):
+        tokenizer = _pool(2, key="total_queue_size")
+        model = _pool(2, queued=20)
+        autoscaler = _autoscaler(tokenizer, model)
+
+        autoscaler.tick(now=0.0)
+        assert model.num_workers == 2
+        autoscaler.tick(now=1.0)
+
+        assert model.num_workers == 3
+        tokenizer.scale_up.assert_not_called()
+
+    def test_cooldown_and_bounds(self):
+        model = _pool(2, queued=40)
+        autoscaler = _autoscaler(_pool(1, key="total_queue_size"), model, model_max_workers=4)
+
+        for now in range(6):
+            autoscaler.tick(now=float(now))
+        assert model.num_workers == 3
+
+        for now in range(20, 40):
+            autoscaler.tick(now=float(now))
+        assert model.num_workers == 4
+
+    def test_scales_idle_stage_down_to_min(self):
+        tokenizer = _pool(3, key="total_queue_size")
+        autoscaler = _autoscaler(tokenizer, _pool(1), cooldown_s=0.0, sustain_intervals=1)
+
+        for now in range(5):
+            autoscaler.tick(now=float(now))
+
+        assert tokenizer.num_workers == 1
+
+    def test_shared_budget_moves_worker_between_stages(self):
+        tokenizer = _pool(3, queued=30, key="total_queue_size")
+        model = _pool(2)
+        autoscaler = _autoscaler(tokenizer, model, max_total_workers=5, sustain_intervals=1)
+
+        autoscaler.tick(now=0.0)
+
+        assert (tokenizer.num_workers, model.num_workers) == (4, 1)
+
+    def test_queue_wait_triggers_scale_up(self):
+        model = _pool(2)
+        metrics = MagicMock()
+        metrics.get_queue_wait_totals.side_effect = [
+            {"model": (1.0, 10.0)},
+            {"model": (2.0, 20.0)},
+        ]
+        autoscaler = _autoscaler(_pool(1, key="total_queue_size"), model, sustain_intervals=1)
+        autoscaler._metrics = metrics
+
+        autoscaler.tick(now=0.0)
+
+        assert model.num_workers == 3
+        metrics.record_autoscale.assert_called_once_with("model", "up", 3)
+
+    def test_single_process_pool_is_not_scaled(self):
+        model = _pool(1, queued=50)
+        model.supports_scaling = False
+        autoscaler = _autoscaler(_pool(1, key="total_queue_size"), model, sustain_intervals=1)
+
+        autoscaler.tick(now=0.0)
+
+        model.scale_up.assert_not_called()
@@ -1,3 +1,5 @@
+from unittest.mock import MagicMock
+
 import numpy as np
 
 from src.server.backends import create_backend
@@ -15,3 +17,190 @@ class TestBackends:
         scores = backend.infer(sample_pairs)
         assert isinstance(scores, np.ndarray)
         assert scores.shape == (len(sample_pairs),)
+
+
+class TestOnnxBackend:
+    def test_onnx_backend_registered(self, model_config):
+        from src.server.backends import BACKENDS, OnnxBackend
+
+        model_config.backend = "onnx"
+        model_config.device = "cpu"
+        backend = create_backend(model_config)
+        assert "onnx" in BACKENDS
+        assert isinstance(backend, OnnxBackend)
+        assert backend._optimize is model_config.onnx_optimize
+
+    def test_onnx_cache_path_keyed_by_config(self, tmp_path):
+        from src.server.backends import OnnxBackend
+
+        backend = OnnxBackend("org/model", device="cpu", max_length=256, cache_dir=tmp_path)
+        assert backend._model_path("int8") == tmp_path / "org_model_len256_int8.onnx"
+        assert backend._model_path("fp32") != backend._model_path("int8")
+
+    def test_export_matches_torch_and_reuses_cache(self, tmp_path, monkeypatch):
+        import torch
+
+        from src.server.backends import OnnxBackend
+
+        model = _tiny_bert()
+        model_dir = _save_with_tokenizer(model, tmp_path / "model")
+        features = _features([9, 3, 12, 5])
+        with torch.inference_mode():
+            expected = torch.sigmoid(model(**features).logits[:, 0]).numpy()
+        np_features = {name: value.numpy() for name, value in features.items()}
+
+        backend = OnnxBackend(str(model_dir), max_length=32, cache_dir=tmp_path / "cache")
+        backend.load_model()
+        model_path = backend._model_path("fp32")
+        options = backend._session.get_session_options()
+
+        assert model_path.exists()
+        assert list(model_path.parent.glob("*.tmp")) == []
+        assert options.graph_optimization_level.name == "ORT_ENABLE_ALL"
+        np.testing.assert_allclose(backend._run(np_features), expected, atol=1e-5)
+
+        monkeypatch.setattr(torch.onnx, "export", MagicMock(side_effect=AssertionError))
+        reloaded = OnnxBackend(
+            str(model_dir), max_length=32, optimize=False, cache_dir=tmp_path / "cache"
+        )
+        reloaded.load_model()
+        options = reloaded._session.get_session_options()
+
+        assert options.graph_optimization_level.name == "ORT_ENABLE_BASIC"
+        np.testing.assert_allclose(reloaded._run(np_features), expected, atol=1e-5)
+
+        quantized = OnnxBackend(
+            str(model_dir), quantization="int8", max_length=32, cache_dir=tmp_path / "cache"
+        )
+        quantized.load_model()
+
+        assert quantized._model_path("int8").exists()
+        np.testing.assert_allclose(quantized._run(np_features), expected, atol=0.05)
+
+    def test_two_label_logits_use_softmax(self):
+        from src.server.backends import OnnxBackend
+
+        backend = OnnxBackend("org/model")
+        logits = np.array([[0.0, 0.0], [1.0, 3.0]], dtype=np.float32)
+        backend._session = MagicMock(**{"run.return_value": [logits]})
+        backend._input_names = ["input_ids"]
+
+        scores = backend._run({"input_ids": np.zeros((2, 4), dtype=np.int16)})
+
+        np.testing.assert_allclose(scores, [0.5, 1 / (1 + np.exp(-2.0))], rtol=1e-6)
+        assert backend._session.run.call_args.args[1]["input_ids"].dtype == np.int64
+
+
+def _save_with_tokenizer(model, path):
+    from transformers import BertTokenizerFast
+
+    path.mkdir(parents=True)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", *letters, *(f"##{c}" for c in letters)]
+    (path / "vocab.txt").write_text("\n".join(vocab))
+    BertTokenizerFast(vocab_file=str(path / "vocab.txt")).save_pretrained(str(path))
+    model.save_pretrained(str(path))
+    return path
+
+
+def _tiny_bert(num_layers: int = 2):
+    import torch
+    from transformers import BertConfig, BertForSequenceClassification
+
+    torch.manual_seed(0)
+    config = BertConfig(
+        vocab_size=100,
+        hidden_size=32,
+        num_hidden_layers=num_layers,
+        num_attention_heads=4,
+        intermediate_size=64,
+        num_labels=1,
+    )
+    return BertForSequenceClassification(config).eval()
+
+
+def _features(lengths: list[int]) -> dict:
+    import torch
+
+    mask = torch.zeros((len(lengths), max(lengths)), dtype=torch.long)
+    for row, length in enumerate(lengths):
+        mask[row, :length] = 1
+    return {
+        "input_ids": torch.randint(1, 100, mask.shape) * mask,
+        "attention_mask": mask,
+        "token_type_ids": torch.zeros_like(mask),
+    }
+
+
+class TestPackedBertEncoder:
+    def test_matches_padded_forward(self):
+        import torch
+
+        from src.server.backends.packed import PackedBertEncoder
+
+        model = _tiny_bert()
+        features = _features([9, 3, 12, 3, 5])
+
+        with torch.inference_mode():
+            expected = model(**features).logits
+            packed = PackedBertEncoder(model)(features)
+
+        assert PackedBertEncoder.supports(model)
+        assert torch.allclose(packed, expected, atol=1e-5)
+
+    def test_unsupported_model_falls_back(self):
+        from unittest.mock import MagicMock
+
+        from src.server.backends.pytorch import PyTorchBackend
+
+        backend = PyTorchBackend("org/model", device="cpu")
+        backend.model = MagicMock()
+        backend.model.model = MagicMock(spec=["config"])
+
+        assert backend.enable_packed() is False
+        assert backend._packed_encoder is None
+
+
+class TestEarlyExit:
+    def test_exited_rows_use_head_and_others_run_full_depth(self):
+        import torch
+
+        from src.server.backends.early_exit import EarlyExitBertEncoder
+
+        model = _tiny_bert(num_layers=3)
+        features = _features([7, 3, 11, 5, 3, 9])
+        weight = torch.randn(1, 32)
+        with torch.inference_mode():
+            outputs = model(**features, output_hidden_states=True)
+        head_logits = outputs.hidden_states[1][:, 0] @ weight[0]
+        confidence = (2 * torch.sigmoid(head_logits) - 1).abs()
+        threshold = float(confidence.median())
+        heads = {"layers": [1], "weight": weight, "bias": torch.zeros(1), "thresholds": [threshold]}
+
+        with torch.inference_mode():
+            logits, exit_layers = EarlyExitBertEncoder(model, heads).forward_with_exits(features)
+
+        exited = (confidence >= threshold).numpy()
+        assert 0 < exited.sum() < len(exited)
+        assert (exit_layers[exited] == 1).all() and (exit_layers[~exited] == 3).all()
+        assert torch.allclose(logits[exited, 0], head_logits[exited], atol=1e-5)
+        assert torch.allclose(logits[~exited], outputs.logits[~exited], atol=1e-5)
+
+    def test_calibrated_heads_roundtrip(self, tmp_path):
+        import torch
+
+        from src.server.backends.early_exit import (
+            calibrate_exit_heads,
+            load_exit_heads,
+            save_exit_heads,
+        )
+
+        model = _tiny_bert(num_layers=3)
+        heads = calibrate_exit_heads(model, [_features([4, 6, 8, 5]) for _ in range(4)])
+        save_exit_heads(heads, tmp_path / "heads.pt")
+        loaded = load_exit_heads(tmp_path / "heads.pt")
+
+        assert loaded["layers"] == [1, 2]
+        assert loaded["weight"].shape == (2, 32)
+        assert len(loaded["thresholds"]) == 2
+        assert torch.equal(loaded["bias"], heads["bias"])
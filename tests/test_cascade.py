@@ -0,0 +1,111 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+
+from src.server.dto import CascadeConfig, InferenceResult, ModelConfig
+from src.server.services.orchestrator_service import OrchestratorService
+from src.server.utils.cascade import cascade_filters, merge_cascade_scores, select_candidates
+
+
+def _pairs(query: str, n: int) -> list[tuple[str, str]]:
+    return [(query, f"doc{i}") for i in range(n)]
+
+
+class TestCandidateSelection:
+    def test_top_k_per_query(self):
+        pairs = _pairs("a", 4) + _pairs("b", 2)
+        scores = np.array([0.1, 0.9, 0.5, 0.7, 0.2, 0.3])
+
+        assert select_candidates(pairs, scores, top_k=2, threshold=None) == [1, 3, 4, 5]
+
+    def test_threshold_then_cap(self):
+        pairs = _pairs("a", 5)
+        scores = np.array([0.1, 0.9, 0.5, 0.7, 0.6])
+
+        assert select_candidates(pairs, scores, top_k=0, threshold=0.55) == [1, 3, 4]
+        assert select_candidates(pairs, scores, top_k=2, threshold=0.55) == [1, 3]
+
+    def test_small_requests_skip_stage_one(self):
+        assert not cascade_filters(_pairs("a", 3), top_k=3, threshold=None)
+        assert cascade_filters(_pairs("a", 4), top_k=3, threshold=None)
+        assert cascade_filters(_pairs("a", 1), top_k=0, threshold=0.5)
+
+    def test_filtered_pairs_rank_below_stage_two(self):
+        merged = merge_cascade_scores(np.array([0.9, 0.2, 0.8]), [1], np.array([0.05]))
+
+        assert merged[1] == np.float32(0.05)
+        assert list(np.argsort(-merged)) == [1, 0, 2]
+
+
+class TestOrchestratorCascade:
+    def _orchestrator(self, minimal_config, top_k=2):
+        minimal_config.cascade = CascadeConfig(
+            enabled=True,
+            instances=[ModelConfig(name="small-model", device="cpu")],
+            top_k=top_k,
+        )
+        orchestrator = OrchestratorService(minimal_config, "test")
+        orchestrator.setup()
+        orchestrator.cascade_pipeline = MagicMock()
+        orchestrator.pipeline = MagicMock()
+        return orchestrator
+
+    def test_setup_builds_stage_one_pipeline(self, minimal_config):
+        minimal_config.cascade = CascadeConfig(
+            enabled=True, instances=[ModelConfig(name="small-model", device="cpu")]
+        )
+        orchestrator = OrchestratorService(minimal_config, "test")
+        orchestrator.setup()
+
+        stage_config = orchestrator.cascade_pipeline.config
+        assert stage_config.model_pool.instances[0].name == "small-model"
+        assert orchestrator.cascade_pipeline.tokenizer_pool.model_name == "small-model"
+        assert orchestrator.pipeline.config.model_pool == minimal_config.model_pool
+
+    def test_only_survivors_reach_stage_two(self, minimal_config):
+        orchestrator = self._orchestrator(minimal_config)
+        pairs = _pairs("q", 4)
+        orchestrator.cascade_pipeline.schedule.return_value = InferenceResult(
+            scores=np.array([0.2, 0.9, 0.1, 0.6], dtype=np.float32)
+        )
+        orchestrator.pipeline.schedule.return_value = InferenceResult(
+            scores=np.array([0.3, 0.4], dtype=np.float32)
+        )
+
+        result = orchestrator.schedule(pairs)
+
+        orchestrator.pipeline.schedule.assert_called_once_with(
+            [pairs[1], pairs[3]], deadline_ms=None, cancel_event=None, priority=None
+        )
+        assert result.scores[[1, 3]].tolist() == [np.float32(0.3), np.float32(0.4)]
+        assert result.scores[0] < 0 and result.scores[2] < 0
+        assert result.batch_size == 4
+        stage_pairs = orchestrator.metrics.prom_cascade_pairs
+        assert stage_pairs.labels(stage="stage1")._value.get() == 4
+        assert stage_pairs.labels(stage="stage2")._value.get() == 2
+
+    def test_small_request_bypasses_stage_one(self, minimal_config):
+        orchestrator = self._orchestrator(minimal_config, top_k=8)
+        orchestrator.pipeline.schedule.return_value = InferenceResult(scores=np.array([0.5]))
+
+        orchestrator.schedule(_pairs("q", 1))
+
+        orchestrator.cascade_pipeline.schedule.assert_not_called()
+
+    def test_async_cascade(self, minimal_config):
+        orchestrator = self._orchestrator(minimal_config, top_k=1)
+        orchestrator.cascade_pipeline.schedule_async = AsyncMock(
+            return_value=InferenceResult(scores=np.array([0.2, 0.9], dtype=np.float32))
+        )
+        orchestrator.pipeline.schedule_async = AsyncMock(
+            return_value=InferenceResult(scores=np.array([0.7], dtype=np.float32))
+        )
+
+        result = asyncio.run(orchestrator.schedule_async(_pairs("q", 2), deadline_ms=500.0))
+
+        args, kwargs = orchestrator.pipeline.schedule_async.call_args
+        assert args[0] == [("q", "doc1")]
+        assert kwargs["deadline_ms"] <= 500.0
+        assert result.scores[1] == np.float32(0.7)
+        assert result.scores[0] < 0
@@ -49,6 +49,92 @@ class TestConfigLoader:
             assert config.model_pool.instances[0].name == "model1"
             assert config.model_pool.instances[1].name == "model2"
 
+    def test_load_config_merge_max_tokens(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "test.yaml"
+            config_data = {
+                "model_pool": {"instances": [{"name": "model1"}], "merge_max_tokens": 4096}
+            }
+            with open(config_path, "w") as f:
+                yaml.dump(config_data, f)
+
+            config = load_config(str(config_path))
+            assert config.model_pool.merge_max_tokens == 4096
+
+    def test_load_config_packed_instances(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "test.yaml"
+            config_data = {
+                "model_pool": {
+                    "instances": [{"name": "model1"}, {"name": "model2", "packed": True}]
+                }
+            }
+            with open(config_path, "w") as f:
+                yaml.dump(config_data, f)
+
+            config = load_config(str(config_path))
+            assert config.model_pool.instances[0].packed is False
+            assert config.model_pool.instances[1].packed is True
+
+    def test_load_config_early_exit(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "test.yaml"
+            config_data = {
+                "model_pool": {
+                    "instances": [
+                        {
+                            "name": "model1",
+                            "early_exit_heads": "heads.pt",
+                            "early_exit_confidence": 0.9,
+                        }
+                    ]
+                }
+            }
+            with open(config_path, "w") as f:
+                yaml.dump(config_data, f)
+
+            config = load_config(str(config_path))
+            assert config.model_pool.instances[0].early_exit_heads == "heads.pt"
+            assert config.model_pool.instances[0].early_exit_confidence == 0.9
+
+    def test_load_config_fork_server(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "test.yaml"
+            config_data = {"model_pool": {"instances": [{"name": "model1"}], "fork_server": True}}
+            with open(config_path, "w") as f:
+                yaml.dump(config_data, f)
+
+            config = load_config(str(config_path))
+            assert config.model_pool.fork_server is True
+
+    def test_load_config_pin_cpus(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "test.yaml"
+            config_data = {"model_pool": {"instances": [{"name": "model1"}], "pin_cpus": True}}
+            with open(config_path, "w") as f:
+                yaml.dump(config_data, f)
+
+            config = load_config(str(config_path))
+            assert config.model_pool.pin_cpus is True
+
+    def test_load_config_supervision(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "test.yaml"
+            config_data = {
+                "model_pool": {
+                    "instances": [{"name": "model1"}],
+                    "supervise_interval_s": 0.5,
+                    "max_request_retries": 2,
+                }
+            }
+            with open(config_path, "w") as f:
+                yaml.dump(config_data, f)
+
+            config = load_config(str(config_path))
+            assert config.model_pool.supervise_interval_s == 0.5
+            assert config.model_pool.max_request_retries == 2
+            assert config.tokenizer_pool.max_request_retries == 1
+
     def test_load_config_with_base_config(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             base_config_path = Path(tmpdir) / "base_config.yaml"
@@ -82,6 +168,9 @@ class TestConfigLoader:
                     "max_batch_size": 16,
                     "timeout_ms": 200,
                     "length_aware": True,
+                    "adaptive_timeout": True,
+                    "target_p99_ms": 150.0,
+                    "max_timeout_ms": 50.0,
                 }
             }
             with open(config_path, "w") as f:
@@ -92,6 +181,10 @@ class TestConfigLoader:
             assert config.batching.max_batch_size == 16
             assert config.batching.timeout_ms == 200
             assert config.batching.length_aware is True
+            assert config.batching.adaptive_timeout is True
+            assert config.batching.target_p99_ms == 150.0
+            assert config.batching.min_timeout_ms == 1.0
+            assert config.batching.max_timeout_ms == 50.0
 
     def test_load_config_tokenizer_pool(self):
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -122,6 +215,7 @@ class TestConfigLoader:
                     "grpc_port": 60000,
                     "http_port": 9000,
                     "grpc_workers": 20,
+                    "stream_window": 4,
                 }
             }
             with open(config_path, "w") as f:
@@ -132,6 +226,90 @@ class TestConfigLoader:
             assert config.server.grpc_port == 60000
             assert config.server.http_port == 9000
             assert config.server.grpc_workers == 20
+            assert config.server.stream_window == 4
+
+    def test_load_config_admission(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "test.yaml"
+            config_data = {
+                "admission": {
+                    "enabled": True,
+                    "max_queue_delay_ms": 250.0,
+                    "batch_queue_size": 64,
+                    "worker_queue_size": 4,
+                }
+            }
+            with open(config_path, "w") as f:
+                yaml.dump(config_data, f)
+
+            config = load_config(str(config_path))
+            assert config.admission.enabled is True
+            assert config.admission.max_queue_delay_ms == 250.0
+            assert config.admission.batch_queue_size == 64
+            assert config.admission.worker_queue_size == 4
+            assert config.admission.tokenizer_queue_size == 0
+
+    def test_load_config_cascade(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "test.yaml"
+            config_data = {
+                "cascade": {
+                    "enabled": True,
+                    "instances": [{"name": "small", "device": "cpu", "backend": "pytorch"}],
+                    "top_k": 20,
+                    "threshold": 0.1,
+                }
+            }
+            with open(config_path, "w") as f:
+                yaml.dump(config_data, f)
+
+            config = load_config(str(config_path))
+            assert config.cascade.enabled is True
+            assert config.cascade.instances[0].name == "small"
+            assert config.cascade.instances[0].backend == "pytorch"
+            assert config.cascade.top_k == 20
+            assert config.cascade.threshold == 0.1
+            assert config.cascade.tokenizer_workers == 1
+
+    def test_load_config_autoscale(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "test.yaml"
+            config_data = {
+                "autoscale": {
+                    "enabled": True,
+                    "model_max_workers": 6,
+                    "max_total_workers": 8,
+                    "scale_up_wait_ms": 0,
+                }
+            }
+            with open(config_path, "w") as f:
+                yaml.dump(config_data, f)
+
+            config = load_config(str(config_path))
+            assert config.autoscale.enabled is True
+            assert config.autoscale.model_max_workers == 6
+            assert config.autoscale.max_total_workers == 8
+            assert config.autoscale.scale_up_wait_ms == 0.0
+            assert config.autoscale.tokenizer_min_workers == 1
+            assert config.autoscale.sustain_intervals == 3
+
+    def test_load_config_priority(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "test.yaml"
+            config_data = {
+                "priority": {
+                    "enabled": True,
+                    "default_class": "batch",
+                    "aging_ms": {"best_effort": 2000},
+                }
+            }
+            with open(config_path, "w") as f:
+                yaml.dump(config_data, f)
+
+            config = load_config(str(config_path))
+            assert config.priority.enabled is True
+            assert config.priority.default_class == "batch"
+            assert config.priority.aging_ms == {"best_effort": 2000.0}
 
     def test_load_config_pipeline(self):
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -0,0 +1,149 @@
+import asyncio
+import queue
+import threading
+import time
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from src.server.dto import BatchConfig, InferenceResult, PendingRequest
+from src.server.dto.pipeline import PipelineRequest, TokenizationQueueItem
+from src.server.grpc import InferenceServicer
+from src.server.pool.model_pool import _InferenceWorkItem
+from src.server.pool.tokenizer_pool import TokenizerPool
+from src.server.services.orchestrator_service import OrchestratorService
+from src.server.utils.admission import RequestExpiredError
+
+
+class TestRequestExpiry:
+    def test_deadline_and_cancellation(self):
+        now = time.perf_counter()
+        assert not PipelineRequest(request_id=0, pairs=[]).is_expired()
+        assert not PipelineRequest(request_id=0, pairs=[], deadline=now + 60).is_expired(now)
+        assert PipelineRequest(request_id=0, pairs=[], deadline=now).is_expired(now)
+
+        cancel_event = threading.Event()
+        req = PendingRequest(pairs=[], result_future=threading.Event(), cancel_event=cancel_event)
+        assert not req.is_expired()
+        cancel_event.set()
+        assert req.is_expired()
+
+    def test_complete_sets_event_and_runs_callbacks(self):
+        calls = []
+        pending = PendingRequest(pairs=[], result_future=threading.Event())
+        pipeline = PipelineRequest(request_id=0, pairs=[])
+        for req in (pending, pipeline):
+            req.done_callbacks.append(lambda: calls.append(1))
+            req.complete()
+        assert pending.result_future.is_set()
+        assert pipeline.result_event.is_set()
+        assert len(calls) == 2
+
+    def test_worker_item_expiry(self):
+        assert _InferenceWorkItem(None, 1).expired_error() is None
+        expired = _InferenceWorkItem(None, 1, deadline=time.perf_counter() - 1).expired_error()
+        assert isinstance(expired, RequestExpiredError)
+
+    def test_tokenizer_pool_rejects_expired_submission(self):
+        pool = TokenizerPool(model_name="test-model", num_workers=1)
+        pool._is_started = True
+        pool._input_queues = [queue.Queue()]
+        request = PipelineRequest(request_id=7, pairs=[("q", "d")], deadline=0.0)
+
+        with pytest.raises(RequestExpiredError):
+            pool.submit_pipeline(TokenizationQueueItem(request=request, pairs=request.pairs))
+
+        assert pool._input_queues[0].empty()
+        assert not pool._pending_items
+
+
+class TestPipelineExpiry:
+    def test_batch_drops_expired_requests(self, minimal_config):
+        minimal_config.batching = BatchConfig(enabled=True, max_batch_size=8)
+        orchestrator = OrchestratorService(minimal_config, "test")
+        orchestrator.setup()
+        pipeline = orchestrator.pipeline
+        pipeline.tokenizer_pool = MagicMock()
+
+        expired = PendingRequest(
+            pairs=[("q", "d")], result_future=threading.Event(), deadline=time.perf_counter()
+        )
+        pipeline._process_batch([expired])
+
+        assert expired.result_future.is_set()
+        assert isinstance(expired.error, RequestExpiredError)
+        pipeline.tokenizer_pool.submit_pipeline.assert_not_called()
+        expired_counter = orchestrator.metrics.prom_expired_requests
+        assert expired_counter.labels(stage="batch")._value.get() == 1
+
+        orchestrator.stop()
+
+    def test_deadline_reaches_pipeline_request(self, minimal_config):
+        orchestrator = OrchestratorService(minimal_config, "test")
+        orchestrator.setup()
+        pipeline = orchestrator.pipeline
+        pipeline._tokenization_started = pipeline._inference_started = True
+        submitted = []
+
+        def submit(item):
+            submitted.append(item.request)
+            item.request.inference_result = InferenceResult(scores=np.array([0.5]))
+            item.request.complete()
+
+        pipeline.tokenizer_pool = MagicMock()
+        pipeline.tokenizer_pool.submit_pipeline.side_effect = submit
+
+        before = time.perf_counter()
+        orchestrator.schedule([("q", "d")], deadline_ms=2000.0)
+
+        assert before + 1.9 < submitted[0].deadline < time.perf_counter() + 2.0
+
+    def test_async_cancellation_sets_cancel_event(self, minimal_config):
+        orchestrator = OrchestratorService(minimal_config, "test")
+        orchestrator.setup()
+        pipeline = orchestrator.pipeline
+        captured = {}
+
+        def submit(pairs, done_callback=None, deadline=None, cancel_event=None, priority=0):
+            captured["cancel_event"] = cancel_event
+            return pipeline._create_request(pairs)
+
+        pipeline._submit_direct = submit
+
+        async def cancel_in_flight():
+            task = asyncio.create_task(orchestrator.schedule_async([("q", "d")]))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(cancel_in_flight())
+
+        assert captured["cancel_event"].is_set()
+
+
+class TestServicerCancellation:
+    def test_rpc_termination_cancels_request(self):
+        callbacks = []
+        context = MagicMock()
+        context.time_remaining.return_value = 1.5
+        context.add_callback.side_effect = callbacks.append
+
+        handler = MagicMock()
+        handler.schedule.return_value = InferenceResult(scores=np.array([0.1]))
+        servicer = InferenceServicer(handler)
+        request = MagicMock()
+        request.pairs = [MagicMock(query="q", document="d")]
+        request.HasField.return_value = False
+        request.packed_scores = False
+        request.priority = 0
+
+        servicer.Infer(request, context)
+
+        kwargs = handler.schedule.call_args.kwargs
+        assert kwargs["deadline_ms"] == 1500.0
+        assert not kwargs["cancel_event"].is_set()
+        for callback in callbacks:
+            callback()
+        assert kwargs["cancel_event"].is_set()
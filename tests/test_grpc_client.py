@@ -1,4 +1,26 @@
-from src.client.grpc_client import InferenceClient
+import asyncio
+import threading
+import time
+from concurrent import futures
+from unittest.mock import AsyncMock, MagicMock
+
+import grpc
+import numpy as np
+import pytest
+
+from src.client.grpc_client import AsyncInferenceClient, InferenceClient
+from src.proto import inference_pb2, inference_pb2_grpc
+from src.proto.packed import (
+    pack_pairs,
+    pack_scores,
+    pack_token_ids,
+    unpack_pairs,
+    unpack_scores,
+    unpack_token_ids,
+)
+from src.server.dto import InferenceResult
+from src.server.grpc import AioInferenceServicer, InferenceServicer
+from src.server.utils.admission import InvalidRequestError, OverloadedError, WorkerCrashedError
 
 
 class TestInferenceClient:
@@ -37,3 +59,415 @@ class TestInferenceClient:
             assert "status" in result
         except Exception:
             pass
+
+
+class TestRerank:
+    def _handler(self):
+        handler = MagicMock()
+        handler.schedule.side_effect = lambda pairs, **_: InferenceResult(
+            scores=np.array([len(doc) for _, doc in pairs], dtype=np.float32)
+        )
+        return handler
+
+    def test_servicer_rerank_top_k(self):
+        handler = self._handler()
+        servicer = InferenceServicer(handler)
+        request = inference_pb2.RerankRequest(query="q", documents=["aa", "a", "aaa"], top_k=2)
+
+        response = servicer.Rerank(request, None)
+
+        handler.schedule.assert_called_once_with(
+            [("q", "aa"), ("q", "a"), ("q", "aaa")],
+            deadline_ms=None,
+            cancel_event=None,
+            priority=None,
+        )
+        assert list(response.scores) == [2.0, 1.0, 3.0]
+        assert list(response.indices) == [2, 0]
+        assert response.num_pairs == 3
+
+    def test_servicer_empty_documents_returns_204(self):
+        handler = self._handler()
+        request = inference_pb2.RerankRequest(query="q")
+
+        response = InferenceServicer(handler).Rerank(request, None)
+        aio_response = asyncio.run(AioInferenceServicer(handler).Rerank(request, None))
+
+        handler.schedule.assert_not_called()
+        handler.schedule_async.assert_not_called()
+        assert response.status_code == aio_response.status_code == 204
+
+    def test_servicer_forwards_priority(self):
+        handler = self._handler()
+        servicer = InferenceServicer(handler)
+        request = inference_pb2.InferRequest(
+            pairs=[inference_pb2.QueryDocPair(query="q", document="d")],
+            priority=inference_pb2.PRIORITY_BEST_EFFORT,
+        )
+
+        servicer.Infer(request, None)
+
+        assert handler.schedule.call_args.kwargs["priority"] == "best_effort"
+
+    def test_client_rerank_roundtrip(self):
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+        inference_pb2_grpc.add_InferenceServiceServicer_to_server(
+            InferenceServicer(self._handler()), server
+        )
+        port = server.add_insecure_port("127.0.0.1:0")
+        server.start()
+        try:
+            with InferenceClient(host="127.0.0.1", port=port) as client:
+                scores, indices, latency = client.rerank("q", ["a", "aaa", "aa"], top_k=3)
+            assert scores == [1.0, 3.0, 2.0]
+            assert indices == [1, 2, 0]
+            assert latency > 0
+        finally:
+            server.stop(None)
+
+
+def _length_scores(pairs, **_) -> InferenceResult:
+    return InferenceResult(scores=np.array([len(doc) for _, doc in pairs], dtype=np.float32))
+
+
+def _chunk(chunk_id: int, docs: list[str]) -> inference_pb2.ScoreChunk:
+    return inference_pb2.ScoreChunk(
+        chunk_id=chunk_id,
+        pairs=[inference_pb2.QueryDocPair(query="q", document=d) for d in docs],
+    )
+
+
+class TestPackedEncoding:
+    def test_pairs_roundtrip(self):
+        pairs = [("what is python", "a language"), ("", "empty query"), ("q", "")]
+        assert unpack_pairs(pack_pairs(pairs)) == pairs
+
+        unicode_pairs = [("café", "naïve résumé"), ("日本", "東京 tower")]
+        packed = pack_pairs(unicode_pairs)
+        assert np.frombuffer(packed.offsets, dtype="<u4")[-1] == len(packed.text)
+        assert unpack_pairs(packed) == unicode_pairs
+
+    def test_rejects_bad_offsets(self):
+        packed = pack_pairs([("q", "doc")])
+        packed.num_pairs = 2
+        with pytest.raises(ValueError):
+            unpack_pairs(packed)
+
+        packed = pack_pairs([("q", "doc")])
+        packed.offsets = np.array([0, 3, 1], dtype="<u4").tobytes()
+        with pytest.raises(ValueError):
+            unpack_pairs(packed)
+
+    def test_scores_roundtrip(self):
+        scores = np.array([0.25, -1.5, 3.0], dtype=np.float32)
+        data = pack_scores(scores)
+        assert len(data) == 12
+        decoded = unpack_scores(data)
+        assert decoded.dtype == np.float32
+        np.testing.assert_array_equal(decoded, scores)
+
+    def test_servicer_packed_infer(self):
+        handler = MagicMock()
+        handler.schedule.side_effect = _length_scores
+        servicer = InferenceServicer(handler)
+        request = inference_pb2.InferRequest(
+            packed=pack_pairs([("q", "ab"), ("q", "abcd")]), packed_scores=True
+        )
+
+        response = servicer.Infer(request, None)
+
+        assert handler.schedule.call_args.args[0] == [("q", "ab"), ("q", "abcd")]
+        assert list(response.scores) == []
+        np.testing.assert_array_equal(unpack_scores(response.scores_f32), [2.0, 4.0])
+
+    def test_client_packed_roundtrip(self):
+        handler = MagicMock()
+        handler.schedule.side_effect = _length_scores
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+        inference_pb2_grpc.add_InferenceServiceServicer_to_server(
+            InferenceServicer(handler), server
+        )
+        port = server.add_insecure_port("127.0.0.1:0")
+        server.start()
+        try:
+            with InferenceClient(host="127.0.0.1", port=port) as client:
+                scores, _ = client.infer([("q", "a"), ("q", "abc")], packed=True)
+                plain, _ = client.infer([("q", "a"), ("q", "abc")])
+        finally:
+            server.stop(None)
+
+        assert isinstance(scores, np.ndarray)
+        np.testing.assert_array_equal(scores, [1.0, 3.0])
+        assert plain == [1.0, 3.0]
+
+
+def _length_token_scores(tokens, **_) -> InferenceResult:
+    return InferenceResult(scores=tokens.lengths.astype(np.float32))
+
+
+class TestPretokenizedInput:
+    def test_token_ids_roundtrip(self):
+        input_ids, lengths, token_type_ids = unpack_token_ids(
+            pack_token_ids([[2, 7, 3], [2, 5, 3, 6, 3]], [[0, 0, 0], [0, 0, 0, 1, 1]])
+        )
+        assert input_ids.tolist() == [2, 7, 3, 2, 5, 3, 6, 3]
+        assert lengths.tolist() == [3, 5]
+        assert token_type_ids.tolist() == [0, 0, 0, 0, 0, 0, 1, 1]
+
+        _, _, token_type_ids = unpack_token_ids(pack_token_ids([[2, 3]]))
+        assert token_type_ids is None
+
+    def test_rejects_inconsistent_lengths(self):
+        tokens = pack_token_ids([[2, 7, 3]])
+        tokens.lengths = np.array([4], dtype="<u4").tobytes()
+        with pytest.raises(ValueError):
+            unpack_token_ids(tokens)
+
+        tokens = pack_token_ids([[2, 7, 3]], [[0, 1]])
+        with pytest.raises(ValueError):
+            unpack_token_ids(tokens)
+
+    def test_servicer_routes_tokens(self):
+        handler = MagicMock()
+        handler.schedule_tokens.side_effect = _length_token_scores
+        servicer = InferenceServicer(handler)
+        request = inference_pb2.InferRequest(
+            tokens=pack_token_ids([[2, 7, 3], [2, 3]]), packed_scores=True
+        )
+
+        response = servicer.Infer(request, None)
+
+        handler.schedule.assert_not_called()
+        assert handler.schedule_tokens.call_args.args[0].input_ids.tolist() == [2, 7, 3, 2, 3]
+        np.testing.assert_array_equal(unpack_scores(response.scores_f32), [3.0, 2.0])
+
+    def test_client_infer_tokens(self):
+        handler = MagicMock()
+        handler.schedule_tokens.side_effect = _length_token_scores
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+        inference_pb2_grpc.add_InferenceServiceServicer_to_server(
+            InferenceServicer(handler), server
+        )
+        port = server.add_insecure_port("127.0.0.1:0")
+        server.start()
+        try:
+            with InferenceClient(host="127.0.0.1", port=port) as client:
+                scores, _ = client.infer_tokens([[2, 7, 3], [2, 5, 3, 6, 3]], priority="batch")
+                handler.schedule_tokens.side_effect = InvalidRequestError(
+                    "Token ids must be in [0, 10)"
+                )
+                with pytest.raises(grpc.RpcError) as error:
+                    client.infer_tokens([[2, 70, 3]])
+        finally:
+            server.stop(None)
+
+        np.testing.assert_array_equal(scores, [3.0, 5.0])
+        assert handler.schedule_tokens.call_args_list[0].kwargs["priority"] == "batch"
+        assert error.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+
+
+class _AbortError(Exception):
+    pass
+
+
+class TestInvalidArgument:
+    def _context(self, abort=MagicMock):
+        context = MagicMock()
+        context.time_remaining.return_value = None
+        context.abort = abort(side_effect=_AbortError)
+        return context
+
+    def test_unknown_priority_rejected_before_scheduling(self):
+        handler = MagicMock()
+        servicer = InferenceServicer(handler)
+        requests = [
+            (servicer.Infer, inference_pb2.InferRequest(priority=99)),
+            (servicer.Rerank, inference_pb2.RerankRequest(query="q", documents=["d"], priority=99)),
+        ]
+        for method, request in requests:
+            context = self._context()
+            with pytest.raises(_AbortError):
+                method(request, context)
+            assert context.abort.call_args.args[0] == grpc.StatusCode.INVALID_ARGUMENT
+
+        aio_servicer = AioInferenceServicer(handler)
+        context = self._context(AsyncMock)
+        request = inference_pb2.RerankRequest(query="q", documents=["d"], priority=99)
+        with pytest.raises(_AbortError):
+            asyncio.run(aio_servicer.Rerank(request, context))
+        assert context.abort.call_args.args[0] == grpc.StatusCode.INVALID_ARGUMENT
+        handler.schedule.assert_not_called()
+        handler.schedule_async.assert_not_called()
+
+    def test_inference_value_error_is_not_invalid_argument(self):
+        handler = MagicMock()
+        handler.schedule.side_effect = ValueError("shape mismatch")
+        context = self._context()
+        request = inference_pb2.InferRequest(
+            pairs=[inference_pb2.QueryDocPair(query="q", document="d")]
+        )
+
+        with pytest.raises(ValueError, match="shape mismatch"):
+            InferenceServicer(handler).Infer(request, context)
+        context.abort.assert_not_called()
+
+    def test_rerank_maps_invalid_request(self):
+        handler = MagicMock()
+        handler.schedule.side_effect = InvalidRequestError("bad input")
+        context = self._context()
+
+        with pytest.raises(_AbortError):
+            InferenceServicer(handler).Rerank(
+                inference_pb2.RerankRequest(query="q", documents=["d"]), context
+            )
+        assert context.abort.call_args.args[0] == grpc.StatusCode.INVALID_ARGUMENT
+
+
+class TestScoreStream:
+    def test_aio_stream_survives_cancelled_chunk(self):
+        async def schedule_async(pairs, **_):
+            if pairs[0][1] == "cancel":
+                raise asyncio.CancelledError
+            return _length_scores(pairs)
+
+        handler = MagicMock()
+        handler.schedule_async.side_effect = schedule_async
+        servicer = AioInferenceServicer(handler, stream_window=2)
+
+        async def chunks():
+            for chunk_id, doc in enumerate(["a", "cancel", "aaa"]):
+                yield _chunk(chunk_id, [doc])
+
+        async def collect():
+            return [result async for result in servicer.ScoreStream(chunks(), None)]
+
+        results = asyncio.run(asyncio.wait_for(collect(), timeout=5))
+
+        by_id = {result.chunk_id: result for result in results}
+        assert sorted(by_id) == [0, 1, 2]
+        assert by_id[1].status_code == 504
+        assert list(by_id[2].scores) == [3.0]
+
+    def test_client_stream_roundtrip(self):
+        handler = MagicMock()
+        handler.schedule.side_effect = _length_scores
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+        inference_pb2_grpc.add_InferenceServiceServicer_to_server(
+            InferenceServicer(handler, stream_window=3), server
+        )
+        port = server.add_insecure_port("127.0.0.1:0")
+        server.start()
+        try:
+            chunks = [[("q", "a" * (i + j)) for j in range(3)] for i in range(10)]
+            with InferenceClient(host="127.0.0.1", port=port) as client:
+                results = dict(client.score_stream(chunks, priority="batch"))
+        finally:
+            server.stop(None)
+
+        assert sorted(results) == list(range(10))
+        assert results[4] == [4.0, 5.0, 6.0]
+        assert handler.schedule.call_args.kwargs["priority"] == "batch"
+
+    def test_window_bounds_in_flight_chunks(self):
+        lock = threading.Lock()
+        active = [0, 0]
+
+        def schedule(pairs, **_):
+            with lock:
+                active[0] += 1
+                active[1] = max(active[1], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+            return _length_scores(pairs)
+
+        handler = MagicMock()
+        handler.schedule.side_effect = schedule
+        servicer = InferenceServicer(handler, stream_window=2)
+
+        responses = list(servicer.ScoreStream(iter([_chunk(i, ["ab"]) for i in range(8)]), None))
+
+        assert sorted(r.chunk_id for r in responses) == list(range(8))
+        assert active[1] == 2
+
+    def test_overloaded_chunk_is_retried(self):
+        handler = MagicMock()
+        handler.schedule.side_effect = [
+            OverloadedError("Batch queue full"),
+            _length_scores([("q", "abc")]),
+        ]
+        servicer = InferenceServicer(handler)
+
+        (response,) = servicer.ScoreStream(iter([_chunk(7, ["abc"])]), None)
+
+        assert response.chunk_id == 7
+        assert response.status_code == 200
+        assert list(response.scores) == [3.0]
+        assert handler.schedule.call_count == 2
+
+    def test_failed_chunk_reports_status(self):
+        handler = MagicMock()
+        handler.schedule.side_effect = WorkerCrashedError("worker 0 died")
+        servicer = InferenceServicer(handler)
+
+        (response,) = servicer.ScoreStream(iter([_chunk(1, ["a"])]), None)
+
+        assert response.status_code == 503
+        assert "worker 0 died" in response.error
+        assert list(response.scores) == []
+
+
+class TestAioServer:
+    def test_aio_servicer_awaits_schedule_async(self):
+        handler = MagicMock()
+        handler.schedule_async = AsyncMock(
+            side_effect=lambda pairs, **_: InferenceResult(
+                scores=np.array([len(doc) for _, doc in pairs], dtype=np.float32)
+            )
+        )
+
+        async def roundtrip():
+            server = grpc.aio.server()
+            inference_pb2_grpc.add_InferenceServiceServicer_to_server(
+                AioInferenceServicer(handler), server
+            )
+            port = server.add_insecure_port("127.0.0.1:0")
+            await server.start()
+            try:
+                async with AsyncInferenceClient(host="127.0.0.1", port=port) as client:
+                    return await asyncio.gather(
+                        client.infer([("q", "aa"), ("q", "a")]),
+                        client.rerank("q", ["a", "aaa"], top_k=1),
+                    )
+            finally:
+                await server.stop(None)
+
+        (scores, _), (rerank_scores, indices, _) = asyncio.run(roundtrip())
+
+        assert scores == [2.0, 1.0]
+        assert rerank_scores == [1.0, 3.0]
+        assert indices == [1]
+        handler.schedule.assert_not_called()
+
+    def test_aio_score_stream(self):
+        handler = MagicMock()
+        handler.schedule_async = AsyncMock(side_effect=_length_scores)
+
+        async def roundtrip():
+            server = grpc.aio.server()
+            inference_pb2_grpc.add_InferenceServiceServicer_to_server(
+                AioInferenceServicer(handler, stream_window=2), server
+            )
+            port = server.add_insecure_port("127.0.0.1:0")
+            await server.start()
+            try:
+                async with AsyncInferenceClient(host="127.0.0.1", port=port) as client:
+                    chunks = [[("q", "a" * i)] for i in range(1, 6)]
+                    return {cid: scores async for cid, scores in client.score_stream(chunks)}
+            finally:
+                await server.stop(None)
+
+        results = asyncio.run(roundtrip())
+
+        assert results == {i: [float(i + 1)] for i in range(5)}
+        handler.schedule.assert_not_called()
@@ -1,8 +1,14 @@
+import asyncio
+import threading
 import time
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
-from src.server.dto import BatchConfig
+import numpy as np
+import pytest
+
+from src.server.dto import BatchConfig, InferenceResult, TokenIdBatch
 from src.server.services.orchestrator_service import OrchestratorService
+from src.server.utils.pretokenized import TokenIdSpec
 
 
 class TestOrchestratorBatching:
@@ -52,7 +58,9 @@ class TestOrchestratorBatching:
 
         result = orchestrator.schedule([("query", "doc")])
 
-        orchestrator.pipeline.schedule.assert_called_once_with([("query", "doc")])
+        orchestrator.pipeline.schedule.assert_called_once_with(
+            [("query", "doc")], deadline_ms=None, cancel_event=None, priority=None
+        )
         assert result == mock_result
 
         orchestrator.stop()
@@ -66,3 +74,133 @@ class TestOrchestratorBatching:
 
         orchestrator.stop()
         time.sleep(0.1)
+
+
+class TestAsyncScheduling:
+    def test_schedule_async_delegates_to_pipeline(self, minimal_config):
+        orchestrator = OrchestratorService(minimal_config, "test")
+        orchestrator.setup()
+
+        mock_result = MagicMock()
+        orchestrator.pipeline = MagicMock()
+        orchestrator.pipeline.schedule_async = AsyncMock(return_value=mock_result)
+
+        result = asyncio.run(orchestrator.schedule_async([("query", "doc")]))
+
+        orchestrator.pipeline.schedule_async.assert_awaited_once_with(
+            [("query", "doc")], deadline_ms=None, cancel_event=None, priority=None
+        )
+        orchestrator.pipeline.schedule.assert_not_called()
+        assert result == mock_result
+
+    def test_schedule_async_resolved_by_pool_thread(self, minimal_config):
+        orchestrator = OrchestratorService(minimal_config, "test")
+        orchestrator.setup()
+        pipeline = orchestrator.pipeline
+        pipeline._tokenization_started = pipeline._inference_started = True
+
+        def submit(pairs, done_callback=None, deadline=None, cancel_event=None, priority=0):
+            request = pipeline._create_request(pairs)
+            request.done_callbacks.append(done_callback)
+
+            def finish():
+                request.inference_result = InferenceResult(scores=np.array([0.5]))
+                request.complete()
+
+            threading.Timer(0.05, finish).start()
+            return request
+
+        pipeline._submit_direct = submit
+
+        result = asyncio.run(orchestrator.schedule_async([("query", "doc")]))
+
+        assert result.scores.tolist() == [0.5]
+        assert result.total_ms > 0
+        assert not pipeline._pending_requests
+
+
+def _token_spec() -> TokenIdSpec:
+    return TokenIdSpec(
+        vocab_size=100,
+        max_length=16,
+        pad_token_id=0,
+        sep_token_id=3,
+        type_vocab_size=2,
+        input_names=("input_ids", "token_type_ids", "attention_mask"),
+    )
+
+
+def _token_ids(rows: list[list[int]]) -> TokenIdBatch:
+    return TokenIdBatch(
+        input_ids=np.array([t for row in rows for t in row], dtype="<i4"),
+        lengths=np.array([len(row) for row in rows], dtype="<u4"),
+    )
+
+
+class TestPretokenizedScheduling:
+    def _pipeline(self, minimal_config):
+        orchestrator = OrchestratorService(minimal_config, "test")
+        orchestrator.setup()
+        pipeline = orchestrator.pipeline
+        pipeline._inference_started = True
+        pipeline._token_id_spec = _token_spec()
+        pipeline.tokenizer_pool = MagicMock()
+        return orchestrator, pipeline
+
+    def test_schedule_tokens_bypasses_tokenizer(self, minimal_config):
+        orchestrator, pipeline = self._pipeline(minimal_config)
+        seen = []
+
+        def consume():
+            item = pipeline._inference_queue.get(timeout=5)
+            seen.append(item.tokenized_batch)
+            item.request.inference_result = InferenceResult(scores=np.array([0.25, 0.75]))
+            item.request.complete()
+
+        pipeline._adaptive_timeout = MagicMock()
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        result = orchestrator.schedule_tokens(_token_ids([[2, 7, 3, 8, 9, 3], [2, 5, 3, 6, 3]]))
+        consumer.join()
+
+        assert result.scores.tolist() == [0.25, 0.75]
+        pipeline._adaptive_timeout.record_arrival.assert_called_once()
+        pipeline.tokenizer_pool.submit_pipeline.assert_not_called()
+        batch = seen[0]
+        assert batch.features["input_ids"].tolist() == [[2, 7, 3, 8, 9, 3], [2, 5, 3, 6, 3, 0]]
+        assert batch.features["token_type_ids"].tolist() == [[0, 0, 0, 1, 1, 1], [0, 0, 0, 1, 1, 0]]
+        assert batch.features["attention_mask"].tolist() == [[1] * 6, [1] * 5 + [0]]
+        assert batch.real_tokens == 11 and batch.padded_tokens == 1
+        assert not pipeline._pending_requests
+
+    def test_schedule_tokens_async(self, minimal_config):
+        orchestrator, pipeline = self._pipeline(minimal_config)
+
+        def consume():
+            item = pipeline._inference_queue.get(timeout=5)
+            item.request.inference_result = InferenceResult(scores=np.array([0.5]))
+            item.request.complete()
+
+        pipeline._adaptive_timeout = MagicMock()
+        threading.Thread(target=consume).start()
+        result = asyncio.run(orchestrator.schedule_tokens_async(_token_ids([[2, 7, 3]])))
+
+        assert result.scores.tolist() == [0.5]
+        pipeline._adaptive_timeout.record_arrival.assert_called_once()
+        pipeline.tokenizer_pool.submit_pipeline.assert_not_called()
+
+    def test_schedule_tokens_validates_against_model(self, minimal_config):
+        orchestrator, pipeline = self._pipeline(minimal_config)
+
+        for rows in ([[2, 100, 3]], [[2] * 17], [[]]):
+            with pytest.raises(ValueError):
+                orchestrator.schedule_tokens(_token_ids(rows))
+        with pytest.raises(ValueError):
+            orchestrator.schedule_tokens(
+                TokenIdBatch(
+                    input_ids=np.array([2, 7, 3], dtype="<i4"),
+                    lengths=np.array([3], dtype="<u4"),
+                    token_type_ids=np.array([0, 0, 2], dtype="u1"),
+                )
+            )
+        assert pipeline._inference_queue.empty()
@@ -105,7 +105,9 @@ class TestOrchestratorServiceSchedule:
 
         result = orchestrator.schedule([("query", "document")])
 
-        orchestrator.pipeline.schedule.assert_called_once_with([("query", "document")])
+        orchestrator.pipeline.schedule.assert_called_once_with(
+            [("query", "document")], deadline_ms=None, cancel_event=None, priority=None
+        )
         assert result == mock_result
 
         orchestrator.stop()
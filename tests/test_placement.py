@@ -0,0 +1,100 @@
+import os
+
+from src.server.dto import ModelConfig, PoolConfig
+from src.server.services.orchestrator_service import OrchestratorService
+from src.server.utils.placement import (
+    WorkerPlacement,
+    apply_placement,
+    detect_topology,
+    parse_cpulist,
+    plan_placement,
+)
+
+TWO_NODES = [(0, list(range(8))), (1, list(range(8, 16)))]
+
+
+def _cores(placements: list[WorkerPlacement]) -> list[list[int]]:
+    return [list(p.cores) for p in placements]
+
+
+class TestTopology:
+    def test_parse_cpulist(self):
+        assert parse_cpulist("0-3,8,10-11\n") == [0, 1, 2, 3, 8, 10, 11]
+        assert parse_cpulist("") == []
+
+    def test_detect_topology_reads_numa_nodes(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("os.sched_getaffinity", lambda pid: {0, 1, 2, 5})
+        for node, cpus in [(0, "0-2"), (1, "3-5"), (10, "6-7")]:
+            (tmp_path / f"node{node}").mkdir()
+            (tmp_path / f"node{node}" / "cpulist").write_text(cpus)
+
+        assert detect_topology(tmp_path) == [(0, [0, 1, 2]), (1, [5])]
+
+    def test_detect_topology_without_numa(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("os.sched_getaffinity", lambda pid: {3, 1})
+
+        assert detect_topology(tmp_path) == [(None, [1, 3])]
+
+
+class TestPlanPlacement:
+    def test_disjoint_cores_within_numa_nodes(self):
+        tokenizer, model = plan_placement(2, 4, topology=TWO_NODES)
+
+        assert _cores(tokenizer) == [[14], [15]]
+        assert _cores(model) == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9, 10], [11, 12, 13]]
+        assert [p.numa_node for p in model] == [0, 0, 1, 1]
+        assert all(p.num_threads == len(p.cores) for p in model)
+
+    def test_tokenizer_cores_per_worker(self):
+        tokenizer, model = plan_placement(
+            2, 2, tokenizer_cores=2, topology=[(None, list(range(8)))]
+        )
+
+        assert _cores(tokenizer) == [[4, 5], [6, 7]]
+        assert _cores(model) == [[0, 1], [2, 3]]
+        assert model[0].numa_node is None
+
+    def test_oversubscribed_workers_share_cores(self):
+        tokenizer, model = plan_placement(2, 3, topology=[(0, [0, 1])])
+
+        assert _cores(model) == [[0], [1], [0]]
+        assert _cores(tokenizer) == [[0], [1]]
+
+
+class TestApplyPlacement:
+    def test_pins_affinity_and_threads(self, monkeypatch):
+        pinned = {}
+        monkeypatch.setattr("os.sched_setaffinity", lambda pid, cores: pinned.update(cores=cores))
+        monkeypatch.setattr("torch.set_num_threads", lambda n: pinned.update(threads=n))
+        monkeypatch.delenv("OMP_NUM_THREADS", raising=False)
+
+        apply_placement(WorkerPlacement(cores=(2, 3, 4)), torch_threads=True)
+
+        assert pinned == {"cores": (2, 3, 4), "threads": 3}
+        assert os.environ["OMP_NUM_THREADS"] == "3"
+
+
+class TestOrchestratorPlacement:
+    def test_pools_receive_disjoint_placements(self, minimal_config, monkeypatch):
+        monkeypatch.setattr(
+            "src.server.utils.placement.detect_topology", lambda: [(0, list(range(8)))]
+        )
+        minimal_config.model_pool = PoolConfig(
+            instances=[ModelConfig(name="m", device="cpu") for _ in range(2)], pin_cpus=True
+        )
+        minimal_config.tokenizer_pool.num_workers = 2
+        orchestrator = OrchestratorService(minimal_config, "test")
+
+        orchestrator.setup()
+
+        tokenizer_info = orchestrator.tokenizer_pool.get_info()["placement"]
+        model_info = orchestrator.pool.get_info()["placement"]
+        assert [p["cores"] for p in tokenizer_info] == [[6], [7]]
+        assert [p["cores"] for p in model_info] == [[0, 1, 2], [3, 4, 5]]
+
+    def test_unpinned_by_default(self, minimal_config):
+        orchestrator = OrchestratorService(minimal_config, "test")
+
+        orchestrator.setup()
+
+        assert orchestrator.pool.get_info()["placement"] == []
@@ -1,7 +1,35 @@
+import multiprocessing as mp
+import queue
+import threading
+import time
+from collections import deque
+from unittest.mock import MagicMock
+
+import numpy as np
 import pytest
 
-from src.server.dto import ModelConfig, PoolConfig
-from src.server.pool.model_pool import ModelPool
+from src.server.dto import InferenceResult, ModelConfig, PoolConfig, TokenizedBatch, WorkItem
+from src.server.dto.pipeline import InferenceQueueItem, PipelineRequest, TokenizationQueueItem
+from src.server.pool.model_pool import _STOP, ModelPool, _drain_work, _InferenceWorkItem
+from src.server.pool.routing import WorkerRouter
+from src.server.pool.tokenizer_pool import TokenizerPool
+from src.server.utils.admission import OverloadedError, WorkerCrashedError
+from src.server.worker.model_worker import ModelWorker, _merge_batches
+
+
+def _batch(rows: int, seq: int) -> TokenizedBatch:
+    mask = np.ones((rows, seq), dtype=np.int8)
+    return TokenizedBatch(
+        features={"input_ids": np.full((rows, seq), 7, dtype=np.int16), "attention_mask": mask},
+        batch_size=rows,
+        max_seq_length=seq,
+        total_tokens=rows * seq,
+        real_tokens=rows * seq,
+        padded_tokens=0,
+        padding_ratio=0.0,
+        avg_seq_length=float(seq),
+        tokenize_time_ms=0.0,
+    )
 
 
 class TestModelPool:
@@ -72,3 +100,350 @@ class TestModelPool:
         pool = ModelPool(config)
 
         pool.stop()
+
+
+class TestWorkerRouter:
+    def test_round_robin(self):
+        router = WorkerRouter(3)
+        assert [router.acquire(10) for _ in range(4)] == [0, 1, 2, 0]
+
+    def test_least_requests_skips_busy_worker(self):
+        router = WorkerRouter(2, "least_requests")
+        busy = router.acquire(512)
+        assert router.acquire(16) != busy
+        router.release(busy, 512)
+        assert router.acquire(16) == busy
+
+    def test_least_tokens_prefers_light_worker(self):
+        router = WorkerRouter(2, "least_tokens")
+        heavy = router.acquire(4096)
+        light = router.acquire(64)
+        router.acquire(64)
+        assert router.acquire(64) == light
+        assert heavy != light
+
+    def test_power_of_two_picks_less_loaded(self):
+        router = WorkerRouter(2, "power_of_two")
+        first = router.acquire(1000)
+        assert all(router.select() != first for _ in range(10))
+
+    def test_legacy_strategy_alias(self):
+        assert WorkerRouter(2, "smart_idle").strategy == "least_requests"
+
+    def test_pool_uses_configured_strategy(self):
+        config = PoolConfig(
+            instances=[ModelConfig(name="cross-encoder/ms-marco-MiniLM-L-6-v2", device="cpu")] * 2,
+            routing_strategy="least_tokens",
+        )
+        info = ModelPool(config).get_info()
+        assert info["routing_strategy"] == "least_tokens"
+        assert [w["outstanding_requests"] for w in info["worker_load"]] == [0, 0]
+
+    def test_submit_holds_tokens_until_result(self):
+        pool = ModelPool(PoolConfig(instances=[ModelConfig(name="m", device="cpu")] * 2))
+        pool._is_started = True
+        pool._input_queues = [queue.Queue(maxsize=1), queue.Queue(maxsize=1)]
+        pool._output_queue = queue.Queue()
+
+        pool.submit(_InferenceWorkItem(_batch(2, 8), "a"))
+        pool._input_queues[1].put(_STOP)
+        with pytest.raises(OverloadedError):
+            pool.submit(_InferenceWorkItem(_batch(1, 8), "b"))
+        assert [w["outstanding_tokens"] for w in pool._router.get_load()] == [16, 0]
+
+        pool._output_queue.put(("a", None, None))
+        thread = threading.Thread(target=pool._result_loop)
+        thread.start()
+        deadline = time.perf_counter() + 5
+        while pool._router.get_load()[0]["outstanding_tokens"] and time.perf_counter() < deadline:
+            time.sleep(0.01)
+        pool._shutdown_event.set()
+        thread.join()
+
+        assert [w["outstanding_tokens"] for w in pool._router.get_load()] == [0, 0]
+
+
+class TestWorkerMerge:
+    def test_drain_respects_token_budget(self):
+        input_queue = queue.Queue()
+        for req_id, seq in [(1, 10), (2, 20), (3, 40)]:
+            input_queue.put(_InferenceWorkItem(_batch(2, seq), req_id))
+
+        first = _InferenceWorkItem(_batch(2, 10), 0)
+        items, carried = _drain_work(first, input_queue, merge_max_tokens=120)
+
+        assert [item.req_id for item in items] == [0, 1, 2]
+        assert carried.req_id == 3
+
+    def test_drain_stops_at_control_message(self):
+        input_queue = queue.Queue()
+        input_queue.put(_STOP)
+        input_queue.put(_InferenceWorkItem(_batch(1, 4), 1))
+
+        items, carried = _drain_work(_InferenceWorkItem(_batch(1, 4), 0), input_queue, 1000)
+
+        assert len(items) == 1
+        assert carried == _STOP
+
+    def test_merge_repads_to_common_length(self):
+        merged = _merge_batches([_batch(2, 3), _batch(1, 5)])
+
+        assert merged.features["input_ids"].shape == (3, 5)
+        assert merged.features["input_ids"].dtype == np.int16
+        assert merged.features["attention_mask"][:2, 3:].sum() == 0
+        assert merged.real_tokens == 11
+        assert merged.padded_tokens == 4
+
+    def test_process_many_splits_scores(self):
+        worker = ModelWorker(0, ModelConfig(name="m", device="cpu"))
+        worker._backend = MagicMock()
+        worker._backend.infer_with_tokenized.side_effect = lambda batch: InferenceResult(
+            scores=np.arange(batch.batch_size, dtype=np.float32),
+            t_model_inference_ms=1.0,
+            batch_size=batch.batch_size,
+        )
+
+        results = worker.process_many(
+            [WorkItem(req_id=5, tokenized_batch=_batch(2, 3)), WorkItem(7, _batch(3, 6))]
+        )
+
+        worker._backend.infer_with_tokenized.assert_called_once()
+        assert [r.req_id for r in results] == [5, 7]
+        assert results[0].scores.tolist() == [0.0, 1.0]
+        assert results[1].scores.tolist() == [2.0, 3.0, 4.0]
+        assert results[0].total_tokens == 12
+        assert results[1].batch_size == 3
+
+
+class TestForkServer:
+    def test_identical_instances_share_one_backend(self, monkeypatch):
+        loaded = []
+        monkeypatch.setattr(
+            "src.server.pool.model_pool.load_backend",
+            lambda config: (
+                loaded.append(MagicMock(**{"share_memory.return_value": True})) or loaded[-1]
+            ),
+        )
+        config = PoolConfig(
+            instances=[
+                ModelConfig(name="m", device="cpu"),
+                ModelConfig(name="m", device="cpu", max_length=128),
+                ModelConfig(name="m", device="cpu"),
+            ],
+            fork_server=True,
+        )
+        pool = ModelPool(config)
+
+        preloaded = pool._preload_backends()
+
+        assert pool._can_fork_workers()
+        assert len(loaded) == 2
+        assert preloaded[0] is preloaded[2] is loaded[0]
+        assert preloaded[1] is loaded[1]
+        for backend in loaded:
+            backend.share_memory.assert_called_once()
+
+    def test_unshareable_backend_loads_per_worker(self, monkeypatch):
+        backend = MagicMock(**{"share_memory.return_value": False})
+        monkeypatch.setattr("src.server.pool.model_pool.load_backend", lambda config: backend)
+        config = PoolConfig(instances=[ModelConfig(name="m", device="cpu")] * 2, fork_server=True)
+
+        assert ModelPool(config)._preload_backends() == {}
+
+    def test_replacement_workers_spawn_instead_of_fork(self):
+        config = PoolConfig(instances=[ModelConfig(name="m", device="cpu")] * 2, fork_server=True)
+        pool = ModelPool(config)
+        pool._mp_context = mp.get_context("fork")
+        pool._processes = [MagicMock(), MagicMock()]
+        pool._input_queues = [MagicMock(), MagicMock()]
+        pool._ready_events = [MagicMock(), MagicMock()]
+        spawned = []
+        pool._spawn_worker = lambda worker_id, backend=None, ctx=None: (
+            spawned.append((worker_id, backend, ctx.get_start_method()))
+            or (MagicMock(), MagicMock(), MagicMock())
+        )
+
+        pool._install_worker(1)
+        pool._install_worker(2)
+
+        assert spawned == [(1, None, "spawn"), (2, None, "spawn")]
+
+    def test_accelerator_workers_do_not_fork(self, monkeypatch):
+        monkeypatch.setattr("src.server.pool.model_pool.resolve_device", lambda device: device)
+        config = PoolConfig(instances=[ModelConfig(name="m", device="mps")], fork_server=True)
+
+        assert not ModelPool(config)._can_fork_workers()
+        assert not ModelPool(PoolConfig(instances=config.instances))._can_fork_workers()
+
+    def test_worker_reuses_preloaded_backend(self, monkeypatch):
+        backend = MagicMock()
+        monkeypatch.setattr(
+            "src.server.worker.model_worker.load_backend", MagicMock(side_effect=AssertionError)
+        )
+        worker = ModelWorker(0, ModelConfig(name="m", device="cpu"), backend)
+
+        worker.initialize()
+
+        assert worker.is_ready()
+        backend.warmup.assert_not_called()
+
+
+class TestWorkerSupervision:
+    def test_router_skips_unavailable_worker(self):
+        for strategy in ("round_robin", "least_requests", "least_tokens", "power_of_two"):
+            router = WorkerRouter(3, strategy)
+            router.set_available(1, False)
+            assert all(router.acquire(10) != 1 for _ in range(6))
+            router.set_available(1, True)
+            assert 1 in {router.acquire(1) for _ in range(20)}
+
+    def test_supervisor_restarts_dead_worker(self):
+        pool = ModelPool(PoolConfig(instances=[ModelConfig(name="m", device="cpu")] * 2))
+        pool._processes = [MagicMock(is_alive=lambda: True), MagicMock(is_alive=lambda: False)]
+        restarted = []
+
+        def restart(worker_id):
+            restarted.append(worker_id)
+            pool._shutdown_event.set()
+
+        pool._restart_worker = restart
+        pool._supervisor_loop(0.01)
+
+        assert restarted == [1]
+        assert pool._restart_counts == {1: 1}
+
+    def test_restart_spawns_under_fork_server(self):
+        model_pool = ModelPool(
+            PoolConfig(instances=[ModelConfig(name="m", device="cpu")] * 2, fork_server=True)
+        )
+        model_pool._mp_context = mp.get_context("fork")
+        tokenizer_pool = TokenizerPool(model_name="test-model", num_workers=2)
+        spawned = []
+
+        def spawn_worker(worker_id, ctx):
+            spawned.append((worker_id, ctx.get_start_method()))
+            return MagicMock(), MagicMock(), MagicMock()
+
+        for pool in (model_pool, tokenizer_pool):
+            pool._processes = [MagicMock(), MagicMock()]
+            pool._input_queues = [MagicMock(), MagicMock()]
+            pool._ready_events = [MagicMock(), MagicMock()]
+            pool._wait_ready = lambda ready, timeout_s: True
+            pool._spawn_worker = spawn_worker
+            pool._restart_worker(1)
+
+        assert spawned == [(1, "spawn"), (1, "spawn")]
+
+    def test_model_pool_requeues_then_fails_crashed_requests(self):
+        pool = ModelPool(
+            PoolConfig(instances=[ModelConfig(name="m", device="cpu")] * 2, max_request_retries=1)
+        )
+        pool._router.acquire(10)
+        pool._router.acquire(10)
+        fresh = InferenceQueueItem(PipelineRequest(request_id=1, pairs=[]), _batch(1, 4))
+        retried = InferenceQueueItem(
+            PipelineRequest(request_id=2, pairs=[], crash_retries=1), _batch(1, 4)
+        )
+        other = InferenceQueueItem(PipelineRequest(request_id=3, pairs=[]), _batch(1, 4))
+        pending = {1: (fresh, 0, 10), 2: (retried, 0, 0), 3: (other, 1, 10)}
+        backlog = deque()
+
+        pool._requeue_crashed(0, pending, backlog)
+
+        assert list(backlog) == [fresh]
+        assert fresh.request.crash_retries == 1
+        assert isinstance(retried.request.error, WorkerCrashedError)
+        assert retried.request.result_event.is_set()
+        assert list(pending) == [3]
+        assert [w["outstanding_requests"] for w in pool.get_info()["worker_load"]] == [0, 1]
+
+    def test_tokenizer_pool_redispatches_to_live_worker(self):
+        pool = TokenizerPool(model_name="test-model", num_workers=2)
+        pool._input_queues = [queue.Queue(), queue.Queue()]
+        request = PipelineRequest(request_id=7, pairs=[("q", "d")])
+        pool._pending_items[7] = TokenizationQueueItem(request=request, pairs=request.pairs)
+        pool._dispatch(7, pool._pending_items[7])
+        crashed = pool._assignments[7][0]
+
+        pool._router.set_available(crashed, False)
+        pool._requeue_crashed(crashed)
+
+        assert request.crash_retries == 1
+        assert pool._assignments[7][0] == 1 - crashed
+        assert pool._input_queues[1 - crashed].get_nowait()[0] == 7
+
+        pool._requeue_crashed(1 - crashed)
+        assert isinstance(request.error, WorkerCrashedError)
+        assert 7 not in pool._pending_items
+
+
+class TestPoolScaling:
+    def _started_pool(self, workers: int) -> ModelPool:
+        pool = ModelPool(PoolConfig(instances=[ModelConfig(name="m", device="cpu")] * workers))
+        pool._is_started = True
+        pool._input_queues = [queue.Queue() for _ in range(workers)]
+        pool._processes = [MagicMock(is_alive=lambda: True) for _ in range(workers)]
+        return pool
+
+    def test_router_add_worker(self):
+        router = WorkerRouter(1)
+        assert router.add_worker(available=False) == 1
+        assert all(router.acquire(1) == 0 for _ in range(3))
+        router.set_available(1, True)
+        assert {router.acquire(1) for _ in range(4)} == {0, 1}
+
+    def test_scale_down_drains_last_worker(self):
+        pool = self._started_pool(2)
+
+        assert pool.scale_down()
+
+        assert pool.num_workers == 1
+        assert pool._input_queues[1].get_nowait() == _STOP
+        assert all(pool._router.acquire(1) == 0 for _ in range(3))
+        assert not pool.scale_down()
+
+    def test_scale_up_reuses_exited_slot(self):
+        pool = self._started_pool(2)
+        added = []
+        pool._add_worker = lambda worker_id: added.append(worker_id) or True
+        pool.scale_down()
+        pool._processes[1].is_alive = lambda: False
+
+        assert pool.scale_up()
+        assert pool.scale_up()
+
+        assert added == [1, 2]
+        assert pool.num_workers == 3
+        assert pool._retired == set()
+        assert pool._crashed_workers.get_nowait() == 1
+
+    def test_scale_up_spawns_under_fork_server(self):
+        pool = self._started_pool(2)
+        pool.config.fork_server = True
+        pool._mp_context = mp.get_context("fork")
+        pool._ready_events = [MagicMock(), MagicMock()]
+        pool._wait_ready = lambda ready, timeout_s: True
+        spawned = []
+        pool._spawn_worker = lambda worker_id, ctx: (
+            spawned.append((worker_id, ctx.get_start_method()))
+            or (MagicMock(), MagicMock(), MagicMock())
+        )
+
+        assert pool.scale_up()
+
+        assert spawned == [(2, "spawn")]
+        assert pool.num_workers == 3
+
+    def test_tokenizer_worker_stops_after_outstanding_results(self):
+        pool = TokenizerPool(model_name="test-model", num_workers=2)
+        pool._is_started = True
+        pool._processes = [MagicMock(), MagicMock()]
+        pool._input_queues = [queue.Queue(), queue.Queue()]
+        pool._assignments[5] = (1, 1)
+
+        assert pool.scale_down()
+        assert pool._input_queues[1].empty()
+
+        pool._assignments.pop(5)
+        pool._stop_if_drained(1)
+        assert pool._input_queues[1].get_nowait() == _STOP
@@ -1,3 +1,5 @@
+import numpy as np
+
 from src.server.services.metrics_service import MetricsService
 
 
@@ -66,3 +68,9 @@ class TestPrometheusMetrics:
             )
         assert service.prom_worker_latency is not None
         assert service.prom_worker_requests is not None
+
+    def test_early_exits_counted_per_layer(self):
+        service = MetricsService()
+        service.record_early_exits(np.array([2, 6, 2, 4, 6, 6]))
+        assert service.prom_early_exits.labels(layer="2")._value.get() == 2
+        assert service.prom_early_exits.labels(layer="6")._value.get() == 3
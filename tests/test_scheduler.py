@@ -1,7 +1,17 @@
+import queue
 import threading
 import time
 
+import pytest
+
 from src.server.dto import PendingRequest
+from src.server.utils.batching import (
+    AdaptiveBatchTimeout,
+    LengthBuckets,
+    TokenBudget,
+    estimate_pair_tokens,
+)
+from src.server.utils.priority import PriorityClassQueue, priority_index
 
 
 class TestPendingRequest:
@@ -13,6 +23,16 @@ class TestPendingRequest:
         assert req.result_future == event
         assert req.result is None
 
+    def test_complete_sets_event_and_runs_callbacks(self):
+        calls = []
+        req = PendingRequest(pairs=[("q", "d")], result_future=threading.Event())
+        req.done_callbacks.append(lambda: calls.append(req.result_future.is_set()))
+
+        req.complete()
+
+        assert req.result_future.is_set()
+        assert calls == [True]
+
 
 class TestBatching:
     def test_batching_info(self, minimal_config):
@@ -56,3 +76,275 @@ class TestBatching:
         orchestrator = OrchestratorService(minimal_config)
         orchestrator.setup()
         orchestrator.stop()
+
+
+class TestTokenBudget:
+    def test_estimate_pair_tokens_capped(self):
+        assert estimate_pair_tokens(("a" * 8, "b" * 12), max_length=512) == 8
+        assert estimate_pair_tokens(("q", "d" * 10_000), max_length=512) == 512
+
+    def test_budget_uses_padded_cost(self):
+        budget = TokenBudget(max_tokens=100, max_length=512)
+        short = [("q", "d" * 25)] * 4
+        long = [("q", "d" * 200)]
+
+        budget.add(short)
+        assert budget.padded_tokens == 4 * 9
+        assert budget.fits(short)
+        assert not budget.fits(long)
+
+    def test_first_request_always_fits(self):
+        budget = TokenBudget(max_tokens=10, max_length=512)
+        assert budget.fits([("q", "d" * 400)])
+
+    def test_disabled_budget(self):
+        budget = TokenBudget(max_tokens=0, max_length=512)
+        budget.add([("q", "d" * 400)] * 64)
+        assert budget.fits([("q", "d" * 400)] * 64)
+        assert not budget.exhausted
+
+    def test_batch_loop_carries_over_request(self, minimal_config):
+        from src.server.services.orchestrator_service import OrchestratorService
+
+        minimal_config.batching.enabled = True
+        minimal_config.batching.max_batch_size = 16
+        minimal_config.batching.timeout_ms = 200
+        minimal_config.batching.max_tokens_per_batch = 64
+
+        orchestrator = OrchestratorService(minimal_config)
+        orchestrator.setup()
+        pipeline = orchestrator.pipeline
+
+        batches = []
+        done = threading.Event()
+
+        def record(batch):
+            batches.append([len(req.pairs) for req in batch])
+            for req in batch:
+                req.result_future.set()
+            if sum(len(b) for b in batches) == 3:
+                done.set()
+
+        pipeline._process_batch = record
+        for n in (4, 4, 4):
+            pipeline._batch_queue.put(
+                PendingRequest(pairs=[("q", "d" * 40)] * n, result_future=threading.Event())
+            )
+
+        assert done.wait(timeout=5.0)
+        assert batches == [[4], [4], [4]]
+        orchestrator.stop()
+
+
+class TestLengthBuckets:
+    def _request(self, doc_chars: int, n: int = 1) -> PendingRequest:
+        return PendingRequest(pairs=[("q", "d" * doc_chars)] * n, result_future=threading.Event())
+
+    def test_routes_by_estimated_length(self):
+        buckets = LengthBuckets([64, 128, 512], [10.0, 10.0, 10.0], max_length=512)
+        assert buckets.put(self._request(40), now=0.0) == 0
+        assert buckets.put(self._request(400), now=0.0) == 1
+        assert buckets.put(self._request(100_000), now=0.0) == 2
+        assert buckets.pending() == [1, 1, 1]
+
+    def test_bucket_released_when_full_or_due(self):
+        budget = TokenBudget(max_tokens=0, max_length=512)
+        buckets = LengthBuckets([64, 512], [10.0, 50.0], max_length=512)
+        short = [self._request(40) for _ in range(2)]
+        long = self._request(1000)
+        for req in [*short, long]:
+            buckets.put(req, now=0.0)
+
+        assert buckets.pop_ready(0.001, max_items=4, budget=budget) == []
+        assert buckets.pop_ready(0.011, max_items=4, budget=budget) == short
+        assert buckets.next_due() == 0.05
+        assert buckets.pop_ready(0.02, max_items=1, budget=budget) == [long]
+
+    def test_timeouts_must_match_boundaries(self):
+        with pytest.raises(ValueError):
+            LengthBuckets([64, 128], [10.0], max_length=512)
+
+    def test_bucketed_batch_loop(self, minimal_config):
+        from src.server.services.orchestrator_service import OrchestratorService
+
+        minimal_config.batching.enabled = True
+        minimal_config.batching.max_batch_size = 4
+        minimal_config.batching.bucket_boundaries = [64, 512]
+        minimal_config.batching.bucket_timeouts_ms = [20.0, 20.0]
+
+        orchestrator = OrchestratorService(minimal_config)
+        orchestrator.setup()
+        pipeline = orchestrator.pipeline
+
+        batches = []
+        done = threading.Event()
+
+        def record(batch):
+            batches.append(sorted(len(req.pairs[0][1]) for req in batch))
+            for req in batch:
+                req.result_future.set()
+            if sum(len(b) for b in batches) == 4:
+                done.set()
+
+        pipeline._process_batch = record
+        for doc_chars in (40, 1000, 40, 1000):
+            pipeline._batch_queue.put(self._request(doc_chars))
+
+        assert done.wait(timeout=5.0)
+        assert sorted(batches) == [[40, 40], [1000, 1000]]
+        assert orchestrator.get_batching_info()["bucket_boundaries"] == [64, 512]
+        orchestrator.stop()
+
+
+class TestAdaptiveBatchTimeout:
+    def _controller(self, **kwargs) -> AdaptiveBatchTimeout:
+        params = {
+            "initial_ms": 50.0,
+            "target_p99_ms": 100.0,
+            "min_ms": 1.0,
+            "max_ms": 200.0,
+            "max_batch_size": 9,
+            "adjust_interval_s": 0.0,
+        }
+        params.update(kwargs)
+        return AdaptiveBatchTimeout(**params)
+
+    def _arrivals(self, controller: AdaptiveBatchTimeout, gap_s: float, n: int = 20) -> None:
+        for i in range(n):
+            controller.record_arrival(i * gap_s)
+
+    def test_backs_off_when_p99_exceeds_target(self):
+        controller = self._controller()
+        timeout = controller.record_batch(10.0, [150.0] * 16, now=1.0)
+        assert timeout == pytest.approx(35.0)
+        assert controller.record_batch(10.0, [150.0] * 16, now=2.0) < timeout
+
+    def test_grows_toward_fill_ceiling_with_headroom(self):
+        controller = self._controller(initial_ms=2.0)
+        self._arrivals(controller, gap_s=0.005)
+        assert controller.arrival_rate == pytest.approx(200.0)
+        assert controller.ceiling_ms() == pytest.approx(40.0)
+
+        timeouts = [controller.record_batch(10.0, [20.0] * 16, now=float(i)) for i in range(20)]
+        assert timeouts[0] == pytest.approx(21.0)
+        assert timeouts == sorted(timeouts)
+        assert timeouts[-1] == pytest.approx(40.0, abs=0.1)
+
+    def test_ceiling_leaves_room_for_model_step(self):
+        controller = self._controller(max_batch_size=1000)
+        self._arrivals(controller, gap_s=0.001)
+        controller.record_batch(70.0, [], now=0.0)
+        assert controller.ceiling_ms() == pytest.approx(30.0)
+
+    def test_holds_until_enough_samples(self):
+        controller = self._controller()
+        assert controller.record_batch(10.0, [500.0] * 4, now=1.0) == 50.0
+        controller = self._controller(adjust_interval_s=10.0)
+        assert controller.record_batch(10.0, [500.0] * 16, now=0.0) == pytest.approx(35.0)
+        assert controller.record_batch(10.0, [500.0] * 16, now=5.0) == pytest.approx(35.0)
+
+    def test_respects_bounds(self):
+        controller = self._controller(initial_ms=500.0, min_ms=5.0)
+        assert controller.timeout_ms == 200.0
+        for i in range(20):
+            controller.record_batch(10.0, [1000.0] * 16, now=float(i))
+        assert controller.timeout_ms == 5.0
+
+    def test_pipeline_reports_adaptive_timeout(self, minimal_config):
+        from src.server.services.orchestrator_service import OrchestratorService
+
+        minimal_config.batching.enabled = True
+        minimal_config.batching.timeout_ms = 500
+        minimal_config.batching.adaptive_timeout = True
+        minimal_config.batching.max_timeout_ms = 100.0
+
+        orchestrator = OrchestratorService(minimal_config)
+        orchestrator.setup()
+        info = orchestrator.get_batching_info()
+        assert info["adaptive_timeout"] is True
+        assert info["timeout_ms"] == 100.0
+        orchestrator.stop()
+
+
+class TestPriorityClasses:
+    def _request(self, priority: int, name: str = "") -> PendingRequest:
+        return PendingRequest(
+            pairs=[("q", name)], result_future=threading.Event(), priority=priority
+        )
+
+    def _queue(self, **kwargs) -> PriorityClassQueue:
+        return PriorityClassQueue(lambda req: req.priority, **kwargs)
+
+    def test_priority_index(self):
+        assert priority_index(None) == 0
+        assert priority_index(None, default="batch") == 1
+        assert priority_index("best_effort") == 2
+        with pytest.raises(ValueError):
+            priority_index("urgent")
+
+    def test_serves_higher_classes_first(self):
+        q = self._queue()
+        for priority, name in [(2, "e"), (1, "b1"), (0, "i1"), (1, "b2"), (0, "i2")]:
+            q.put_nowait(self._request(priority, name))
+
+        assert q.qsize() == 5
+        assert q.depths() == {"interactive": 2, "batch": 2, "best_effort": 1}
+        order = [q.get_nowait().pairs[0][1] for _ in range(5)]
+        assert order == ["i1", "i2", "b1", "b2", "e"]
+        with pytest.raises(queue.Empty):
+            q.get(timeout=0.01)
+
+    def test_aged_request_jumps_ahead(self):
+        q = self._queue(aging_ms={"best_effort": 20.0})
+        q.put_nowait(self._request(2, "old"))
+        q.put_nowait(self._request(1, "batch"))
+        time.sleep(0.03)
+        q.put_nowait(self._request(0, "new"))
+
+        assert [q.get_nowait().pairs[0][1] for _ in range(3)] == ["old", "new", "batch"]
+
+    def test_bounded_and_validated(self):
+        q = self._queue(maxsize=1)
+        q.put_nowait(self._request(1))
+        with pytest.raises(queue.Full):
+            q.put_nowait(self._request(0))
+        with pytest.raises(ValueError):
+            self._queue(aging_ms={"bulk": 10.0})
+
+    def test_batch_loop_serves_interactive_first(self, minimal_config):
+        from src.server.services.orchestrator_service import OrchestratorService
+
+        minimal_config.batching.enabled = True
+        minimal_config.batching.max_batch_size = 1
+        minimal_config.priority.enabled = True
+
+        orchestrator = OrchestratorService(minimal_config)
+        orchestrator.setup()
+        pipeline = orchestrator.pipeline
+
+        batches = []
+        gate = threading.Event()
+        done = threading.Event()
+
+        def record(batch):
+            gate.wait(timeout=5.0)
+            batches.extend(req.pairs[0][1] for req in batch)
+            for req in batch:
+                req.result_future.set()
+            if len(batches) == 4:
+                done.set()
+
+        pipeline._process_batch = record
+        pipeline._batch_queue.put(self._request(1, "first"))
+        while pipeline._batch_queue.qsize():
+            time.sleep(0.005)
+        for priority, name in [(2, "effort"), (1, "batch"), (0, "interactive")]:
+            pipeline._batch_queue.put(self._request(priority, name))
+        pending = orchestrator.get_batching_info()["priority_pending"]
+        assert pending["batch"] == {"interactive": 1, "batch": 1, "best_effort": 1}
+        assert pending["model"] == {"interactive": 0, "batch": 0, "best_effort": 0}
+        gate.set()
+
+        assert done.wait(timeout=5.0)
+        assert batches == ["first", "interactive", "batch", "effort"]
+        orchestrator.stop()
@@ -0,0 +1,88 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from src.server.dto import CacheConfig, InferenceResult, ModelConfig
+from src.server.services.orchestrator_service import OrchestratorService
+from src.server.utils.score_cache import ScoreCache, cache_namespace
+
+
+class TestScoreCache:
+    def test_hit_and_miss(self):
+        cache = ScoreCache("ns")
+        keys = [cache.key(("q", "a")), cache.key(("q", "b"))]
+        cache.put_many(keys[:1], [0.9])
+        assert cache.get_many(keys) == [0.9, None]
+
+    def test_key_is_unambiguous(self):
+        cache = ScoreCache("ns")
+        assert cache.key(("ab", "c")) != cache.key(("a", "bc"))
+
+    def test_lru_eviction(self):
+        cache = ScoreCache("ns", max_entries=2)
+        a, b, c = (cache.key(("q", d)) for d in "abc")
+        cache.put_many([a, b], [0.1, 0.2])
+        cache.get_many([a])
+        cache.put_many([c], [0.3])
+        assert len(cache) == 2
+        assert cache.get_many([a, b, c]) == [0.1, None, 0.3]
+
+    def test_ttl_expiry(self):
+        cache = ScoreCache("ns", ttl_seconds=0.0)
+        key = cache.key(("q", "a"))
+        cache.put_many([key], [0.5])
+        assert cache.get_many([key]) == [None]
+        assert len(cache) == 0
+
+    def test_namespace_separates_model_configs(self):
+        base = ModelConfig(name="m", backend="pytorch", quantization="int8", max_length=256)
+        variants = [
+            base,
+            base.model_copy(update={"quantization": "fp16"}),
+            base.model_copy(update={"backend": "onnx"}),
+            base.model_copy(update={"early_exit_heads": "heads.pt"}),
+            base.model_copy(update={"early_exit_heads": "heads.pt", "early_exit_confidence": 0.9}),
+        ]
+        pair = ("q", "d")
+        keys = {ScoreCache(cache_namespace([inst])).key(pair) for inst in variants}
+        assert len(keys) == len(variants)
+
+    def test_metrics_recorded(self):
+        cache = ScoreCache("ns", max_entries=1)
+        metrics = MagicMock()
+        cache.set_metrics(metrics)
+        keys = [cache.key(("q", d)) for d in "ab"]
+        cache.put_many(keys, [0.1, 0.2])
+        cache.get_many(keys)
+        metrics.record_cache_evictions.assert_called_once_with(1, reason="lru")
+        metrics.record_cache_lookup.assert_called_once_with(hits=1, misses=1)
+
+
+class TestOrchestratorScoreCache:
+    def test_only_misses_are_scheduled(self, minimal_config):
+        minimal_config.cache = CacheConfig(enabled=True)
+        orchestrator = OrchestratorService(minimal_config, "test")
+        orchestrator.setup()
+        orchestrator.pipeline = MagicMock()
+        orchestrator.pipeline.schedule.side_effect = lambda pairs, **_: InferenceResult(
+            scores=np.array([len(d) / 10 for _, d in pairs], dtype=np.float32)
+        )
+
+        first = orchestrator.schedule([("q", "a"), ("q", "bb")])
+        second = orchestrator.schedule([("q", "ccc"), ("q", "a"), ("q", "ccc"), ("q", "bb")])
+
+        np.testing.assert_allclose(first.scores, [0.1, 0.2])
+        np.testing.assert_allclose(second.scores, [0.3, 0.1, 0.3, 0.2])
+        assert second.batch_size == 4
+        assert orchestrator.pipeline.schedule.call_args_list[-1].args == ([("q", "ccc")],)
+
+        third = orchestrator.schedule([("q", "bb")])
+        np.testing.assert_allclose(third.scores, [0.2])
+        assert orchestrator.pipeline.schedule.call_count == 2
+        orchestrator.stop()
+
+    def test_cache_disabled_by_default(self, minimal_config):
+        orchestrator = OrchestratorService(minimal_config, "test")
+        orchestrator.setup()
+        assert orchestrator.score_cache is None
+        orchestrator.stop()
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from src.server.utils.shared_memory import SharedTensorSlab
+
+
+@pytest.fixture
+def slab():
+    slab = SharedTensorSlab.create(num_slots=2, slot_tokens=64)
+    yield slab
+    slab.close()
+
+
+def _features(batch_size: int, seq_len: int) -> dict[str, np.ndarray]:
+    input_ids = np.arange(batch_size * seq_len, dtype=np.int32).reshape(batch_size, seq_len)
+    return {
+        "input_ids": input_ids,
+        "attention_mask": np.ones(input_ids.shape, dtype=np.int8),
+        "token_type_ids": np.zeros(input_ids.shape, dtype=np.int8),
+    }
+
+
+class TestSharedTensorSlab:
+    def test_write_read_roundtrip(self, slab):
+        features = _features(4, 16)
+        ref = slab.write(features)
+
+        assert ref is not None
+        assert ref.shape == (4, 16)
+        assert ref.keys == ("input_ids", "attention_mask", "token_type_ids")
+
+        reader = SharedTensorSlab.attach(ref.slab_name)
+        restored = reader.read(ref)
+        for key, array in features.items():
+            assert np.array_equal(restored[key], array)
+            assert restored[key].dtype == array.dtype
+        del restored
+        reader.close()
+
+    def test_write_too_large_falls_back(self, slab):
+        assert slab.write(_features(4, 64)) is None
+
+    def test_slots_exhausted_and_released(self, slab):
+        first = slab.write(_features(2, 8))
+        second = slab.write(_features(2, 8))
+        assert first is not None and second is not None
+        assert first.slot_id != second.slot_id
+        assert slab.write(_features(2, 8)) is None
+
+        slab.release(first)
+        third = slab.write(_features(2, 8))
+        assert third is not None
+        assert third.slot_id == first.slot_id
+
+    def test_attach_without_slot_table_is_read_only(self, slab):
+        reader = SharedTensorSlab.attach(slab.name)
+        assert reader.write(_features(1, 4)) is None
+        with pytest.raises(RuntimeError, match="slot table"):
+            reader.release(slab.write(_features(1, 4)))
+        reader.close()
@@ -45,6 +45,12 @@ class TestExpandSweepConfig:
         assert expanded[1]["batching"]["max_batch_size"] == 16
         assert expanded[2]["batching"]["max_batch_size"] == 32
 
+    def test_token_budget_sweep(self):
+        config = {"batching": {"max_tokens_per_batch": [0, 8192]}}
+        expanded = expand_sweep_config(config)
+        assert [c["batching"]["max_tokens_per_batch"] for c in expanded] == [0, 8192]
+        assert get_sweep_name(expanded[1], "base") == "base_tok8192"
+
     def test_multiple_sweeps(self):
         config = {
             "model": {
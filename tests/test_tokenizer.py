@@ -0,0 +1,155 @@
+import random
+
+import numpy as np
+import pytest
+import torch
+
+from src.server.backends.device import features_to_torch
+from src.server.dto import TokenIdBatch
+from src.server.utils.pretokenized import TokenIdSpec, build_tokenized_batch
+from src.server.utils.tokenizer import TokenizerService, token_id_dtype, truncate_longest_first
+
+WORDS = ["what", "is", "python", "a", "language", "machine", "learning", "the", "of", "and"]
+
+
+@pytest.fixture(scope="module")
+def tokenizer_dir(tmp_path_factory):
+    from transformers import BertTokenizerFast
+
+    path = tmp_path_factory.mktemp("tokenizer")
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", *WORDS]
+    vocab += [f"##{c}" for c in "abcdefghijklmnopqrstuvwxyz"] + list("abcdefghijklmnopqrstuvwxyz")
+    (path / "vocab.txt").write_text("\n".join(vocab))
+    BertTokenizerFast(vocab_file=str(path / "vocab.txt")).save_pretrained(str(path))
+    return str(path)
+
+
+class TestTruncateLongestFirst:
+    def test_no_truncation_needed(self):
+        assert truncate_longest_first(3, 4, 10) == (3, 4)
+
+    def test_longer_side_truncated_first(self):
+        assert truncate_longest_first(3, 20, 10) == (3, 7)
+        assert truncate_longest_first(20, 3, 10) == (7, 3)
+
+    def test_both_long_split_evenly(self):
+        assert truncate_longest_first(20, 30, 9) == (4, 5)
+
+
+class TestDocTokenCache:
+    def test_matches_tokenizer_output(self, tokenizer_dir):
+        rnd = random.Random(0)
+
+        def text(n: int) -> str:
+            return " ".join(rnd.choice(WORDS) for _ in range(n))
+
+        docs = [text(rnd.randint(0, 40)) for _ in range(10)]
+        for max_length in (8, 17, 64):
+            cached = TokenizerService(tokenizer_dir, max_length, doc_cache_size=8)
+            plain = TokenizerService(tokenizer_dir, max_length)
+            for _ in range(20):
+                pairs = [(text(rnd.randint(0, 20)), rnd.choice(docs)) for _ in range(4)]
+                expected = plain.tokenize(pairs).features
+                actual = cached.tokenize(pairs).features
+                assert list(actual) == list(expected)
+                for key, value in expected.items():
+                    assert np.array_equal(actual[key], value)
+
+    def test_cache_hits_and_capacity(self, tokenizer_dir):
+        service = TokenizerService(tokenizer_dir, 64, doc_cache_size=2)
+        service.tokenize([("what", "a b"), ("is", "a b"), ("the", "c d")])
+        service.tokenize([("what", "e f")])
+
+        stats = service.get_doc_cache_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 3
+        assert stats["size"] == 2
+
+
+class _RecordingTokenizer:
+    def __init__(self, tokenizer):
+        self._tokenizer = tokenizer
+        self.calls = []
+
+    def __call__(self, texts, *args, **kwargs):
+        self.calls.append(texts)
+        return self._tokenizer(texts, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._tokenizer, name)
+
+
+class TestSharedQueryAssembly:
+    def test_shared_query_matches_tokenizer_output(self, tokenizer_dir):
+        service = TokenizerService(tokenizer_dir, 12)
+        pairs = [("what is python", doc) for doc in ["a language", "the of and " * 5, ""]]
+
+        expected = service._encode_pairs(pairs)
+        actual = service._assemble_pairs(pairs)
+        assert list(actual) == list(expected)
+        for key, value in expected.items():
+            assert np.array_equal(actual[key], value)
+        assert service.get_doc_cache_stats()["size"] == 0
+
+    def test_shared_query_encoded_once_without_doc_cache(self, tokenizer_dir):
+        service = TokenizerService(tokenizer_dir, 64)
+        service._tokenizer = _RecordingTokenizer(service._tokenizer)
+        query = "what is python"
+        pairs = [(query, doc) for doc in ["a language", "the of and", "b"]]
+
+        service.tokenize(pairs)
+
+        texts = [text for batch in service._tokenizer.calls for text in batch]
+        assert sum(text.count(query) for text in texts) == 1
+
+
+class TestPretokenizedBatch:
+    def test_matches_tokenizer_output(self, tokenizer_dir):
+        from transformers import AutoTokenizer
+
+        tok = AutoTokenizer.from_pretrained(tokenizer_dir)
+        spec = TokenIdSpec(
+            vocab_size=len(tok),
+            max_length=64,
+            pad_token_id=tok.pad_token_id,
+            sep_token_id=tok.sep_token_id,
+            type_vocab_size=2,
+            input_names=tuple(tok.model_input_names),
+        )
+        pairs = [("what is python", "a language"), ("the", "machine learning of the"), ("a", "b")]
+        rows = [tok(q, d)["input_ids"] for q, d in pairs]
+        tokens = TokenIdBatch(
+            input_ids=np.array([t for row in rows for t in row], dtype="<i4"),
+            lengths=np.array([len(row) for row in rows], dtype="<u4"),
+        )
+
+        expected = TokenizerService(tokenizer_dir, 64).tokenize(pairs)
+        actual = build_tokenized_batch(tokens, spec)
+        assert list(actual.features) == list(expected.features)
+        for key, value in expected.features.items():
+            assert np.array_equal(actual.features[key], value)
+        assert actual.real_tokens == expected.real_tokens
+        assert actual.max_seq_length == expected.max_seq_length
+
+
+class TestCompactFeatures:
+    def test_tokenizer_emits_compact_numpy(self, tokenizer_dir):
+        batch = TokenizerService(tokenizer_dir, 64).tokenize([("what is python", "a language")])
+
+        assert batch.features["input_ids"].dtype == np.int16
+        assert batch.features["attention_mask"].dtype == np.int8
+        assert batch.features["token_type_ids"].dtype == np.int8
+
+    def test_id_dtype_widens_for_large_vocab(self):
+        assert token_id_dtype(32768) == np.int16
+        assert token_id_dtype(32769) == np.int32
+        assert token_id_dtype(250002) == np.int32
+
+    def test_converted_to_long_tensors_for_the_model(self, tokenizer_dir):
+        batch = TokenizerService(tokenizer_dir, 64).tokenize([("what is python", "a language")])
+
+        features = features_to_torch(batch.features, "cpu")
+
+        for key, value in batch.features.items():
+            assert features[key].dtype == torch.long
+            assert features[key].tolist() == value.tolist()